@@ -1,16 +1,32 @@
 from flet_map.circle_layer import CircleLayer, CircleMarker
+from flet_map.clustered_marker_layer import ClusteredMarkerLayer
+from flet_map.columnar_circle_layer import ColumnarCircleLayer
 from flet_map.map import Map
 from flet_map.marker_layer import Marker, MarkerLayer
 from flet_map.polygon_layer import PolygonLayer, PolygonMarker
 from flet_map.polyline_layer import PolylineLayer, PolylineMarker
 from flet_map.rich_attribution import RichAttribution
 from flet_map.simple_attribution import SimpleAttribution
+from flet_map.simplification import (
+    LevelOfDetailCoordinates,
+    SimplificationMethod,
+    simplify_coordinates,
+)
 from flet_map.source_attribution import (
     ImageSourceAttribution,
     SourceAttribution,
     TextSourceAttribution,
 )
+from flet_map.spatial_index import SpatialIndex
+from flet_map.symbol_layer import SymbolLayer
 from flet_map.tile_layer import TileLayer
+from flet_map.tile_server import (
+    LocalTileServer,
+    MBTilesArchive,
+    PMTilesArchive,
+    TileArchive,
+)
+from flet_map.tiles import count_tiles, get_tile_range, iter_tiles
 from flet_map.types import (
     AttributionAlignment,
     Camera,
@@ -19,25 +35,41 @@ from flet_map.types import (
     CursorRotationBehaviour,
     DashedStrokePattern,
     DottedStrokePattern,
+    EventThrottleConfiguration,
     FadeInTileDisplay,
+    FeatureFilter,
+    FeatureStyle,
     InstantaneousTileDisplay,
     InteractionConfiguration,
     InteractionFlag,
     KeyboardConfiguration,
+    MapCameraChangeEvent,
     MapEvent,
     MapEventSource,
+    MapFeatureEvent,
+    MapFeatureHoverEvent,
+    MapFeatureTapEvent,
     MapHoverEvent,
     MapLatitudeLongitude,
+    MapLatitudeLongitudeArray,
     MapLatitudeLongitudeBounds,
     MapPointerEvent,
     MapPositionChangeEvent,
     MapTapEvent,
+    MarkerCluster,
     MultiFingerGesture,
+    NumberArray,
     PatternFit,
     SolidStrokePattern,
     StrokePattern,
+    SymbolShape,
+    TileCacheConfiguration,
+    TileCacheStats,
     TileDisplay,
     TileLayerEvictErrorTileStrategy,
+    TileMetricsEvent,
+    TileSeedProgressEvent,
+    TileSeedResult,
 )
 
 __all__ = [
@@ -46,28 +78,44 @@ __all__ = [
     "CameraFit",
     "CircleLayer",
     "CircleMarker",
+    "ClusteredMarkerLayer",
+    "ColumnarCircleLayer",
     "CursorKeyboardRotationConfiguration",
     "CursorRotationBehaviour",
     "DashedStrokePattern",
     "DottedStrokePattern",
+    "EventThrottleConfiguration",
     "FadeInTileDisplay",
+    "FeatureFilter",
+    "FeatureStyle",
     "ImageSourceAttribution",
     "InstantaneousTileDisplay",
     "InteractionConfiguration",
     "InteractionFlag",
     "KeyboardConfiguration",
+    "LevelOfDetailCoordinates",
+    "LocalTileServer",
+    "MBTilesArchive",
     "Map",
+    "MapCameraChangeEvent",
     "MapEvent",
     "MapEventSource",
+    "MapFeatureEvent",
+    "MapFeatureHoverEvent",
+    "MapFeatureTapEvent",
     "MapHoverEvent",
     "MapLatitudeLongitude",
+    "MapLatitudeLongitudeArray",
     "MapLatitudeLongitudeBounds",
     "MapPointerEvent",
     "MapPositionChangeEvent",
     "MapTapEvent",
     "Marker",
+    "MarkerCluster",
     "MarkerLayer",
     "MultiFingerGesture",
+    "NumberArray",
+    "PMTilesArchive",
     "PatternFit",
     "PolygonLayer",
     "PolygonMarker",
@@ -75,11 +123,25 @@ __all__ = [
     "PolylineMarker",
     "RichAttribution",
     "SimpleAttribution",
+    "SimplificationMethod",
     "SolidStrokePattern",
     "SourceAttribution",
+    "SpatialIndex",
     "StrokePattern",
+    "SymbolLayer",
+    "SymbolShape",
     "TextSourceAttribution",
+    "TileArchive",
+    "TileCacheConfiguration",
+    "TileCacheStats",
     "TileDisplay",
     "TileLayer",
     "TileLayerEvictErrorTileStrategy",
+    "TileMetricsEvent",
+    "TileSeedProgressEvent",
+    "TileSeedResult",
+    "count_tiles",
+    "get_tile_range",
+    "iter_tiles",
+    "simplify_coordinates",
 ]
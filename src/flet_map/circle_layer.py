@@ -1,9 +1,16 @@
-from typing import Optional
+from dataclasses import field
+from typing import Optional, Union
 
 import flet as ft
 
-from flet_map.map_layer import MapLayer
-from flet_map.types import MapLatitudeLongitude
+from flet_map.feature_layer import FeatureLayer, _distance_to_line
+from flet_map.spatial_index import BoundingBox, _meters_to_degrees
+from flet_map.types import (
+    FeatureStyle,
+    MapFeatureHoverEvent,
+    MapFeatureTapEvent,
+    MapLatitudeLongitude,
+)
 
 __all__ = ["CircleLayer", "CircleMarker"]
 
@@ -49,6 +56,21 @@ class CircleMarker(ft.Control):
     Whether the [`radius`][..] should use the unit meters.
     """
 
+    style: Optional[str] = None
+    """
+    The id of the [`FeatureStyle`][(p).] of this circle, in the
+    [`styles`][(p).CircleLayer.styles] of its layer.
+
+    The properties of the style which are not `None` are used instead of
+    the ones of this circle. Unknown ids are ignored.
+    """
+
+    attributes: Optional[dict[str, Union[str, ft.Number, bool]]] = None
+    """
+    The attributes of this circle, which the
+    [`filter`][(p).CircleLayer.filter] of its layer can match.
+    """
+
     def before_update(self):
         super().before_update()
         assert self.border_stroke_width >= 0, (
@@ -58,10 +80,79 @@ class CircleMarker(ft.Control):
 
 
 @ft.control("CircleLayer")
-class CircleLayer(MapLayer):
+class CircleLayer(FeatureLayer):
     """
     A layer to display [`CircleMarker`][(p).]s.
     """
 
     circles: list[CircleMarker]
     """A list of [`CircleMarker`][(p).]s to display."""
+
+    styles: dict[str, FeatureStyle] = field(default_factory=dict)
+    """
+    The styles which the [`circles`][..] can reference by id,
+    with [`CircleMarker.style`][(p).].
+    """
+
+    on_feature_hover: Optional[ft.EventHandler[MapFeatureHoverEvent]] = None
+    """
+    Fires when the pointer enters or leaves the [`circles`][..] of the
+    layer, or moves over other ones.
+
+    Hits are tested on the client, so pointer moves which do not change the
+    circles under the pointer are not sent.
+    """
+
+    on_feature_tap: Optional[ft.EventHandler[MapFeatureTapEvent]] = None
+    """
+    Fires when [`circles`][..] of the layer are tapped, with all the ones
+    under the pointer.
+
+    Hits are tested on the client, using the rendered geometries, so no
+    geometric search is needed on the Python side. Taps handled by the layer
+    may not fire [`Map.on_tap`][(p).].
+    """
+
+    _features_field = "circles"
+
+    async def update_feature_styles(
+        self,
+        styles: Optional[dict[CircleMarker, Optional[str]]] = None,
+        colors: Optional[dict[CircleMarker, ft.ColorValue]] = None,
+        border_colors: Optional[dict[CircleMarker, ft.ColorValue]] = None,
+    ) -> None:
+        """
+        Changes the style id, color or border color of many circles at once,
+        e.g. to recolor a choropleth map.
+
+        Only the new values are sent to the client, by circle: the circles
+        are not updated, so their coordinates are neither sent nor parsed again.
+        The properties of the circles are also set on the Python side, without
+        being sent again by the next update.
+
+        Args:
+            styles: The new [`style`][(p).CircleMarker.style] of circles.
+            colors: The new [`color`][(p).CircleMarker.color] of circles.
+            border_colors: The new [`border_color`][(p).CircleMarker.border_color]
+                of circles.
+        """
+        await self._update_feature_styles(styles, colors, border_colors)
+
+    def _feature_bounds(self, feature: CircleMarker) -> BoundingBox:
+        south, west, north, east = super()._feature_bounds(feature)
+        if not feature.use_radius_in_meter:
+            return south, west, north, east
+        dlat, dlng = _meters_to_degrees(feature.radius, feature.coordinates.latitude)
+        return south - dlat, west - dlng, north + dlat, east + dlng
+
+    def _hit_radius(self, feature: CircleMarker) -> float:
+        if feature.use_radius_in_meter:
+            return feature.border_stroke_width
+        return feature.radius + feature.border_stroke_width
+
+    def _hit_test(
+        self, feature: CircleMarker, point: MapLatitudeLongitude, tolerance: float
+    ) -> bool:
+        if feature.use_radius_in_meter:
+            tolerance += feature.radius
+        return _distance_to_line(point, [feature.coordinates]) <= tolerance
@@ -0,0 +1,324 @@
+import math
+from dataclasses import field
+from typing import Callable, Optional, Union
+
+import flet as ft
+
+from flet_map.feature_layer import _project_y, _unproject_y
+from flet_map.marker_layer import Marker, MarkerLayer
+from flet_map.spatial_index import BoundingBox, SpatialIndex
+from flet_map.types import MapLatitudeLongitude, MarkerCluster
+
+__all__ = ["ClusteredMarkerLayer"]
+
+_TILE_SIZE = 256
+"""The size, in logical pixels, of the whole world at zoom level `0`."""
+
+
+@ft.control("ClusteredMarkerLayer")
+class ClusteredMarkerLayer(MarkerLayer):
+    """
+    A [`MarkerLayer`][(p).] which groups nearby markers into clusters.
+
+    Clustering is computed on the Python side: for the current zoom level of
+    the map, markers closer than [`cluster_radius`][..] are replaced by a
+    single cluster marker showing their count, and only the clusters and
+    markers in view are sent to the client. Clusters expand into the
+    individual [`markers`][(p).MarkerLayer.] as the map is zoomed in.
+
+    The whole dataset is held in [`features`][(p).FeatureLayer.]; the
+    `markers` sent to the client are managed by the layer.
+
+    Markers are grouped on a hierarchical grid whose cells are
+    [`cluster_radius`][..] logical pixels wide, and where each cell is split
+    into four at the next zoom level. Each zoom level is computed on demand,
+    from a finer one, and cached until the dataset changes.
+
+    Raises:
+        AssertionError: If [`cluster_radius`][(c).] is not positive,
+            [`min_cluster_size`][(c).] is lower than `2`, or
+            [`max_cluster_zoom`][(c).] is negative.
+    """
+
+    cluster_radius: ft.Number = 80.0
+    """
+    The size, in logical pixels, of the area within which markers are clustered.
+    """
+
+    min_cluster_size: int = 2
+    """
+    The minimum number of markers forming a cluster.
+    Smaller groups are displayed as individual markers.
+    """
+
+    max_cluster_zoom: int = 16
+    """
+    The maximum zoom level at which markers are clustered.
+    Above it, all the markers are displayed individually.
+    """
+
+    cluster_color: ft.ColorValue = ft.Colors.BLUE
+    """
+    The background color of the default cluster markers.
+    """
+
+    cluster_builder: Optional[Callable[[MarkerCluster], Marker]] = field(
+        default=None, metadata={"skip": True}
+    )
+    """
+    A function building the [`Marker`][(p).] displayed for a cluster.
+
+    It is called once per cluster and zoom level, and its result is reused
+    until the dataset changes.
+    If `None`, a [`cluster_color`][..] circle showing the count is displayed.
+    """
+
+    def init(self):
+        super().init()
+        self._clustering: Optional[_Clustering] = None
+
+    def before_update(self):
+        super().before_update()
+        assert self.cluster_radius > 0, (
+            f"cluster_radius must be greater than 0, got {self.cluster_radius}"
+        )
+        assert self.min_cluster_size >= 2, (
+            f"min_cluster_size must be greater than or equal to 2, "
+            f"got {self.min_cluster_size}"
+        )
+        assert self.max_cluster_zoom >= 0, (
+            f"max_cluster_zoom must be greater than or equal to 0, "
+            f"got {self.max_cluster_zoom}"
+        )
+
+    def get_cluster(self, marker: Marker) -> Optional[MarkerCluster]:
+        """
+        Returns the cluster displayed by `marker`, one of the
+        [`markers`][(p).MarkerLayer.] currently displayed by the layer,
+        or `None` if it is not a cluster marker.
+        """
+        if self._clustering is None:
+            return None
+        return self._clustering.clusters_by_marker.get(id(marker))
+
+    def get_cluster_markers(self, cluster: MarkerCluster) -> list[Marker]:
+        """Returns the markers grouped in `cluster`."""
+        clustering = self._get_clustering()
+        shift = clustering.max_zoom - cluster.zoom
+        return [
+            clustering.features[i]
+            for i, (kx, ky) in enumerate(clustering.keys)
+            if (kx >> shift, ky >> shift) == cluster.key
+        ]
+
+    def get_cluster_expansion_zoom(self, cluster: MarkerCluster) -> int:
+        """
+        Returns the zoom level at which `cluster` splits into several
+        clusters or markers, for instance to zoom in when it is tapped.
+        """
+        clustering = self._get_clustering()
+        kx, ky = cluster.key
+        for zoom in range(cluster.zoom + 1, clustering.max_zoom + 1):
+            level = clustering.level(zoom)
+            children = [
+                key
+                for key in (
+                    (2 * kx, 2 * ky),
+                    (2 * kx + 1, 2 * ky),
+                    (2 * kx, 2 * ky + 1),
+                    (2 * kx + 1, 2 * ky + 1),
+                )
+                if key in level
+            ]
+            if len(children) != 1 or level[children[0]][3] is not None:
+                return zoom
+            kx, ky = children[0]
+        return clustering.max_zoom + 1
+
+    def _manages_features(self) -> bool:
+        return True
+
+    def _visible_features(self, bounds: Optional[BoundingBox]) -> list:
+        if bounds is None:
+            return []
+        zoom = max(0, math.floor(self.camera.zoom))
+        if zoom > self.max_cluster_zoom:
+            return super()._visible_features(bounds)
+        clustering = self._get_clustering()
+        clusters, markers = [], []
+        for item in clustering.index(zoom).query_bbox(bounds):
+            if isinstance(item, int):
+                markers.append(item)
+            else:
+                clusters.append(self._cluster_marker(clustering, zoom, item))
+        markers.sort()
+        return clusters + [clustering.features[i] for i in markers]
+
+    def _get_clustering(self) -> "_Clustering":
+        """Returns the clustering of the features, computed if needed."""
+        # the clusters are only computed again if the spatial index changed,
+        # which also tracks replaced and moved markers
+        self._index()
+        key = (
+            self._index_version,
+            self.cluster_radius,
+            self.max_cluster_zoom,
+            self.min_cluster_size,
+        )
+        if self._clustering is None or self._clustering.source != key:
+            self._clustering = _Clustering(
+                key,
+                # a copy, so that the indexes of the clusters remain valid until
+                # they are computed again
+                list(self.features),
+                self.cluster_radius,
+                self.max_cluster_zoom,
+                self.min_cluster_size,
+            )
+        return self._clustering
+
+    def _cluster_marker(
+        self, clustering: "_Clustering", zoom: int, key: tuple[int, int]
+    ) -> Marker:
+        """Returns the (cached) marker of the cluster in cell `key` at `zoom`."""
+        marker = clustering.markers.get((zoom, key))
+        if marker is None:
+            count, sx, sy, _ = clustering.level(zoom)[key]
+            cluster = MarkerCluster(
+                coordinates=MapLatitudeLongitude(
+                    latitude=_unproject_y(sy / count),
+                    longitude=sx / count * 360 - 180,
+                ),
+                count=count,
+                zoom=zoom,
+                key=key,
+            )
+            marker = (self.cluster_builder or self._default_cluster_marker)(cluster)
+            clustering.markers[(zoom, key)] = marker
+            clustering.clusters_by_marker[id(marker)] = cluster
+        return marker
+
+    def _default_cluster_marker(self, cluster: MarkerCluster) -> Marker:
+        size = 30 + 8 * math.log10(cluster.count)
+        return Marker(
+            content=ft.Container(
+                content=ft.Text(
+                    _format_count(cluster.count),
+                    color=ft.Colors.WHITE,
+                    weight=ft.FontWeight.BOLD,
+                    size=12,
+                ),
+                bgcolor=self.cluster_color,
+                shape=ft.BoxShape.CIRCLE,
+                alignment=ft.Alignment.CENTER,
+            ),
+            coordinates=cluster.coordinates,
+            width=size,
+            height=size,
+        )
+
+
+class _Clustering:
+    """The clusters of a dataset, at every zoom level."""
+
+    def __init__(
+        self,
+        source: tuple,
+        features: list[Marker],
+        radius: float,
+        max_zoom: int,
+        min_size: int,
+    ):
+        self.source = source
+        self.features = features
+        self.max_zoom = max_zoom
+        self.min_size = min_size
+        self.markers: dict[tuple[int, tuple[int, int]], Marker] = {}
+        self.clusters_by_marker: dict[int, MarkerCluster] = {}
+        self._indexes: dict[int, SpatialIndex] = {}
+
+        # the grid cell of each feature at max_zoom
+        cells_per_unit = _TILE_SIZE * 2**max_zoom / radius
+        self.keys: list[tuple[int, int]] = []
+        # cell -> [count, sum of x, sum of y, member indexes (small groups only)]
+        level: dict[tuple[int, int], list] = {}
+        for i, feature in enumerate(features):
+            x = (feature.coordinates.longitude + 180) / 360
+            y = _project_y(feature.coordinates.latitude)
+            key = (math.floor(x * cells_per_unit), math.floor(y * cells_per_unit))
+            self.keys.append(key)
+            group = level.get(key)
+            if group is None:
+                level[key] = [1, x, y, [i]]
+            else:
+                _merge(group, 1, x, y, [i], min_size)
+        self._levels: dict[int, dict[tuple[int, int], list]] = {max_zoom: level}
+
+    def level(self, zoom: int) -> dict[tuple[int, int], list]:
+        """
+        Returns the groups of features at `zoom`, by grid cell.
+
+        Levels are computed on demand, from the closest computed level above:
+        each cell is made of 2x2 cells of the next zoom level.
+        """
+        level = self._levels.get(zoom)
+        if level is not None:
+            return level
+        source = min(z for z in self._levels if z > zoom)
+        shift = source - zoom
+        level = {}
+        for (kx, ky), (count, sx, sy, members) in self._levels[source].items():
+            key = (kx >> shift, ky >> shift)
+            group = level.get(key)
+            if group is None:
+                level[key] = [count, sx, sy, members]
+            else:
+                _merge(group, count, sx, sy, members, self.min_size)
+        self._levels[zoom] = level
+        return level
+
+    def index(self, zoom: int) -> SpatialIndex:
+        """
+        Returns the spatial index of the clusters (cell keys) and individual
+        markers (feature indexes) displayed at `zoom`.
+        """
+        index = self._indexes.get(zoom)
+        if index is None:
+            items: list[tuple[Union[int, tuple[int, int]], BoundingBox]] = []
+            for key, (count, sx, sy, members) in self.level(zoom).items():
+                if members is None:
+                    latitude = _unproject_y(sy / count)
+                    longitude = sx / count * 360 - 180
+                    items.append((key, (latitude, longitude, latitude, longitude)))
+                else:
+                    for i in members:
+                        c = self.features[i].coordinates
+                        items.append(
+                            (i, (c.latitude, c.longitude, c.latitude, c.longitude))
+                        )
+            index = self._indexes[zoom] = SpatialIndex(items)
+        return index
+
+
+def _merge(
+    group: list, count: int, sx: float, sy: float, members: Optional[list], min_size
+):
+    """Merges a group of `count` features into `group`."""
+    group[0] += count
+    group[1] += sx
+    group[2] += sy
+    if group[0] >= min_size:
+        group[3] = None
+    else:
+        group[3] = group[3] + members
+
+
+def _format_count(count: int) -> str:
+    """Formats a cluster count compactly, e.g. `1.2k` for `1234`."""
+    if count < 1000:
+        return str(count)
+    if count < 10_000:
+        return f"{count / 1000:.1f}k"
+    if count < 1_000_000:
+        return f"{count // 1000}k"
+    return f"{count / 1_000_000:.1f}M"
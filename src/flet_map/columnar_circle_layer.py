@@ -0,0 +1,127 @@
+from dataclasses import field
+from typing import Optional
+
+import flet as ft
+
+from flet_map.map_layer import MapLayer
+from flet_map.symbol_layer import _pack_columns
+from flet_map.types import MapLatitudeLongitudeArray, NumberArray
+
+__all__ = ["ColumnarCircleLayer"]
+
+
+@ft.control("ColumnarCircleLayer")
+class ColumnarCircleLayer(MapLayer):
+    """
+    A layer to display a large number of circles, given column-wise.
+
+    Unlike [`CircleLayer`][(p).], which needs one [`CircleMarker`][(p).]
+    control per circle, the attributes of all the circles are given as
+    packed arrays, one value per circle, and sent to the client as binary
+    buffers. This makes it suitable for coverage or heat-style maps with tens
+    of thousands of circles.
+
+    Per-circle colors are given as indices into [`palette`][..]. Arrays of
+    per-circle values are optional, and fall back to a single value for all
+    the circles when `None`.
+
+    Example:
+        ```python
+        ftm.ColumnarCircleLayer(
+            coordinates=ftm.MapLatitudeLongitudeArray(antennas),
+            radii=ftm.NumberArray(ranges_in_meters),
+            use_radius_in_meter=True,
+            palette=[ft.Colors.with_opacity(0.3, ft.Colors.BLUE)],
+        )
+        ```
+
+    Raises:
+        AssertionError: If [`palette`][(c).] is empty, if [`radius`][(c).] or
+            [`border_stroke_width`][(c).] is negative, or if a per-circle array
+            does not have one value per circle.
+    """
+
+    coordinates: MapLatitudeLongitudeArray
+    """
+    The center of each circle.
+
+    Other forms accepted by [`MapLatitudeLongitudeArray`][(p).] are converted
+    to it when the layer is updated.
+    """
+
+    radius: ft.Number = 10.0
+    """
+    The radius of the circles when [`radii`][..] is `None`.
+    """
+
+    radii: Optional[NumberArray] = None
+    """
+    The radius of each circle.
+    """
+
+    use_radius_in_meter: bool = False
+    """
+    Whether the radii are in meters, rather than in logical pixels, when
+    [`use_radius_in_meter_flags`][..] is `None`.
+    """
+
+    use_radius_in_meter_flags: Optional[NumberArray] = None
+    """
+    Whether the radius of each circle is in meters (non-zero value),
+    or in logical pixels (`0`).
+    """
+
+    palette: list[ft.ColorValue] = field(
+        default_factory=lambda: [ft.Colors.with_opacity(0.5, ft.Colors.BLUE)]
+    )
+    """
+    The colors of the circles, referenced by [`color_indices`][..]
+    and [`border_color_indices`][..].
+    """
+
+    color_indices: Optional[NumberArray] = None
+    """
+    The index in [`palette`][..] of the color of each circle.
+    If `None`, all the circles use the first color of the palette.
+    """
+
+    border_color: Optional[ft.ColorValue] = None
+    """
+    The color of the border of the circles when
+    [`border_color_indices`][..] is `None`.
+    """
+
+    border_color_indices: Optional[NumberArray] = None
+    """
+    The index in [`palette`][..] of the border color of each circle.
+    """
+
+    border_stroke_width: ft.Number = 0.0
+    """
+    The stroke width of the border of the circles when
+    [`border_stroke_widths`][..] is `None`.
+    """
+
+    border_stroke_widths: Optional[NumberArray] = None
+    """
+    The stroke width of the border of each circle.
+    """
+
+    def before_update(self):
+        super().before_update()
+        _pack_columns(
+            self,
+            "radii",
+            "use_radius_in_meter_flags",
+            "color_indices",
+            "border_color_indices",
+            "border_stroke_widths",
+        )
+        assert self.palette, "palette must not be empty"
+        assert self.radius >= 0, (
+            f"radius must be greater than or equal to 0, got {self.radius}"
+        )
+        assert self.border_stroke_width >= 0, (
+            f"border_stroke_width must be greater than or equal to 0, "
+            f"got {self.border_stroke_width}"
+        )
@@ -0,0 +1,646 @@
+import dataclasses
+import math
+import operator
+from typing import ClassVar, Optional
+
+import flet as ft
+
+from flet_map.map_layer import MapLayer
+from flet_map.spatial_index import BoundingBox, SpatialIndex
+from flet_map.types import (
+    Camera,
+    FeatureFilter,
+    MapLatitudeLongitude,
+    MapLatitudeLongitudeArray,
+    MapLatitudeLongitudeBounds,
+)
+
+__all__ = ["FeatureLayer"]
+
+_MAX_LATITUDE = 85.0511287798
+"""The maximum latitude representable in the Web Mercator projection."""
+
+_TILE_SIZE = 256
+"""The size, in logical pixels, of the whole world at zoom level `0`."""
+
+_METERS_PER_DEGREE = 111_320.0
+"""The (approximate) length of a degree of latitude, in meters."""
+
+_EARTH_CIRCUMFERENCE = 40_075_016.686
+"""The circumference of the Earth at the equator, in meters."""
+
+
+@ft.control("FeatureLayer", kw_only=True)
+class FeatureLayer(MapLayer):
+    """
+    Abstract class for the layers displaying a list of features,
+    such as markers, circles, polylines or polygons.
+
+    The features of the layer are indexed by a [`SpatialIndex`][(p).], which is
+    updated incrementally as they are added or removed, and which answers
+    [`query_point`][..], [`query_bbox`][..] and [`nearest`][..] without
+    scanning all the features. Replaced or moved features are reindexed on
+    the next update of the layer, or by [`reindex`][..].
+
+    The following layers are available:
+
+    - [`CircleLayer`][(p).]
+    - [`MarkerLayer`][(p).]
+    - [`PolygonLayer`][(p).]
+    - [`PolylineLayer`][(p).]
+    """
+
+    viewport_culling: bool = False
+    """
+    Whether to only send the features intersecting the visible area of the map
+    (extended by [`viewport_culling_margin`][..]) to the client.
+
+    The whole dataset is then kept on the Python side, in [`features`][..],
+    and the feature list of the layer is updated as the map is moved.
+    This allows displaying very large datasets, as each client only holds
+    the features in view.
+
+    Note:
+        While enabled, the feature list of the layer is managed by the layer:
+        add, remove or replace features through [`features`][..] instead.
+    """
+
+    viewport_culling_margin: ft.Number = 100.0
+    """
+    The extent, in logical pixels, outside of the visible area of the map
+    in which features are still sent to the client when
+    [`viewport_culling`][..] is enabled.
+
+    A larger margin sends more features, but reduces the number of updates
+    while the map is being moved.
+    """
+
+    filter: Optional[FeatureFilter] = None
+    """
+    The filter of the features displayed by this layer, by key or attribute.
+
+    Features hidden by the filter are kept on the client, so that changing it
+    does not send them again. Use [`set_filter`][..] to change it without
+    updating the layer.
+
+    Note:
+        The filter only applies to the display: [`features`][..],
+        [`query_point`][..], [`query_bbox`][..] and [`nearest`][..] still
+        include the hidden features.
+        With a [`ClusteredMarkerLayer`][(p).], it applies to the markers and
+        cluster markers as sent, so clusters still count their hidden markers.
+    """
+
+    _features_field: ClassVar[str]
+    """The name of the field holding the list of features sent to the client."""
+
+    def init(self):
+        super().init()
+        self._features: Optional[list] = None
+        self._culled: Optional[tuple] = None
+        # the spatial index, and the bounds cache, are keyed by feature `id()`,
+        # which is much cheaper to hash than controls
+        self._spatial_index: Optional[SpatialIndex[int]] = None
+        # the indexed features, and their coordinates, in order
+        self._ids: list[int] = []
+        self._coordinates: list = []
+        # the identity and length of the indexed feature list, and whether its
+        # contents may have changed since: checked by queries in O(1)
+        self._indexed: Optional[tuple[int, int]] = None
+        self._index_dirty = True
+        # incremented whenever the indexed features or their bounds change
+        self._index_version = 0
+        self._by_id: dict[int, ft.Control] = {}
+        self._order: dict[int, int] = {}
+        self._bounds_cache: dict[int, tuple[object, BoundingBox]] = {}
+        self._max_hit_radius = 0.0
+
+    @property
+    def features(self) -> list:
+        """
+        All the features of this layer.
+
+        When [`viewport_culling`][..] is disabled, this is the feature list
+        of the layer itself. Otherwise, it holds the whole dataset, of which only
+        the features in view are sent to the client.
+        """
+        if self._features is None:
+            return getattr(self, self._features_field)
+        return self._features
+
+    @features.setter
+    def features(self, value: list):
+        if self._features is None:
+            setattr(self, self._features_field, value)
+        else:
+            self._features = value
+        self._index_dirty = True
+
+    def query_point(
+        self, point: MapLatitudeLongitude, tolerance: ft.Number = 0
+    ) -> list:
+        """
+        Returns the features under a point, such as
+        [`MapTapEvent.coordinates`][(p).].
+
+        The on-screen size of the features (such as the size of markers or the
+        stroke width of polylines) is taken into account once the camera of the
+        map is known, see [`camera`][..].
+
+        Args:
+            point: The point to look up.
+            tolerance: The distance, in meters, within which a feature is still
+                considered under `point`. Must be non-negative.
+
+        Returns:
+            The features under `point`, in the order of [`features`][..]
+                (that is, the top-most feature last).
+
+        Raises:
+            AssertionError: If `tolerance` is negative.
+        """
+        assert tolerance >= 0, (
+            f"tolerance must be greater than or equal to 0, got {tolerance}"
+        )
+        index = self._index()
+        meters_per_pixel = self._meters_per_pixel(point.latitude)
+        candidates = index.query_point(
+            point.latitude,
+            point.longitude,
+            tolerance + self._max_hit_radius * meters_per_pixel,
+        )
+        return [
+            f
+            for f in self._sorted(candidates)
+            if self._hit_test(
+                f, point, tolerance + self._hit_radius(f) * meters_per_pixel
+            )
+        ]
+
+    def query_bbox(self, bounds: MapLatitudeLongitudeBounds) -> list:
+        """
+        Returns the features whose bounding box intersects `bounds`.
+
+        Returns:
+            The matching features, in the order of [`features`][..].
+        """
+        return self._sorted(self._index().query_bbox(_bounding_box_of(bounds)))
+
+    def nearest(self, point: MapLatitudeLongitude, k: int = 1) -> list:
+        """
+        Returns the `k` features closest to `point`, closest first.
+
+        The distance of a feature is measured to its bounding box.
+
+        Raises:
+            AssertionError: If `k` is negative.
+        """
+        nearest = self._index().nearest(point.latitude, point.longitude, k)
+        return [self._by_id[i] for i in nearest]
+
+    def reindex(self, *features: ft.Control):
+        """
+        Updates the spatial index after the `coordinates` of `features`
+        were changed in place.
+
+        Features added to or removed from [`features`][..] are picked up
+        automatically. Features replaced in [`features`][..], or whose
+        `coordinates` were reassigned, are picked up on the next update of the
+        layer, or by a call to this method without arguments. This method is
+        only needed for features whose `coordinates` were modified in place,
+        or to query changed features before the next update.
+
+        Args:
+            *features: The moved features. If none is given,
+                all the features are reindexed.
+        """
+        if not features:
+            self._spatial_index = None
+            self._culled = None
+            return
+        index = self._index()
+        for feature in features:
+            if id(feature) in index:
+                self._bounds_cache.pop(id(feature), None)
+                index.insert(id(feature), self._bounds_of(feature))
+        self._index_version += 1
+        self._culled = None
+
+    async def set_filter(self, filter: Optional[FeatureFilter]):
+        """
+        Sets the [`filter`][..] of this layer, and sends it to the client
+        without updating the layer, so that the features, which are unchanged,
+        are not compared with their previous state.
+
+        Args:
+            filter: The new filter, or `None` to display all the features.
+        """
+        self.filter = filter
+        await self._invoke_method("set_filter", {"filter": filter})
+
+    def before_update(self):
+        super().before_update()
+        # the features may have been modified in place before the update
+        self._index_dirty = True
+        assert self.viewport_culling_margin >= 0, (
+            f"viewport_culling_margin must be greater than or equal to 0, "
+            f"got {self.viewport_culling_margin}"
+        )
+        if self._manages_features():
+            if self._features is None:
+                self._features = getattr(self, self._features_field)
+                # a new list, so that the dataset is not shared with the client view
+                setattr(self, self._features_field, [])
+            self._cull()
+        elif self._features is not None:
+            setattr(self, self._features_field, self._features)
+            self._features = None
+            self._culled = None
+
+    def _needs_camera(self) -> bool:
+        return self._manages_features() or super()._needs_camera()
+
+    def _manages_features(self) -> bool:
+        """
+        Whether the feature list of the layer is derived from [`features`][..]
+        and the camera, rather than set by the user.
+        """
+        return self.viewport_culling
+
+    def _camera_changed(self, camera: Camera) -> bool:
+        changed = super()._camera_changed(camera)
+        if self._features is not None:
+            changed = self._cull() or changed
+        return changed
+
+    def _cull(self) -> bool:
+        """
+        Updates the feature list of the layer with the features in view.
+
+        Returns:
+            `True` if the feature list was changed.
+        """
+        bounds = self._culling_bounds()
+        # the dataset is only queried again if it or the camera changed
+        self._index()
+        key = (
+            self._index_version,
+            bounds,
+            self.camera.zoom if self.camera is not None else None,
+        )
+        if key == self._culled:
+            return False
+        self._culled = key
+        visible = self._visible_features(bounds)
+        current = getattr(self, self._features_field)
+        if len(visible) == len(current) and all(
+            a is b for a, b in zip(visible, current)
+        ):
+            return False
+        setattr(self, self._features_field, visible)
+        return True
+
+    def _visible_features(self, bounds: Optional[BoundingBox]) -> list:
+        """Returns the features intersecting `bounds`."""
+        if bounds is None:
+            return []
+        return self._sorted(self._index().query_bbox(bounds))
+
+    def _index(self) -> SpatialIndex:
+        """
+        Returns the spatial index of the features, updated if needed.
+
+        The features are only compared with the indexed ones when the feature
+        list was replaced, changed length, or was invalidated by an update,
+        [`reindex`][..] or [`features`][..], so that queries do not scan them.
+        Added, removed, replaced and reordered features, as well as features
+        whose `coordinates` were reassigned, are then picked up.
+        """
+        features = self.features
+        key = (id(features), len(features))
+        if (
+            self._spatial_index is not None
+            and not self._index_dirty
+            and key == self._indexed
+        ):
+            return self._spatial_index
+        self._indexed = key
+        self._index_dirty = False
+        ids = list(map(id, features))
+        coordinates = [feature.coordinates for feature in features]
+        index = self._spatial_index
+        if index is None:
+            self._by_id = dict(zip(ids, features))
+            self._order = dict(zip(ids, range(len(ids))))
+            self._bounds_cache.clear()
+            index = self._spatial_index = SpatialIndex(
+                (i, self._bounds_of(f)) for i, f in self._by_id.items()
+            )
+            self._max_hit_radius = max(map(self._hit_radius, features), default=0.0)
+        elif ids != self._ids:
+            self._by_id = dict(zip(ids, features))
+            self._order = dict(zip(ids, range(len(ids))))
+            for i in [i for i in index if i not in self._by_id]:
+                index.remove(i)
+                self._bounds_cache.pop(i, None)
+            for i, feature in self._by_id.items():
+                if i not in index or self._moved(i, feature):
+                    self._insert(i, feature)
+        elif any(map(operator.is_not, coordinates, self._coordinates)):
+            for i, feature in self._by_id.items():
+                if self._moved(i, feature):
+                    self._insert(i, feature)
+        else:
+            return index
+        self._ids = ids
+        self._coordinates = coordinates
+        self._index_version += 1
+        return index
+
+    def _moved(self, i: int, feature: ft.Control) -> bool:
+        """Whether the `coordinates` of `feature` changed since it was indexed."""
+        cached = self._bounds_cache.get(i)
+        return cached is None or cached[0] is not feature.coordinates
+
+    def _insert(self, i: int, feature: ft.Control):
+        """Inserts, or moves, `feature` in the spatial index."""
+        self._spatial_index.insert(i, self._bounds_of(feature))
+        # only ever grows until the next full rebuild, which is fine
+        # as it only widens the candidates of `query_point()`
+        self._max_hit_radius = max(self._max_hit_radius, self._hit_radius(feature))
+
+    async def _update_feature_styles(
+        self,
+        styles: Optional[dict],
+        colors: Optional[dict],
+        border_colors: Optional[dict],
+    ):
+        """
+        Sets the `style`, `color` and `border_color` of features, and sends the
+        new values to the client by control id, without updating the features:
+        the next update does not send them again.
+        """
+        arguments = {}
+        for name, values in (
+            ("style", styles),
+            ("color", colors),
+            ("border_color", border_colors),
+        ):
+            if not values:
+                continue
+            for feature, value in values.items():
+                _set_sent(feature, name, value)
+            arguments[name] = {feature._i: value for feature, value in values.items()}
+        if arguments:
+            await self._invoke_method("update_feature_styles", arguments)
+
+    def _get_features(self, control_ids: list[int]) -> list:
+        """
+        Returns the features sent to the client with the given control ids,
+        in the order of `control_ids`.
+        """
+        by_control_id = {
+            feature._i: feature for feature in getattr(self, self._features_field)
+        }
+        return [by_control_id[i] for i in control_ids if i in by_control_id]
+
+    def _sorted(self, ids: list[int]) -> list:
+        """Returns the features with the given `ids`, in the order of `features`."""
+        return [self._by_id[i] for i in sorted(ids, key=self._order.__getitem__)]
+
+    def _hit_radius(self, feature: ft.Control) -> float:
+        """
+        The distance, in logical pixels, around the geometry of `feature`
+        within which it is drawn.
+        """
+        return 0.0
+
+    def _hit_test(
+        self, feature: ft.Control, point: MapLatitudeLongitude, tolerance: float
+    ) -> bool:
+        """Whether `feature` lies within `tolerance` meters of `point`."""
+        return _distance_to_box(point, self._bounds_of(feature)) <= tolerance
+
+    def _meters_per_pixel(self, latitude: float) -> float:
+        """
+        The length, in meters, of a logical pixel at `latitude`,
+        or `0` if the camera is not known yet.
+        """
+        if self.camera is None:
+            return 0.0
+        return (
+            _EARTH_CIRCUMFERENCE
+            * math.cos(math.radians(latitude))
+            / (_TILE_SIZE * 2**self.camera.zoom)
+        )
+
+    def _feature_bounds(self, feature: ft.Control) -> BoundingBox:
+        """Computes the bounding box of `feature`."""
+        return _bounding_box(feature.coordinates)
+
+    def _culling_bounds(self) -> Optional[BoundingBox]:
+        """
+        Returns the visible bounds of the map, extended by
+        `viewport_culling_margin`, or `None` if they are not known yet.
+        """
+        camera = self.camera
+        if camera is None or camera.visible_bounds is None:
+            return None
+        corner_1 = camera.visible_bounds.corner_1
+        corner_2 = camera.visible_bounds.corner_2
+        margin = self.viewport_culling_margin / (_TILE_SIZE * 2**camera.zoom)
+        south = _unproject_y(
+            _project_y(min(corner_1.latitude, corner_2.latitude)) + margin
+        )
+        north = _unproject_y(
+            _project_y(max(corner_1.latitude, corner_2.latitude)) - margin
+        )
+        west = min(corner_1.longitude, corner_2.longitude) - margin * 360
+        east = max(corner_1.longitude, corner_2.longitude) + margin * 360
+        return south, west, north, east
+
+    def _bounds_of(self, feature: ft.Control) -> BoundingBox:
+        """Returns the (cached) bounding box of `feature`."""
+        coordinates = feature.coordinates
+        cached = self._bounds_cache.get(id(feature))
+        if cached is not None and cached[0] is coordinates:
+            return cached[1]
+        bounds = self._feature_bounds(feature)
+        self._bounds_cache[id(feature)] = (coordinates, bounds)
+        return bounds
+
+
+def _set_sent(control: ft.Control, field_name: str, value):
+    """
+    Sets the field `field_name` of `control` to `value` as already sent, as it
+    was applied on the client by a method call, so that the next update does
+    not send it again.
+    """
+    object.__setattr__(control, field_name, value)
+    getattr(control, "__changes", {}).pop(field_name, None)
+    # the snapshots the next update compares the field with, if it was sent
+    for snapshots in ("__prev_lists", "__prev_dicts", "__prev_classes"):
+        getattr(control, snapshots, {}).pop(field_name, None)
+    if not hasattr(control, "__prev_lists"):
+        return
+    if isinstance(value, list):
+        getattr(control, "__prev_lists")[field_name] = value[:]
+    elif isinstance(value, dict):
+        getattr(control, "__prev_dicts")[field_name] = value.copy()
+    elif dataclasses.is_dataclass(value):
+        getattr(control, "__prev_classes")[field_name] = value
+
+
+def _bounding_box_of(bounds: MapLatitudeLongitudeBounds) -> BoundingBox:
+    """Returns `bounds` as a bounding box."""
+    corner_1, corner_2 = bounds.corner_1, bounds.corner_2
+    return (
+        min(corner_1.latitude, corner_2.latitude),
+        min(corner_1.longitude, corner_2.longitude),
+        max(corner_1.latitude, corner_2.latitude),
+        max(corner_1.longitude, corner_2.longitude),
+    )
+
+
+def _bounding_box(coordinates) -> BoundingBox:
+    """Returns the bounding box of a point, or of a list of points."""
+    if isinstance(coordinates, MapLatitudeLongitude):
+        return (
+            coordinates.latitude,
+            coordinates.longitude,
+            coordinates.latitude,
+            coordinates.longitude,
+        )
+    if isinstance(coordinates, MapLatitudeLongitudeArray):
+        values = coordinates.values()
+        latitudes, longitudes = values[0::2], values[1::2]
+    else:
+        latitudes = [c.latitude for c in coordinates]
+        longitudes = [c.longitude for c in coordinates]
+    if not latitudes:
+        # never visible
+        return math.inf, math.inf, -math.inf, -math.inf
+    return min(latitudes), min(longitudes), max(latitudes), max(longitudes)
+
+
+def _project_y(latitude: float) -> float:
+    """Projects `latitude` to a normalized Web Mercator `y` (`0` at the top)."""
+    latitude = math.radians(max(-_MAX_LATITUDE, min(_MAX_LATITUDE, latitude)))
+    return 0.5 - math.log(math.tan(math.pi / 4 + latitude / 2)) / (2 * math.pi)
+
+
+def _unproject_y(y: float) -> float:
+    """Returns the latitude of a normalized Web Mercator `y`."""
+    y = max(0.0, min(1.0, y))
+    return math.degrees(2 * math.atan(math.exp((0.5 - y) * 2 * math.pi)) - math.pi / 2)
+
+
+def _flatten(coordinates) -> list[float]:
+    """Returns `coordinates` as interleaved `latitude, longitude` values."""
+    if isinstance(coordinates, MapLatitudeLongitudeArray):
+        return coordinates.values()
+    values = []
+    for c in coordinates:
+        values.append(c.latitude)
+        values.append(c.longitude)
+    return values
+
+
+def _convex_hull(coordinates) -> list[MapLatitudeLongitude]:
+    """
+    Returns the vertices of the convex hull of `coordinates` in the Web Mercator
+    projection, which include the extreme coordinates in any direction of the
+    (possibly rotated) map.
+    """
+    values = _flatten(coordinates)
+    # projected point -> index of its latitude in values
+    projected = {
+        ((values[i + 1] + 180) / 360, _project_y(values[i])): i
+        for i in range(0, len(values), 2)
+    }
+    points = sorted(projected)
+    if len(points) > 2:
+        # Andrew's monotone chain
+        def half(points):
+            chain = []
+            for p in points:
+                while len(chain) >= 2 and _cross(chain[-2], chain[-1], p) <= 0:
+                    chain.pop()
+                chain.append(p)
+            return chain[:-1]
+
+        points = half(points) + half(reversed(points))
+    return [
+        MapLatitudeLongitude(values[projected[p]], values[projected[p] + 1])
+        for p in points
+    ]
+
+
+def _cross(o: tuple, a: tuple, b: tuple) -> float:
+    """The z component of the cross product of `o->a` and `o->b`."""
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _to_local(values, origin: MapLatitudeLongitude) -> list[float]:
+    """
+    Projects interleaved `latitude, longitude` values to interleaved `x, y`
+    distances in meters from `origin`, using an equirectangular approximation.
+    """
+    scale = math.cos(math.radians(origin.latitude)) * _METERS_PER_DEGREE
+    local = []
+    for i in range(0, len(values), 2):
+        local.append((values[i + 1] - origin.longitude) * scale)
+        local.append((values[i] - origin.latitude) * _METERS_PER_DEGREE)
+    return local
+
+
+def _distance_to_box(point: MapLatitudeLongitude, bounds: BoundingBox) -> float:
+    """Returns the distance, in meters, from `point` to `bounds`."""
+    south, west, north, east = bounds
+    dy = max(south - point.latitude, 0.0, point.latitude - north)
+    dx = max(west - point.longitude, 0.0, point.longitude - east)
+    scale = math.cos(math.radians(point.latitude))
+    return math.hypot(dx * scale, dy) * _METERS_PER_DEGREE
+
+
+def _distance_to_line(
+    point: MapLatitudeLongitude, coordinates, closed: bool = False
+) -> float:
+    """
+    Returns the distance, in meters, from `point` to the line through
+    `coordinates` (closed into a ring if `closed`).
+    """
+    local = _to_local(_flatten(coordinates), point)
+    count = len(local) // 2
+    if count == 0:
+        return math.inf
+    if count == 1:
+        return math.hypot(local[0], local[1])
+    best = math.inf
+    last = count if closed else count - 1
+    for i in range(last):
+        j = (i + 1) % count
+        ax, ay = local[2 * i], local[2 * i + 1]
+        dx, dy = local[2 * j] - ax, local[2 * j + 1] - ay
+        length = dx * dx + dy * dy
+        t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+        best = min(best, math.hypot(ax + t * dx, ay + t * dy))
+    return best
+
+
+def _contains(coordinates, point: MapLatitudeLongitude) -> bool:
+    """Whether the ring through `coordinates` contains `point` (even-odd rule)."""
+    values = _flatten(coordinates)
+    count = len(values) // 2
+    inside = False
+    latitude, longitude = point.latitude, point.longitude
+    j = count - 1
+    for i in range(count):
+        yi, xi = values[2 * i], values[2 * i + 1]
+        yj, xj = values[2 * j], values[2 * j + 1]
+        if (yi > latitude) != (yj > latitude) and longitude < (xj - xi) * (
+            latitude - yi
+        ) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
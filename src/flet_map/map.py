@@ -1,15 +1,22 @@
-from dataclasses import field
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import field, replace
 from typing import Optional
 
 import flet as ft
+from flet.utils.from_dict import from_dict
 
+from flet_map.feature_layer import _convex_hull
 from flet_map.map_layer import MapLayer
 from flet_map.types import (
+    Camera,
     CameraFit,
+    EventThrottleConfiguration,
     InteractionConfiguration,
     MapEvent,
     MapHoverEvent,
     MapLatitudeLongitude,
+    MapLatitudeLongitudeBounds,
     MapPointerEvent,
     MapPositionChangeEvent,
     MapTapEvent,
@@ -117,6 +124,11 @@ class Map(ft.ConstrainedControl):
     on_hover: Optional[ft.EventHandler[MapHoverEvent]] = None
     """
     Fires when a hover event occurs.
+
+    See [`hover_interval`][..] to limit its rate, and the `on_feature_hover`
+    event of vector layers, such as
+    [`PolygonLayer.on_feature_hover`][(p).], to only be notified when the
+    pointer enters or leaves their features.
     """
 
     on_secondary_tap: Optional[ft.EventHandler[MapTapEvent]] = None
@@ -132,11 +144,54 @@ class Map(ft.ConstrainedControl):
     on_event: Optional[ft.EventHandler[MapEvent]] = None
     """
     Fires when any map events occurs.
+
+    See [`event_throttle`][..] to limit the rate of the events fired
+    during gestures and animations.
     """
 
     on_position_change: Optional[ft.EventHandler[MapPositionChangeEvent]] = None
     """
     Fires when the map position changes.
+
+    See [`position_change_throttle`][..] to limit its rate.
+    """
+
+    camera_link_group: Optional[str] = None
+    """
+    The name of a group of maps whose cameras are kept in sync.
+
+    When the camera of a map of the group changes, by a gesture or a method
+    such as [`move_to()`][(c).move_to], its center, zoom and rotation are
+    applied to the other maps of the group directly on the client, without
+    a round trip to Python. The maps are synced from the first camera change
+    after they join the group.
+
+    Followers also fire [`on_position_change`][..], whose rate can be limited
+    with [`position_change_throttle`][..].
+    """
+
+    event_throttle: Optional[EventThrottleConfiguration] = None
+    """
+    Limits the rate of the [`on_event`][..] events fired during gestures and
+    animations, such as moves, rotations and zooms.
+    Other events, e.g. taps or the end of a gesture, are always fired.
+
+    If `None`, all the events are fired.
+    """
+
+    hover_interval: Optional[ft.DurationValue] = None
+    """
+    The minimum delay between two [`on_hover`][..] events.
+    The last position of the pointer is always sent.
+
+    If `None`, an event is fired on every move of the pointer.
+    """
+
+    position_change_throttle: Optional[EventThrottleConfiguration] = None
+    """
+    Limits the rate of the [`on_position_change`][..] events.
+
+    If `None`, an event is fired on every frame the map position changes.
     """
 
     on_pointer_down: Optional[ft.EventHandler[MapPointerEvent]] = None
@@ -154,6 +209,59 @@ class Map(ft.ConstrainedControl):
     Fires when a pointer up event occurs.
     """
 
+    def init(self):
+        super().init()
+        self._batch: Optional[list[dict]] = None
+
+    async def get_camera(self) -> Camera:
+        """
+        Returns the current camera of the map, in a single round trip
+        to the client.
+        """
+        return from_dict(Camera, await self._invoke_method("get_camera"))
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncGenerator[None, None]:
+        """
+        Groups camera operations, such as [`move_to()`][(c).move_to] or
+        [`zoom_to()`][(c).zoom_to], into a single call to the client.
+
+        Within the `async with` block, camera operations are recorded and
+        return immediately. They are sent together when the block exits, and
+        run on the client one after the other, each starting when the previous
+        one (and its animation) completes. Nothing is sent if the block
+        raises an exception.
+
+        Example:
+            ```python
+            async with map.batch():
+                await map.move_to(paris, zoom=12)
+                await map.rotate_from(45)
+                await map.zoom_out()
+            ```
+
+        Raises:
+            AssertionError: If a batch is already in progress.
+        """
+        assert self._batch is None, "batches cannot be nested"
+        self._batch = operations = []
+        try:
+            yield
+        finally:
+            self._batch = None
+        if operations:
+            await self._invoke_method("batch", {"operations": operations})
+
+    async def _run_camera_operation(self, name: str, arguments: dict):
+        """
+        Runs the camera operation `name` on the client,
+        or records it if a [`batch()`][(c).batch] is in progress.
+        """
+        if self._batch is not None:
+            self._batch.append({"name": name, "arguments": arguments})
+        else:
+            await self._invoke_method(name, arguments)
+
     async def rotate_from(
         self,
         degree: ft.Number,
@@ -173,9 +281,9 @@ class Map(ft.ConstrainedControl):
             cancel_ongoing_animations: Whether to cancel/stop all
                 ongoing map-animations before starting this new one.
         """
-        await self._invoke_method(
-            method_name="rotate_from",
-            arguments={
+        await self._run_camera_operation(
+            "rotate_from",
+            {
                 "degree": degree,
                 "curve": animation_curve or self.animation_curve,
                 "duration": animation_duration or self.animation_duration,
@@ -200,9 +308,9 @@ class Map(ft.ConstrainedControl):
             cancel_ongoing_animations: Whether to cancel/stop all
                 ongoing map-animations before starting this new one.
         """
-        await self._invoke_method(
-            method_name="reset_rotation",
-            arguments={
+        await self._run_camera_operation(
+            "reset_rotation",
+            {
                 "curve": animation_curve or self.animation_curve,
                 "duration": animation_duration or self.animation_duration,
                 "cancel_ongoing_animations": cancel_ongoing_animations,
@@ -226,9 +334,9 @@ class Map(ft.ConstrainedControl):
             cancel_ongoing_animations: Whether to cancel/stop all
                 ongoing map-animations before starting this new one.
         """
-        await self._invoke_method(
-            method_name="zoom_in",
-            arguments={
+        await self._run_camera_operation(
+            "zoom_in",
+            {
                 "curve": animation_curve or self.animation_curve,
                 "duration": animation_duration or self.animation_duration,
                 "cancel_ongoing_animations": cancel_ongoing_animations,
@@ -252,9 +360,9 @@ class Map(ft.ConstrainedControl):
             cancel_ongoing_animations: Whether to cancel/stop all
                 ongoing map-animations before starting this new one.
         """
-        await self._invoke_method(
-            method_name="zoom_out",
-            arguments={
+        await self._run_camera_operation(
+            "zoom_out",
+            {
                 "curve": animation_curve or self.animation_curve,
                 "duration": animation_duration or self.animation_duration,
                 "cancel_ongoing_animations": cancel_ongoing_animations,
@@ -280,9 +388,9 @@ class Map(ft.ConstrainedControl):
             cancel_ongoing_animations: Whether to cancel/stop all
                 ongoing map-animations before starting this new one.
         """
-        await self._invoke_method(
-            method_name="zoom_to",
-            arguments={
+        await self._run_camera_operation(
+            "zoom_to",
+            {
                 "zoom": zoom,
                 "curve": animation_curve or self.animation_curve,
                 "duration": animation_duration or self.animation_duration,
@@ -322,9 +430,9 @@ class Map(ft.ConstrainedControl):
         assert zoom is None or zoom >= 0, (
             f"zoom must be greater than or equal to zero, got {zoom}"
         )
-        await self._invoke_method(
-            method_name="move_to",
-            arguments={
+        await self._run_camera_operation(
+            "move_to",
+            {
                 "destination": destination,
                 "zoom": zoom,
                 "offset": offset,
@@ -356,9 +464,9 @@ class Map(ft.ConstrainedControl):
             cancel_ongoing_animations: Whether to cancel/stop all
                 ongoing map-animations before starting this new one.
         """
-        await self._invoke_method(
-            method_name="center_on",
-            arguments={
+        await self._run_camera_operation(
+            "center_on",
+            {
                 "point": point,
                 "zoom": zoom,
                 "curve": animation_curve or self.animation_curve,
@@ -366,3 +474,69 @@ class Map(ft.ConstrainedControl):
                 "cancel_ongoing_animations": cancel_ongoing_animations,
             },
         )
+
+    async def fit_camera(
+        self,
+        fit: CameraFit,
+        animation_curve: Optional[ft.AnimationCurve] = None,
+        animation_duration: Optional[ft.DurationValue] = None,
+        cancel_ongoing_animations: bool = False,
+    ) -> None:
+        """
+        Moves the camera so that it fits the bounds or coordinates of `fit`.
+
+        The fit is computed on the client, which knows the size of the map.
+        Only the convex hull of [`CameraFit.coordinates`][(p).], which holds
+        the coordinates that matter for the fit, is sent.
+
+        Args:
+            fit: The bounds or coordinates to fit.
+            animation_curve: The curve of the animation. If None (the default),
+                [`Map.animation_curve`][(p).] will be used.
+            animation_duration: The duration of the animation.
+                If None (the default), [`Map.animation_duration`][(p).] will be used.
+            cancel_ongoing_animations: Whether to cancel/stop all
+                ongoing map-animations before starting this new one.
+        """
+        if fit.coordinates:
+            fit = replace(fit, coordinates=_convex_hull(fit.coordinates))
+        await self._run_camera_operation(
+            "fit_camera",
+            {
+                "fit": fit,
+                "curve": animation_curve or self.animation_curve,
+                "duration": animation_duration or self.animation_duration,
+                "cancel_ongoing_animations": cancel_ongoing_animations,
+            },
+        )
+
+    async def fit_bounds(
+        self,
+        bounds: MapLatitudeLongitudeBounds,
+        padding: ft.PaddingValue = 0,
+        animation_curve: Optional[ft.AnimationCurve] = None,
+        animation_duration: Optional[ft.DurationValue] = None,
+        cancel_ongoing_animations: bool = False,
+    ) -> None:
+        """
+        Moves the camera so that it contains `bounds`.
+
+        A shorthand for [`fit_camera()`][(c).fit_camera] with a
+        [`CameraFit`][(p).] of `bounds`.
+
+        Args:
+            bounds: The bounds to fit.
+            padding: The padding, in logical pixels, around the bounds.
+            animation_curve: The curve of the animation. If None (the default),
+                [`Map.animation_curve`][(p).] will be used.
+            animation_duration: The duration of the animation.
+                If None (the default), [`Map.animation_duration`][(p).] will be used.
+            cancel_ongoing_animations: Whether to cancel/stop all
+                ongoing map-animations before starting this new one.
+        """
+        await self.fit_camera(
+            CameraFit(bounds=bounds, padding=padding),
+            animation_curve=animation_curve,
+            animation_duration=animation_duration,
+            cancel_ongoing_animations=cancel_ongoing_animations,
+        )
@@ -1,9 +1,13 @@
+from typing import Optional
+
 import flet as ft
 
+from flet_map.types import Camera, MapCameraChangeEvent
+
 __all__ = ["MapLayer"]
 
 
-@ft.control("MapLayer")
+@ft.control("MapLayer", kw_only=True)
 class MapLayer(ft.Control):
     """
     Abstract class for all map layers.
@@ -18,3 +22,56 @@ class MapLayer(ft.Control):
     - [`SimpleAttribution`][(p).]
     - [`TileLayer`][(p).]
     """
+
+    on_camera_change: Optional[ft.EventHandler[MapCameraChangeEvent]] = None
+    """
+    Called when the camera of the map this layer belongs to changes.
+
+    To limit the traffic between the client and the server, camera changes
+    are throttled while the map is being moved.
+    """
+
+    def init(self):
+        super().init()
+        self._camera: Optional[Camera] = None
+
+    @property
+    def camera(self) -> Optional[Camera]:
+        """
+        The last known camera of the map this layer belongs to.
+
+        Only available when the layer tracks camera changes, that is, when
+        [`on_camera_change`][..] is set or the layer relies on the camera
+        to decide what to send to the client.
+        """
+        return self._camera
+
+    def before_update(self):
+        super().before_update()
+        if self._needs_camera():
+            self._internals["track_camera"] = True
+        else:
+            self._internals.pop("track_camera", None)
+
+    def before_event(self, e: ft.ControlEvent):
+        if isinstance(e, MapCameraChangeEvent):
+            self._camera = e.camera
+            if self._camera_changed(e.camera):
+                self.update()
+        return super().before_event(e)
+
+    def _needs_camera(self) -> bool:
+        """
+        Whether this layer needs camera changes even if
+        [`on_camera_change`][..] is not set.
+        """
+        return False
+
+    def _camera_changed(self, camera: Camera) -> bool:
+        """
+        Called when the camera changes, before [`on_camera_change`][..].
+
+        Returns:
+            `True` if the layer was changed and must be updated.
+        """
+        return False
@@ -1,10 +1,10 @@
 from dataclasses import field
-from typing import Optional
+from typing import Optional, Union
 
 import flet as ft
 
-from flet_map.map_layer import MapLayer
-from flet_map.types import MapLatitudeLongitude
+from flet_map.feature_layer import FeatureLayer, _set_sent
+from flet_map.types import MapLatitudeLongitude, MapLatitudeLongitudeArray
 
 __all__ = ["Marker", "MarkerLayer"]
 
@@ -73,6 +73,12 @@ class Marker(ft.Control):
     Defaults to the value of the parent [`MarkerLayer.alignment`][(p).].
     """
 
+    attributes: Optional[dict[str, Union[str, ft.Number, bool]]] = None
+    """
+    The attributes of this marker, which the
+    [`filter`][(p).MarkerLayer.filter] of its layer can match.
+    """
+
     def before_update(self):
         super().before_update()
         assert self.content.visible, "content must be visible"
@@ -85,9 +91,15 @@ class Marker(ft.Control):
 
 
 @ft.control("MarkerLayer")
-class MarkerLayer(MapLayer):
+class MarkerLayer(FeatureLayer):
     """
     A layer to display Markers.
+
+    The client only rebuilds the markers whose properties changed: moving a
+    few markers of a large layer does not rebuild the
+    [`content`][(p).Marker.content] of the others. Markers are matched across
+    updates by their [`key`][flet.Control.key] if set, else by control, so
+    give a `key` to markers which are re-created on each update.
     """
 
     markers: list[Marker]
@@ -108,3 +120,71 @@ class MarkerLayer(MapLayer):
     Whether to counter-rotate `markers` to the map's rotation,
     to keep a fixed orientation.
     """
+
+    _features_field = "markers"
+
+    async def move_markers(
+        self,
+        positions: dict[
+            ft.KeyValue, Union[MapLatitudeLongitude, tuple[ft.Number, ft.Number]]
+        ],
+        animation_duration: ft.DurationValue = 500,
+        animation_curve: ft.AnimationCurve = ft.AnimationCurve.LINEAR,
+    ) -> None:
+        """
+        Moves markers to new positions, animating their movement on the client.
+
+        Only the keys and the new coordinates of the markers are sent, as a
+        single packed buffer, and the markers are interpolated from their
+        current position on the client. For markers updated periodically,
+        an `animation_duration` close to the update period keeps them moving
+        smoothly between updates.
+
+        The [`coordinates`][(p).Marker.coordinates] of the markers are
+        updated accordingly on the Python side, without being sent again by
+        the next update.
+
+        Args:
+            positions: The new coordinates of the markers, by marker
+                [`key`][flet.Control.key]. Keys of no marker of
+                [`features`][(p).FeatureLayer.] are ignored.
+            animation_duration: The duration of the movement.
+            animation_curve: The curve of the movement.
+        """
+        by_key = {
+            _key_value(marker.key): marker
+            for marker in self.features
+            if marker.key is not None
+        }
+        keys, coordinates, moved = [], [], []
+        for key, position in positions.items():
+            key = _key_value(key)
+            marker = by_key.get(key)
+            if marker is None:
+                continue
+            if not isinstance(position, MapLatitudeLongitude):
+                position = MapLatitudeLongitude(*position)
+            _set_sent(marker, "coordinates", position)
+            keys.append(key)
+            coordinates.append(position)
+            moved.append(marker)
+        if not moved:
+            return
+        self.reindex(*moved)
+        await self._invoke_method(
+            "move_markers",
+            {
+                "keys": keys,
+                "coordinates": MapLatitudeLongitudeArray(coordinates),
+                "duration": animation_duration,
+                "curve": animation_curve,
+            },
+        )
+
+    def _hit_radius(self, feature: Marker) -> float:
+        return max(feature.width, feature.height) / 2
+
+
+def _key_value(key: ft.KeyValue):
+    """Returns the value of `key`, as identified on the client."""
+    return key.value if isinstance(key, ft.Key) else key
@@ -1,9 +1,21 @@
-from typing import Optional
+from dataclasses import field
+from typing import Optional, Union
 
 import flet as ft
 
-from flet_map.map_layer import MapLayer
-from flet_map.types import MapLatitudeLongitude
+from flet_map.feature_layer import FeatureLayer, _contains, _distance_to_line
+from flet_map.simplification import (
+    _select_levels_of_detail,
+    _uses_level_of_detail,
+)
+from flet_map.types import (
+    Camera,
+    FeatureStyle,
+    MapFeatureHoverEvent,
+    MapFeatureTapEvent,
+    MapLatitudeLongitude,
+    MapLatitudeLongitudeArray,
+)
 
 __all__ = ["PolygonLayer", "PolygonMarker"]
 
@@ -14,9 +26,12 @@ class PolygonMarker(ft.Control):
     A marker for the [`PolygonLayer`][(p).].
     """
 
-    coordinates: list[MapLatitudeLongitude]
+    coordinates: Union[list[MapLatitudeLongitude], MapLatitudeLongitudeArray]
     """
     The points for the outline of this polygon.
+
+    For large polygons, prefer a [`MapLatitudeLongitudeArray`][(p).], which is
+    stored and sent to the client as a single packed buffer.
     """
 
     label: Optional[str] = None
@@ -73,6 +88,21 @@ class PolygonMarker(ft.Control):
     Style to use for line segment joins.
     """
 
+    style: Optional[str] = None
+    """
+    The id of the [`FeatureStyle`][(p).] of this polygon, in the
+    [`styles`][(p).PolygonLayer.styles] of its layer.
+
+    The properties of the style which are not `None` are used instead of
+    the ones of this polygon. Unknown ids are ignored.
+    """
+
+    attributes: Optional[dict[str, Union[str, ft.Number, bool]]] = None
+    """
+    The attributes of this polygon, which the
+    [`filter`][(p).PolygonLayer.filter] of its layer can match.
+    """
+
     def before_update(self):
         super().before_update()
         assert self.border_stroke_width >= 0, (
@@ -82,7 +112,7 @@ class PolygonMarker(ft.Control):
 
 
 @ft.control("PolygonLayer")
-class PolygonLayer(MapLayer):
+class PolygonLayer(FeatureLayer):
     """
     A layer to display PolygonMarkers.
     """
@@ -124,3 +154,82 @@ class PolygonLayer(MapLayer):
     huge number of polygons to triangulate - and so this is best used in
     conjunction with simplification, not as a replacement.
     """
+
+    styles: dict[str, FeatureStyle] = field(default_factory=dict)
+    """
+    The styles which the [`polygons`][..] can reference by id,
+    with [`PolygonMarker.style`][(p).].
+    """
+
+    on_feature_hover: Optional[ft.EventHandler[MapFeatureHoverEvent]] = None
+    """
+    Fires when the pointer enters or leaves the [`polygons`][..] of the
+    layer, or moves over other ones.
+
+    Hits are tested on the client, so pointer moves which do not change the
+    polygons under the pointer are not sent.
+    """
+
+    on_feature_tap: Optional[ft.EventHandler[MapFeatureTapEvent]] = None
+    """
+    Fires when [`polygons`][..] of the layer are tapped, with all the ones
+    under the pointer.
+
+    Hits are tested on the client, using the rendered geometries, so no
+    geometric search is needed on the Python side. Taps handled by the layer
+    may not fire [`Map.on_tap`][(p).].
+    """
+
+    _features_field = "polygons"
+
+    async def update_feature_styles(
+        self,
+        styles: Optional[dict[PolygonMarker, Optional[str]]] = None,
+        colors: Optional[dict[PolygonMarker, ft.ColorValue]] = None,
+        border_colors: Optional[dict[PolygonMarker, ft.ColorValue]] = None,
+    ) -> None:
+        """
+        Changes the style id, color or border color of many polygons at once,
+        e.g. to recolor a choropleth map.
+
+        Only the new values are sent to the client, by polygon: the polygons
+        are not updated, so their coordinates are neither sent nor parsed again.
+        The properties of the polygons are also set on the Python side, without
+        being sent again by the next update.
+
+        Note:
+            The parsed points of the polygons are kept on the client, but
+            flutter_map still re-projects, simplifies and triangulates all
+            the polygons of the layer when any of them is restyled: keeping
+            their projected geometry apart from their style is out of scope.
+
+        Args:
+            styles: The new [`style`][(p).PolygonMarker.style] of polygons.
+            colors: The new [`color`][(p).PolygonMarker.color] of polygons.
+            border_colors: The new [`border_color`][(p).PolygonMarker.border_color]
+                of polygons.
+        """
+        await self._update_feature_styles(styles, colors, border_colors)
+
+    def before_update(self):
+        super().before_update()
+        if self.camera is not None:
+            _select_levels_of_detail(self.polygons, self.camera.zoom)
+
+    def _needs_camera(self) -> bool:
+        return super()._needs_camera() or _uses_level_of_detail(self.features)
+
+    def _camera_changed(self, camera: Camera) -> bool:
+        changed = super()._camera_changed(camera)
+        return _select_levels_of_detail(self.polygons, camera.zoom) or changed
+
+    def _hit_radius(self, feature: PolygonMarker) -> float:
+        return feature.border_stroke_width / 2
+
+    def _hit_test(
+        self, feature: PolygonMarker, point: MapLatitudeLongitude, tolerance: float
+    ) -> bool:
+        return (
+            _contains(feature.coordinates, point)
+            or _distance_to_line(point, feature.coordinates, closed=True) <= tolerance
+        )
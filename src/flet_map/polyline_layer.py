@@ -1,10 +1,24 @@
 from dataclasses import field
-from typing import Optional
+from typing import Optional, Union
 
 import flet as ft
 
-from flet_map.map_layer import MapLayer
-from flet_map.types import MapLatitudeLongitude, SolidStrokePattern, StrokePattern
+from flet_map.feature_layer import FeatureLayer, _distance_to_line
+from flet_map.simplification import (
+    LevelOfDetailCoordinates,
+    _select_levels_of_detail,
+    _uses_level_of_detail,
+)
+from flet_map.types import (
+    Camera,
+    FeatureStyle,
+    MapFeatureHoverEvent,
+    MapFeatureTapEvent,
+    MapLatitudeLongitude,
+    MapLatitudeLongitudeArray,
+    SolidStrokePattern,
+    StrokePattern,
+)
 
 __all__ = ["PolylineLayer", "PolylineMarker"]
 
@@ -15,9 +29,12 @@ class PolylineMarker(ft.Control):
     A marker for the [`PolylineLayer`][(p).].
     """
 
-    coordinates: list[MapLatitudeLongitude]
+    coordinates: Union[list[MapLatitudeLongitude], MapLatitudeLongitudeArray]
     """
     The list of coordinates for the polyline.
+
+    For large polylines, prefer a [`MapLatitudeLongitudeArray`][(p).], which is
+    stored and sent to the client as a single packed buffer.
     """
 
     colors_stop: Optional[list[ft.Number]] = None
@@ -77,6 +94,21 @@ class PolylineMarker(ft.Control):
     Style to use for line segment joins.
     """
 
+    style: Optional[str] = None
+    """
+    The id of the [`FeatureStyle`][(p).] of this polyline, in the
+    [`styles`][(p).PolylineLayer.styles] of its layer.
+
+    The properties of the style which are not `None` are used instead of
+    the ones of this polyline. Unknown ids are ignored.
+    """
+
+    attributes: Optional[dict[str, Union[str, ft.Number, bool]]] = None
+    """
+    The attributes of this polyline, which the
+    [`filter`][(p).PolylineLayer.filter] of its layer can match.
+    """
+
     def before_update(self):
         super().before_update()
         assert self.border_stroke_width >= 0, (
@@ -87,9 +119,80 @@ class PolylineMarker(ft.Control):
             f"stroke_width must be greater than or equal to 0, got {self.stroke_width}"
         )
 
+    async def append_points(
+        self,
+        points: Union[list[MapLatitudeLongitude], MapLatitudeLongitudeArray],
+    ) -> None:
+        """
+        Appends `points` to the end of this polyline.
+
+        Only the new points are sent to the client, where they extend the
+        already displayed polyline, instead of re-sending and re-parsing
+        all [`coordinates`][..]. [`coordinates`][..] is updated accordingly,
+        without the new points being sent again by the next update.
+
+        This is best suited for live tracks whose [`coordinates`][..] is a
+        [`MapLatitudeLongitudeArray`][(p).].
+
+        Args:
+            points: The coordinates to append, in any form accepted by
+                [`MapLatitudeLongitudeArray`][(p).].
+
+        Raises:
+            AssertionError: If [`coordinates`][..] is a
+                [`LevelOfDetailCoordinates`][(p).].
+        """
+        assert not isinstance(self.coordinates, LevelOfDetailCoordinates), (
+            "append_points() is not supported for LevelOfDetailCoordinates"
+        )
+        points = MapLatitudeLongitudeArray(points)
+        if not len(points):
+            return
+        if isinstance(self.coordinates, MapLatitudeLongitudeArray):
+            self.coordinates._extend(points)
+        else:
+            self.coordinates.extend(points)
+            _mark_sent(self, "coordinates")
+        await self._invoke_method(
+            method_name="append_points",
+            arguments={"points": points},
+        )
+
+    async def trim_head(self, count: int) -> None:
+        """
+        Removes the first `count` points of this polyline.
+
+        Only the number of removed points is sent to the client.
+        [`coordinates`][..] is updated accordingly, without the removal being
+        sent again by the next update.
+
+        Args:
+            count: The number of points to remove from the start of the polyline.
+                Must be non-negative.
+
+        Raises:
+            AssertionError: If `count` is negative, or if [`coordinates`][..] is a
+                [`LevelOfDetailCoordinates`][(p).].
+        """
+        assert count >= 0, f"count must be greater than or equal to 0, got {count}"
+        assert not isinstance(self.coordinates, LevelOfDetailCoordinates), (
+            "trim_head() is not supported for LevelOfDetailCoordinates"
+        )
+        if count == 0:
+            return
+        if isinstance(self.coordinates, MapLatitudeLongitudeArray):
+            self.coordinates._trim_head(count)
+        else:
+            del self.coordinates[:count]
+            _mark_sent(self, "coordinates")
+        await self._invoke_method(
+            method_name="trim_head",
+            arguments={"count": count},
+        )
+
 
 @ft.control("PolylineLayer")
-class PolylineLayer(MapLayer):
+class PolylineLayer(FeatureLayer):
     """
     A layer to display [`PolylineMarker`][(p).]s.
     """
@@ -116,3 +219,94 @@ class PolylineLayer(MapLayer):
     """
 
     """
+
+    styles: dict[str, FeatureStyle] = field(default_factory=dict)
+    """
+    The styles which the [`polylines`][..] can reference by id,
+    with [`PolylineMarker.style`][(p).].
+    """
+
+    on_feature_hover: Optional[ft.EventHandler[MapFeatureHoverEvent]] = None
+    """
+    Fires when the pointer enters or leaves the [`polylines`][..] of the
+    layer, or moves over other ones.
+
+    Hits are tested on the client, so pointer moves which do not change the
+    polylines under the pointer are not sent.
+    """
+
+    on_feature_tap: Optional[ft.EventHandler[MapFeatureTapEvent]] = None
+    """
+    Fires when [`polylines`][..] of the layer are tapped, with all the ones
+    under the pointer.
+
+    Hits are tested on the client, using the rendered geometries, so no
+    geometric search is needed on the Python side. Taps handled by the layer
+    may not fire [`Map.on_tap`][(p).].
+    """
+
+    _features_field = "polylines"
+
+    async def update_feature_styles(
+        self,
+        styles: Optional[dict[PolylineMarker, Optional[str]]] = None,
+        colors: Optional[dict[PolylineMarker, ft.ColorValue]] = None,
+        border_colors: Optional[dict[PolylineMarker, ft.ColorValue]] = None,
+    ) -> None:
+        """
+        Changes the style id, color or border color of many polylines at once,
+        e.g. to recolor a choropleth map.
+
+        Only the new values are sent to the client, by polyline: the polylines
+        are not updated, so their coordinates are neither sent nor parsed again.
+        The properties of the polylines are also set on the Python side, without
+        being sent again by the next update.
+
+        Note:
+            The parsed points of the polylines are kept on the client, but
+            flutter_map still re-projects and simplifies all the polylines of
+            the layer when any of them is restyled: keeping their projected
+            geometry apart from their style is out of scope.
+
+        Args:
+            styles: The new [`style`][(p).PolylineMarker.style] of polylines.
+            colors: The new [`color`][(p).PolylineMarker.color] of polylines.
+            border_colors: The new [`border_color`][(p).PolylineMarker.border_color]
+                of polylines.
+        """
+        await self._update_feature_styles(styles, colors, border_colors)
+
+    def before_update(self):
+        super().before_update()
+        if self.camera is not None:
+            _select_levels_of_detail(self.polylines, self.camera.zoom)
+
+    def _needs_camera(self) -> bool:
+        return super()._needs_camera() or _uses_level_of_detail(self.features)
+
+    def _camera_changed(self, camera: Camera) -> bool:
+        changed = super()._camera_changed(camera)
+        return _select_levels_of_detail(self.polylines, camera.zoom) or changed
+
+    def _hit_radius(self, feature: PolylineMarker) -> float:
+        return max(
+            self.min_hittable_radius,
+            feature.stroke_width / 2 + feature.border_stroke_width,
+        )
+
+    def _hit_test(
+        self, feature: PolylineMarker, point: MapLatitudeLongitude, tolerance: float
+    ) -> bool:
+        return _distance_to_line(point, feature.coordinates) <= tolerance
+
+
+def _mark_sent(control: ft.Control, field_name: str):
+    """
+    Records the in-place changes of the list `field_name` of `control` as
+    already sent, as they were applied on the client by a method call, so that
+    the next update does not send them again.
+    """
+    # the snapshot the next update compares the list with, if it was sent
+    prev_lists = getattr(control, "__prev_lists", None)
+    if prev_lists is not None and field_name in prev_lists:
+        prev_lists[field_name] = getattr(control, field_name)[:]
@@ -0,0 +1,366 @@
+import heapq
+import math
+import sys
+from array import array
+from enum import Enum
+from typing import Any, Optional, Union
+
+from flet_map.types import MapLatitudeLongitude, MapLatitudeLongitudeArray
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+__all__ = [
+    "LevelOfDetailCoordinates",
+    "SimplificationMethod",
+    "simplify_coordinates",
+]
+
+_MAX_LATITUDE = 85.0511287798
+"""The maximum latitude representable in the Web Mercator projection."""
+
+_TILE_SIZE = 256
+"""The size, in logical pixels, of the whole world at zoom level `0`."""
+
+
+class SimplificationMethod(Enum):
+    """The line simplification algorithm to use."""
+
+    DOUGLAS_PEUCKER = "douglasPeucker"
+    """
+    The Ramer–Douglas–Peucker algorithm.
+    Keeps the points that deviate the most from the simplified line, and
+    preserves the overall shape well.
+    """
+
+    VISVALINGAM = "visvalingam"
+    """
+    The Visvalingam–Whyatt algorithm.
+    Repeatedly drops the point forming the smallest triangle with its neighbours,
+    which tends to produce smoother, more natural looking simplifications.
+    """
+
+
+def simplify_coordinates(
+    coordinates: Union[list[MapLatitudeLongitude], MapLatitudeLongitudeArray, Any],
+    zoom: float,
+    tolerance: float = 1.0,
+    method: SimplificationMethod = SimplificationMethod.DOUGLAS_PEUCKER,
+) -> MapLatitudeLongitudeArray:
+    """
+    Simplifies a line or polygon outline, as it would be displayed at a
+    given zoom level.
+
+    Args:
+        coordinates: The coordinates to simplify, in any form accepted by
+            [`MapLatitudeLongitudeArray`][(p).].
+        zoom: The zoom level at which the simplified coordinates will be displayed.
+        tolerance: The maximum allowed deviation, in logical pixels at `zoom`,
+            between the original and the simplified geometry.
+        method: The simplification algorithm to use.
+
+    Returns:
+        The simplified coordinates. The first and last points are always kept.
+    """
+    return (
+        LevelOfDetailCoordinates(coordinates, tolerance=tolerance, method=method)
+        .at_zoom(zoom)
+        ._level_array()
+    )
+
+
+class LevelOfDetailCoordinates(MapLatitudeLongitudeArray):
+    """
+    Coordinates with a precomputed, per-zoom level-of-detail pyramid.
+
+    The full-resolution geometry is kept on the Python side, and only the
+    simplified level matching the current zoom of the map is sent to the client.
+    When used as [`PolylineMarker.coordinates`][(p).] or
+    [`PolygonMarker.coordinates`][(p).], the parent layer switches levels
+    automatically as the map is zoomed.
+
+    Simplification is computed once: each point is assigned a significance
+    (its Douglas-Peucker distance or Visvalingam effective area, in Web Mercator
+    units), and each level keeps the points whose significance exceeds the
+    tolerance at that zoom. NumPy is used to speed up the computation
+    when it is installed.
+
+    Example:
+        ```python
+        border = ftm.LevelOfDetailCoordinates(np.column_stack([lats, lngs]))
+        ftm.PolygonLayer(polygons=[ftm.PolygonMarker(coordinates=border)])
+        ```
+    """
+
+    def __init__(
+        self,
+        coordinates: Union[list[MapLatitudeLongitude], MapLatitudeLongitudeArray, Any],
+        tolerance: float = 1.0,
+        method: SimplificationMethod = SimplificationMethod.DOUGLAS_PEUCKER,
+        min_zoom: int = 0,
+        max_zoom: int = 18,
+        precision: Optional[int] = None,
+    ):
+        """
+        Args:
+            coordinates: The full-resolution coordinates, in any form accepted by
+                [`MapLatitudeLongitudeArray`][(p).].
+            tolerance: The maximum allowed deviation, in logical pixels,
+                between the full-resolution and the displayed geometry.
+                Must be non-negative.
+            method: The simplification algorithm to use.
+            min_zoom: The lowest zoom level of the pyramid.
+                Lower zoom levels use this level.
+            max_zoom: The highest simplified zoom level of the pyramid.
+                Above it, the full-resolution coordinates are used.
+            precision: The [`precision`][(p).MapLatitudeLongitudeArray.] with
+                which the levels are sent to the client.
+
+        Raises:
+            AssertionError: If `tolerance` is negative, if `min_zoom` is
+                negative or greater than `max_zoom`, or if `precision` is not
+                between `0` and `7`.
+        """
+        assert tolerance >= 0, (
+            f"tolerance must be greater than or equal to 0, got {tolerance}"
+        )
+        assert 0 <= min_zoom <= max_zoom, (
+            f"min_zoom must be between 0 and max_zoom ({max_zoom}), got {min_zoom}"
+        )
+        source = MapLatitudeLongitudeArray(coordinates)
+        self._pyramid = _Pyramid(source.values(), tolerance, method)
+        self._min_zoom = min_zoom
+        self._max_zoom = max_zoom
+        self._level: Optional[int] = None
+        super().__init__(self._pyramid.level(min_zoom), precision)
+        self._level = min_zoom
+
+    @property
+    def source(self) -> MapLatitudeLongitudeArray:
+        """The full-resolution coordinates."""
+        return MapLatitudeLongitudeArray(self._pyramid.source_data())
+
+    @property
+    def zoom_level(self) -> Optional[int]:
+        """
+        The zoom level of the currently selected level of detail,
+        or `None` if the full-resolution coordinates are selected.
+        """
+        return self._level
+
+    def at_zoom(self, zoom: float) -> "LevelOfDetailCoordinates":
+        """
+        Returns the coordinates to display at `zoom`.
+
+        Args:
+            zoom: The (possibly fractional) zoom level of the map.
+
+        Returns:
+            `self`, if the level of detail for `zoom` is already selected, or a new
+                `LevelOfDetailCoordinates` sharing the same pyramid otherwise.
+        """
+        level = max(self._min_zoom, math.ceil(zoom))
+        if level > self._max_zoom:
+            level = None
+        if level == self._level:
+            return self
+        other = object.__new__(self.__class__)
+        other._pyramid = self._pyramid
+        other._min_zoom = self._min_zoom
+        other._max_zoom = self._max_zoom
+        other._level = level
+        other.precision = self.precision
+        other._set_values(self._pyramid.level(level))
+        return other
+
+    def _level_array(self) -> MapLatitudeLongitudeArray:
+        return MapLatitudeLongitudeArray(self._values, self.precision)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(<{len(self)} of "
+            f"{self._pyramid.count} coordinates, zoom_level={self._level}>)"
+        )
+
+
+def _uses_level_of_detail(markers: list) -> bool:
+    """Whether any of `markers` has `LevelOfDetailCoordinates` coordinates."""
+    return any(isinstance(m.coordinates, LevelOfDetailCoordinates) for m in markers)
+
+
+def _select_levels_of_detail(markers: list, zoom: float) -> bool:
+    """
+    Switches the `LevelOfDetailCoordinates` coordinates of `markers`
+    to the level of detail for `zoom`.
+
+    Returns:
+        `True` if the coordinates of any marker were changed.
+    """
+    changed = False
+    for marker in markers:
+        if isinstance(marker.coordinates, LevelOfDetailCoordinates):
+            coordinates = marker.coordinates.at_zoom(zoom)
+            if coordinates is not marker.coordinates:
+                marker.coordinates = coordinates
+                changed = True
+    return changed
+
+
+class _Pyramid:
+    """The shared, lazily built levels of a `LevelOfDetailCoordinates`."""
+
+    def __init__(self, values: array, tolerance: float, method: SimplificationMethod):
+        self.values = values
+        self.count = len(values) // 2
+        self.tolerance = tolerance
+        self.method = method
+        self.levels: dict[Optional[int], bytes] = {}
+        xs, ys = _project(values)
+        if method == SimplificationMethod.VISVALINGAM:
+            self.significance = _visvalingam_significance(xs, ys)
+        else:
+            self.significance = _douglas_peucker_significance(xs, ys)
+
+    def source_data(self) -> bytes:
+        return self.level(None)
+
+    def level(self, zoom: Optional[int]) -> bytes:
+        data = self.levels.get(zoom)
+        if data is None:
+            data = self._build_level(zoom)
+            self.levels[zoom] = data
+        return data
+
+    def _build_level(self, zoom: Optional[int]) -> bytes:
+        values = self.values
+        if zoom is not None:
+            threshold = self.tolerance / (_TILE_SIZE * 2**zoom)
+            if self.method == SimplificationMethod.VISVALINGAM:
+                threshold *= threshold
+            significance = self.significance
+            if np is not None:
+                keep = np.frombuffer(significance, dtype=np.float64) > threshold
+                pairs = np.frombuffer(values, dtype=np.float64).reshape(-1, 2)
+                values = array("d", pairs[keep].tobytes())
+            else:
+                kept = array("d")
+                for i in range(self.count):
+                    if significance[i] > threshold:
+                        kept.append(values[2 * i])
+                        kept.append(values[2 * i + 1])
+                values = kept
+        if sys.byteorder == "big":
+            values = array("d", values)
+            values.byteswap()
+        return values.tobytes()
+
+
+def _project(values: array) -> tuple[array, array]:
+    """Projects interleaved `lat, lng` values to normalized Web Mercator `x, y`."""
+    if np is not None:
+        pairs = np.frombuffer(values, dtype=np.float64).reshape(-1, 2)
+        latitudes = np.radians(np.clip(pairs[:, 0], -_MAX_LATITUDE, _MAX_LATITUDE))
+        xs = (pairs[:, 1] + 180.0) / 360.0
+        ys = 0.5 - np.log(np.tan(np.pi / 4 + latitudes / 2)) / (2 * np.pi)
+        return array("d", xs.tobytes()), array("d", ys.tobytes())
+
+    xs = array("d")
+    ys = array("d")
+    for i in range(0, len(values), 2):
+        latitude = math.radians(max(-_MAX_LATITUDE, min(_MAX_LATITUDE, values[i])))
+        xs.append((values[i + 1] + 180.0) / 360.0)
+        ys.append(0.5 - math.log(math.tan(math.pi / 4 + latitude / 2)) / (2 * math.pi))
+    return xs, ys
+
+
+def _douglas_peucker_significance(xs: array, ys: array) -> array:
+    """
+    Returns, for each point, the largest Douglas-Peucker tolerance
+    at which it is still kept.
+    """
+    count = len(xs)
+    significance = array("d", bytes(8 * count))
+    if count == 0:
+        return significance
+    significance[0] = significance[count - 1] = math.inf
+    if np is not None:
+        np_xs = np.frombuffer(xs, dtype=np.float64)
+        np_ys = np.frombuffer(ys, dtype=np.float64)
+
+    stack = [(0, count - 1, math.inf)]
+    while stack:
+        first, last, parent = stack.pop()
+        if last - first < 2:
+            continue
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        length = dx * dx + dy * dy
+        if np is not None:
+            px = np_xs[first + 1 : last] - ax
+            py = np_ys[first + 1 : last] - ay
+            if length > 0:
+                t = np.clip((px * dx + py * dy) / length, 0.0, 1.0)
+                px = px - t * dx
+                py = py - t * dy
+            distances = px * px + py * py
+            offset = int(distances.argmax())
+            index = first + 1 + offset
+            distance = float(distances[offset])
+        else:
+            index, distance = first, -1.0
+            for i in range(first + 1, last):
+                px, py = xs[i] - ax, ys[i] - ay
+                if length > 0:
+                    t = max(0.0, min(1.0, (px * dx + py * dy) / length))
+                    px -= t * dx
+                    py -= t * dy
+                d = px * px + py * py
+                if d > distance:
+                    index, distance = i, d
+        # a point is never more significant than the one which split its range
+        distance = min(math.sqrt(distance), parent)
+        significance[index] = distance
+        stack.append((first, index, distance))
+        stack.append((index, last, distance))
+    return significance
+
+
+def _visvalingam_significance(xs: array, ys: array) -> array:
+    """Returns the Visvalingam-Whyatt effective area of each point."""
+    count = len(xs)
+    significance = array("d", bytes(8 * count))
+    if count == 0:
+        return significance
+    significance[0] = significance[count - 1] = math.inf
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+
+    def area(i: int) -> float:
+        a, c = previous[i], following[i]
+        return (
+            abs((xs[a] - xs[i]) * (ys[c] - ys[i]) - (xs[c] - xs[i]) * (ys[a] - ys[i]))
+            / 2
+        )
+
+    heap = [(area(i), i) for i in range(1, count - 1)]
+    heapq.heapify(heap)
+    removed = bytearray(count)
+    current = 0.0
+    while heap:
+        value, i = heapq.heappop(heap)
+        if removed[i] or value != area(i):
+            continue  # stale entry
+        # areas never decrease, so that levels are properly nested
+        current = max(current, value)
+        significance[i] = current
+        removed[i] = 1
+        a, c = previous[i], following[i]
+        following[a] = c
+        previous[c] = a
+        if a > 0:
+            heapq.heappush(heap, (area(a), a))
+        if c < count - 1:
+            heapq.heappush(heap, (area(c), c))
+    return significance
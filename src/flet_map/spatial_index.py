@@ -0,0 +1,312 @@
+import heapq
+import math
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Generic, Optional, TypeVar
+
+__all__ = ["SpatialIndex"]
+
+T = TypeVar("T", bound=Hashable)
+
+BoundingBox = tuple[float, float, float, float]
+"""A `(south, west, north, east)` bounding box, in degrees."""
+
+_METERS_PER_DEGREE = 111_320.0
+"""The (approximate) length of a degree of latitude, in meters."""
+
+_MAX_CELLS_PER_ITEM = 64
+"""
+Items covering more grid cells than this are not stored in the grid,
+but checked by every query instead.
+"""
+
+
+class SpatialIndex(Generic[T]):
+    """
+    A uniform grid index over items with a geographic bounding box,
+    answering point, bounding box and nearest neighbour queries without
+    scanning all the items.
+
+    Items can be added, moved and removed incrementally. The size of the grid
+    cells is chosen from the extent and the number of items when the index is
+    built, and is adjusted automatically when the number of items grows or
+    shrinks significantly.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[tuple[T, BoundingBox]] = (),
+        cell_size: Optional[float] = None,
+    ):
+        """
+        Args:
+            items: The initial `(item, bounding_box)` pairs, where
+                `bounding_box` is a `(south, west, north, east)` tuple in degrees.
+            cell_size: The size, in degrees, of the grid cells.
+                If `None`, it is chosen automatically.
+
+        Raises:
+            AssertionError: If `cell_size` is not positive.
+        """
+        assert cell_size is None or cell_size > 0, (
+            f"cell_size must be greater than 0, got {cell_size}"
+        )
+        self._fixed_cell_size = cell_size
+        self._bounds: dict[T, BoundingBox] = {}
+        self._build(list(items))
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._bounds
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._bounds)
+
+    def bounds_of(self, item: T) -> BoundingBox:
+        """Returns the bounding box `item` was indexed with."""
+        return self._bounds[item]
+
+    def insert(self, item: T, bounds: BoundingBox):
+        """
+        Adds `item` to the index, or moves it if it is already indexed.
+
+        Args:
+            item: The item to add.
+            bounds: The `(south, west, north, east)` bounding box of the item.
+        """
+        if item in self._bounds:
+            self._unlink(item)
+        self._bounds[item] = bounds
+        self._link(item, bounds)
+        if self._fixed_cell_size is None and len(self._bounds) > 4 * self._sized_for:
+            self._build(list(self._bounds.items()))
+
+    def remove(self, item: T):
+        """
+        Removes `item` from the index.
+
+        Raises:
+            KeyError: If `item` is not indexed.
+        """
+        self._unlink(item)
+        del self._bounds[item]
+        if (
+            self._fixed_cell_size is None
+            and self._sized_for > 64
+            and len(self._bounds) < self._sized_for // 4
+        ):
+            self._build(list(self._bounds.items()))
+
+    def clear(self):
+        """Removes all the items from the index."""
+        self._build([])
+
+    def query_bbox(self, bounds: BoundingBox) -> list[T]:
+        """
+        Returns the items whose bounding box intersects `bounds`.
+
+        Args:
+            bounds: A `(south, west, north, east)` bounding box, in degrees.
+        """
+        south, west, north, east = bounds
+        result = []
+        seen = set()
+        for item in self._candidates(bounds):
+            if item in seen:
+                continue
+            seen.add(item)
+            s, w, n, e = self._bounds[item]
+            if s <= north and n >= south and w <= east and e >= west:
+                result.append(item)
+        return result
+
+    def query_point(
+        self, latitude: float, longitude: float, tolerance: float = 0.0
+    ) -> list[T]:
+        """
+        Returns the items whose bounding box contains a point, or lies
+        within `tolerance` meters of it.
+        """
+        dlat, dlng = _meters_to_degrees(tolerance, latitude)
+        return self.query_bbox(
+            (latitude - dlat, longitude - dlng, latitude + dlat, longitude + dlng)
+        )
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> list[T]:
+        """
+        Returns the `k` items closest to a point, closest first.
+
+        The distance of an item is the distance between the point and its
+        bounding box, so that items containing the point come first.
+
+        Raises:
+            AssertionError: If `k` is negative.
+        """
+        assert k >= 0, f"k must be greater than or equal to 0, got {k}"
+        if k == 0 or not self._bounds:
+            return []
+        scale = math.cos(math.radians(max(-89.0, min(89.0, latitude))))
+
+        def distance(item: T) -> float:
+            s, w, n, e = self._bounds[item]
+            dy = max(s - latitude, 0.0, latitude - n)
+            dx = max(w - longitude, 0.0, longitude - e) * scale
+            return math.hypot(dx, dy)
+
+        # a max-heap (negated distances) of the k best items so far
+        best: list[tuple[float, int, T]] = []
+        seen = set()
+
+        def consider(item: T):
+            if item in seen:
+                return
+            seen.add(item)
+            entry = (-distance(item), id(item), item)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        for item in self._oversized:
+            consider(item)
+        if self._extent is not None:
+            bottom, left, top, right = self._extent
+            row, col = self._cell(latitude, longitude)
+            max_ring = max(row - bottom, top - row, col - left, right - col)
+            # the rings closer to the point than the grid are empty
+            min_ring = max(0, bottom - row, row - top, left - col, col - right)
+            visited = 0
+            for ring in range(min_ring, max_ring + 1):
+                # no item in this ring, or beyond, can be closer than the k found
+                if (
+                    len(best) == k
+                    and -best[0][0] < (ring - 1) * self._cell_size * scale
+                ):
+                    break
+                if visited > len(self._bounds):
+                    # far from the items: cheaper to go through all of them
+                    return heapq.nsmallest(k, self._bounds, key=distance)
+                for cell in _ring(row, col, ring):
+                    visited += 1
+                    for item in self._grid.get(cell, ()):
+                        consider(item)
+        return [item for _, _, item in sorted(best, reverse=True)]
+
+    def _build(self, items: list[tuple[T, BoundingBox]]):
+        self._bounds = dict(items)
+        self._grid: dict[tuple[int, int], dict[T, None]] = {}
+        self._oversized: dict[T, None] = {}
+        self._sized_for = max(len(items), 16)
+        self._cell_size = self._fixed_cell_size or _auto_cell_size(items)
+        # the (bottom, left, top, right) cells covered by the grid, if any
+        self._extent: Optional[tuple[int, int, int, int]] = None
+        for item, bounds in items:
+            self._link(item, bounds)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (
+            math.floor(latitude / self._cell_size),
+            math.floor(longitude / self._cell_size),
+        )
+
+    def _cells(self, bounds: BoundingBox) -> Optional[tuple[int, int, int, int]]:
+        south, west, north, east = bounds
+        if not (south <= north and west <= east):
+            return None
+        size = self._cell_size
+        floor = math.floor
+        return (
+            floor(south / size),
+            floor(west / size),
+            floor(north / size),
+            floor(east / size),
+        )
+
+    def _link(self, item: T, bounds: BoundingBox):
+        cells = self._cells(bounds)
+        if cells is None:
+            return
+        bottom, left, top, right = cells
+        if bottom == top and left == right:
+            self._grid.setdefault((bottom, left), {})[item] = None
+        elif (top - bottom + 1) * (right - left + 1) > _MAX_CELLS_PER_ITEM:
+            self._oversized[item] = None
+            return
+        else:
+            for row in range(bottom, top + 1):
+                for col in range(left, right + 1):
+                    self._grid.setdefault((row, col), {})[item] = None
+        if self._extent is None:
+            self._extent = cells
+        else:
+            b, lf, t, r = self._extent
+            self._extent = min(b, bottom), min(lf, left), max(t, top), max(r, right)
+
+    def _unlink(self, item: T):
+        if item in self._oversized:
+            del self._oversized[item]
+            return
+        cells = self._cells(self._bounds[item])
+        if cells is None:
+            return
+        bottom, left, top, right = cells
+        for row in range(bottom, top + 1):
+            for col in range(left, right + 1):
+                cell = self._grid[(row, col)]
+                del cell[item]
+                if not cell:
+                    del self._grid[(row, col)]
+
+    def _candidates(self, bounds: BoundingBox) -> Iterator[T]:
+        yield from self._oversized
+        cells = self._cells(bounds)
+        if cells is None or self._extent is None:
+            return
+        bottom, left, top, right = cells
+        bottom, top = max(bottom, self._extent[0]), min(top, self._extent[2])
+        left, right = max(left, self._extent[1]), min(right, self._extent[3])
+        if bottom > top or left > right:
+            return
+        if (top - bottom + 1) * (right - left + 1) > len(self._grid):
+            # cheaper to go through the non-empty cells
+            for (row, col), cell in self._grid.items():
+                if bottom <= row <= top and left <= col <= right:
+                    yield from cell
+            return
+        for row in range(bottom, top + 1):
+            for col in range(left, right + 1):
+                yield from self._grid.get((row, col), ())
+
+
+def _auto_cell_size(items: list[tuple[Hashable, BoundingBox]]) -> float:
+    """Returns a cell size giving about one point-like item per cell."""
+    boxes = [b for _, b in items if b[0] <= b[2] and b[1] <= b[3]]
+    if len(boxes) < 2:
+        return 1.0
+    south = min(b[0] for b in boxes)
+    west = min(b[1] for b in boxes)
+    north = max(b[2] for b in boxes)
+    east = max(b[3] for b in boxes)
+    area = max((north - south) * (east - west), 1e-12)
+    return max(math.sqrt(area / len(boxes)), 1e-6)
+
+
+def _ring(row: int, col: int, ring: int) -> Iterator[tuple[int, int]]:
+    """Yields the cells at a Chebyshev distance of `ring` from `(row, col)`."""
+    if ring == 0:
+        yield row, col
+        return
+    for c in range(col - ring, col + ring + 1):
+        yield row - ring, c
+        yield row + ring, c
+    for r in range(row - ring + 1, row + ring):
+        yield r, col - ring
+        yield r, col + ring
+
+
+def _meters_to_degrees(meters: float, latitude: float) -> tuple[float, float]:
+    """Returns `meters` as `(latitude, longitude)` degrees around `latitude`."""
+    dlat = meters / _METERS_PER_DEGREE
+    scale = math.cos(math.radians(max(-89.0, min(89.0, latitude))))
+    return dlat, dlat / scale
@@ -0,0 +1,127 @@
+from dataclasses import field
+from typing import Optional
+
+import flet as ft
+
+from flet_map.map_layer import MapLayer
+from flet_map.types import MapLatitudeLongitudeArray, NumberArray, SymbolShape
+
+__all__ = ["SymbolLayer"]
+
+
+@ft.control("SymbolLayer")
+class SymbolLayer(MapLayer):
+    """
+    A layer to display a large number of simple point symbols.
+
+    Unlike [`MarkerLayer`][(p).], symbols are not controls: their attributes
+    are stored column-wise, one value per symbol, in packed arrays, and they
+    are all drawn on the client in a single canvas pass. This makes it suitable
+    for tens of thousands of points, such as dense sensor maps.
+
+    Per-symbol colors and shapes are given as indices into [`palette`][..] and
+    [`shapes`][..] respectively. Arrays of per-symbol values are optional, and
+    fall back to a single value for all the symbols when `None`.
+
+    Example:
+        ```python
+        ftm.SymbolLayer(
+            coordinates=ftm.MapLatitudeLongitudeArray(points),
+            palette=[ft.Colors.GREEN, ft.Colors.ORANGE, ft.Colors.RED],
+            color_indices=ftm.NumberArray(statuses),
+            sizes=ftm.NumberArray(6 + 2 * np.log1p(readings)),
+        )
+        ```
+
+    Raises:
+        AssertionError: If [`palette`][(c).] or [`shapes`][(c).] is empty,
+            if [`size`][(c).] or [`border_width`][(c).] is negative, or if a
+            per-symbol array does not have one value per symbol.
+    """
+
+    coordinates: MapLatitudeLongitudeArray
+    """
+    The position of each symbol.
+
+    Other forms accepted by [`MapLatitudeLongitudeArray`][(p).] are converted
+    to it when the layer is updated.
+    """
+
+    size: ft.Number = 8.0
+    """
+    The size, in logical pixels, of the symbols when [`sizes`][..] is `None`.
+    """
+
+    sizes: Optional[NumberArray] = None
+    """
+    The size, in logical pixels, of each symbol.
+    """
+
+    palette: list[ft.ColorValue] = field(default_factory=lambda: [ft.Colors.BLUE])
+    """
+    The colors of the symbols, referenced by [`color_indices`][..].
+    """
+
+    color_indices: Optional[NumberArray] = None
+    """
+    The index in [`palette`][..] of the color of each symbol.
+    If `None`, all the symbols use the first color of the palette.
+    """
+
+    shapes: list[SymbolShape] = field(default_factory=lambda: [SymbolShape.CIRCLE])
+    """
+    The shapes of the symbols, referenced by [`shape_indices`][..].
+    """
+
+    shape_indices: Optional[NumberArray] = None
+    """
+    The index in [`shapes`][..] of the shape of each symbol.
+    If `None`, all the symbols use the first shape.
+    """
+
+    rotations: Optional[NumberArray] = None
+    """
+    The clockwise rotation, in degrees, of each symbol.
+    """
+
+    border_color: Optional[ft.ColorValue] = None
+    """
+    The color of the border of the symbols.
+    """
+
+    border_width: ft.Number = 0.0
+    """
+    The width, in logical pixels, of the border of the symbols.
+    """
+
+    def before_update(self):
+        super().before_update()
+        _pack_columns(self, "sizes", "color_indices", "shape_indices", "rotations")
+        assert self.palette, "palette must not be empty"
+        assert self.shapes, "shapes must not be empty"
+        assert self.size >= 0, (
+            f"size must be greater than or equal to 0, got {self.size}"
+        )
+        assert self.border_width >= 0, (
+            f"border_width must be greater than or equal to 0, got {self.border_width}"
+        )
+
+
+def _pack_columns(layer: MapLayer, *names: str):
+    """
+    Converts the `coordinates` and the per-item `names` columns of a columnar
+    `layer` to packed arrays, and checks that they have the same length.
+    """
+    if not isinstance(layer.coordinates, MapLatitudeLongitudeArray):
+        layer.coordinates = MapLatitudeLongitudeArray(layer.coordinates)
+    count = len(layer.coordinates)
+    for name in names:
+        values = getattr(layer, name)
+        if values is None:
+            continue
+        if not isinstance(values, NumberArray):
+            values = NumberArray(values)
+            setattr(layer, name, values)
+        assert len(values) == count, (
+            f"{name} must have one value per item ({count}), got {len(values)}"
+        )
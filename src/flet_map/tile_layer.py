@@ -4,11 +4,17 @@ from typing import Optional
 import flet as ft
 
 from flet_map.map_layer import MapLayer
+from flet_map.tiles import _range_size, get_tile_range
 from flet_map.types import (
     FadeInTileDisplay,
     MapLatitudeLongitudeBounds,
+    TileCacheConfiguration,
+    TileCacheStats,
     TileDisplay,
     TileLayerEvictErrorTileStrategy,
+    TileMetricsEvent,
+    TileSeedProgressEvent,
+    TileSeedResult,
 )
 
 __all__ = ["TileLayer"]
@@ -29,6 +35,7 @@ class TileLayer(MapLayer):
             [`tile_size`][(c).], [`min_native_zoom`][(c).],
             [`max_native_zoom`][(c).], [`zoom_offset`][(c).],
             [`max_zoom`][(c).], [`min_zoom`][(c).]
+        AssertionError: If [`max_concurrent_requests`][(c).] is lower than `1`.
     """
 
     url_template: str
@@ -214,6 +221,27 @@ class TileLayer(MapLayer):
     The package name of the user agent.
     """
 
+    cache: Optional[TileCacheConfiguration] = None
+    """
+    The configuration of a persistent, on-device cache of the tiles, to reuse
+    them across sessions and display them while offline.
+
+    If `None`, tiles are only cached in memory, for the current session.
+    """
+
+    max_concurrent_requests: Optional[int] = None
+    """
+    The maximum number of simultaneous tile downloads of the tile layers
+    sharing this [`url_template`][..], whatever their [`subdomains`][..].
+
+    Further tiles are queued, and downloaded nearest to the center of the map
+    first, so that visible tiles load before the [`pan_buffer`][..] ones.
+    Queued tiles which are no longer needed, e.g. after a fling, are dropped,
+    and a tile requested by several layers is only downloaded once.
+
+    If `None`, downloads are neither limited nor queued.
+    """
+
     on_image_error: Optional[ft.ControlEventHandler["TileLayer"]] = None
     """
     Fires if an error occurs when fetching the tiles.
@@ -222,6 +250,26 @@ class TileLayer(MapLayer):
     information about the error.
     """
 
+    metrics_interval: ft.DurationValue = field(
+        default_factory=lambda: ft.Duration(seconds=5)
+    )
+    """
+    The interval at which [`on_metrics`][..] fires.
+    """
+
+    on_metrics: Optional[ft.EventHandler[TileMetricsEvent]] = None
+    """
+    Fires every [`metrics_interval`][..] while tiles are loaded, with the tile
+    loading metrics of this layer over the interval.
+
+    Setting it makes tiles go through an instrumented tile provider.
+    """
+
+    on_seed_progress: Optional[ft.EventHandler[TileSeedProgressEvent]] = None
+    """
+    Fires periodically while [`seed_cache()`][..] downloads tiles.
+    """
+
     def before_update(self):
         super().before_update()
         assert self.tile_size >= 0, (
@@ -244,3 +292,90 @@ class TileLayer(MapLayer):
         assert self.min_zoom >= 0, (
             f"min_zoom must be greater than or equal to 0, got {self.min_zoom}"
         )
+        assert self.max_concurrent_requests is None or (
+            self.max_concurrent_requests >= 1
+        ), (
+            f"max_concurrent_requests must be greater than or equal to 1, "
+            f"got {self.max_concurrent_requests}"
+        )
+
+    async def get_cache_stats(self) -> Optional[TileCacheStats]:
+        """
+        Returns the statistics of the [`cache`][..] store of this layer, or `None`
+        if it has no cache or if the cache is not supported by the platform.
+        """
+        stats = await self._invoke_method("get_cache_stats")
+        return TileCacheStats(**stats) if stats else None
+
+    async def seed_cache(
+        self,
+        bounds: MapLatitudeLongitudeBounds,
+        min_zoom: int,
+        max_zoom: int,
+        max_concurrency: int = 4,
+        max_tile_count: int = 50_000,
+    ) -> Optional[TileSeedResult]:
+        """
+        Downloads the tiles covering `bounds` into the [`cache`][..] store of this
+        layer, so that the area can later be displayed offline.
+
+        The tiles are enumerated with [`get_tile_range()`][(p).], and their URLs
+        are built on the client with the same rules as the displayed tiles
+        ([`url_template`][..], [`subdomains`][..], [`enable_tms`][..],
+        [`zoom_reverse`][..], [`zoom_offset`][..], [`additional_options`][..]).
+        Zoom levels are limited to the [`min_native_zoom`][..] to
+        [`max_native_zoom`][..] range, as other levels are never downloaded.
+        Tiles which are already cached, and not older than
+        [`TileCacheConfiguration.max_age`][(p).], are skipped.
+
+        Progress is reported by [`on_seed_progress`][..].
+
+        Note:
+            Many tile servers, such as the OpenStreetMap ones, forbid bulk
+            downloads: check the usage policy of the tile server first.
+
+        Args:
+            bounds: The area to download. It must not cross the antimeridian.
+            min_zoom: The lowest zoom level to download.
+            max_zoom: The highest zoom level to download.
+            max_concurrency: The maximum number of simultaneous downloads.
+            max_tile_count: The maximum number of tiles to download, as a
+                safeguard against accidentally downloading huge areas.
+
+        Returns:
+            The outcome of the download, or `None` if the cache is not
+                supported by the platform.
+
+        Raises:
+            AssertionError: If [`cache`][..] is `None`, if `min_zoom` is negative
+                or greater than `max_zoom`, if `max_concurrency` is lower than
+                `1`, or if the area covers more than `max_tile_count` tiles.
+        """
+        assert self.cache is not None, "cache must be set to seed it"
+        assert 0 <= min_zoom <= max_zoom, (
+            f"min_zoom must be between 0 and max_zoom ({max_zoom}), got {min_zoom}"
+        )
+        assert max_concurrency >= 1, (
+            f"max_concurrency must be greater than or equal to 1, got {max_concurrency}"
+        )
+        ranges = [
+            (zoom, *get_tile_range(bounds, zoom))
+            for zoom in range(
+                max(min_zoom, self.min_native_zoom),
+                min(max_zoom, self.max_native_zoom) + 1,
+            )
+        ]
+        tile_count = sum(_range_size(r[1:]) for r in ranges)
+        assert tile_count <= max_tile_count, (
+            f"bounds cover {tile_count} tiles, more than max_tile_count "
+            f"({max_tile_count})"
+        )
+        result = await self._invoke_method(
+            "seed_cache",
+            arguments={"ranges": ranges, "max_concurrency": max_concurrency},
+        )
+        return TileSeedResult(**result) if result else None
+
+    async def clear_cache(self) -> None:
+        """Removes all the tiles from the [`cache`][..] store of this layer."""
+        await self._invoke_method("clear_cache")
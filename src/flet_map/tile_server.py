@@ -0,0 +1,440 @@
+import gzip
+import mmap
+import os
+import pathlib
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+
+__all__ = ["LocalTileServer", "MBTilesArchive", "PMTilesArchive", "TileArchive"]
+
+_CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "pbf": "application/x-protobuf",
+    "mvt": "application/x-protobuf",
+}
+
+
+class TileArchive:
+    """
+    A single-file archive of map tiles, such as [`MBTilesArchive`][(p).] or
+    [`PMTilesArchive`][(p).], served by a [`LocalTileServer`][(p).].
+
+    This is an abstract class and shouldn't be used directly.
+    """
+
+    content_type: str = "application/octet-stream"
+    """The MIME type of the tiles."""
+
+    content_encoding: Optional[str] = None
+    """The HTTP content encoding of the tiles, e.g. `"gzip"`, if any."""
+
+    def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Returns the tile at zoom level `z` and XYZ coordinates `x`, `y`,
+        or `None` if it is not in the archive.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Closes the archive file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MBTilesArchive(TileArchive):
+    """
+    An [MBTiles](https://github.com/mapbox/mbtiles-spec) archive:
+    an SQLite database of tiles.
+
+    The database is opened read-only, and memory-mapped so that tiles are read
+    without system calls once the file is in the page cache.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """
+        Args:
+            path: The path of the `.mbtiles` file.
+
+        Raises:
+            sqlite3.Error: If the file is not an MBTiles database.
+        """
+        self.path = os.fspath(path)
+        # an escaped URI, so that paths containing `?`, `#` or `%` open the file
+        uri = pathlib.Path(self.path).resolve().as_uri()
+        self._connection = sqlite3.connect(
+            f"{uri}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+        self._connection.execute(f"PRAGMA mmap_size={os.path.getsize(self.path)}")
+        self._lock = threading.Lock()
+        self.metadata: dict[str, str] = dict(
+            self._connection.execute("SELECT name, value FROM metadata")
+        )
+        """The `metadata` table of the archive."""
+        tile_format = self.metadata.get("format", "png").lower()
+        self.content_type = _CONTENT_TYPES.get(tile_format, self.content_type)
+        if tile_format == "pbf":
+            # vector tiles of MBTiles archives are gzip-compressed
+            self.content_encoding = "gzip"
+
+    def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        # MBTiles rows are numbered from the south, as in the TMS scheme
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT tile_data FROM tiles "
+                "WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, (1 << z) - 1 - y),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def close(self):
+        self._connection.close()
+
+
+class PMTilesArchive(TileArchive):
+    """
+    A [PMTiles](https://github.com/protomaps/PMTiles) (version 3) archive.
+
+    The file is memory-mapped, and tiles are located through the directories
+    of the archive, which are cached once read. Directories must be
+    uncompressed or gzip-compressed.
+    """
+
+    _HEADER = struct.Struct("<7sB11Q6B4iB2i")
+    _TILE_TYPES = {1: "mvt", 2: "png", 3: "jpeg", 4: "webp", 5: "avif"}
+    _COMPRESSIONS = {1: None, 2: "gzip", 3: "br", 4: "zstd"}
+
+    def __init__(self, path: Union[str, os.PathLike], max_cached_directories: int = 64):
+        """
+        Args:
+            path: The path of the `.pmtiles` file.
+            max_cached_directories: The maximum number of leaf directories
+                kept in memory.
+
+        Raises:
+            ValueError: If the file is not a PMTiles version 3 archive, or if its
+                directories use an unsupported compression.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._HEADER.unpack_from(self._data)
+        if header[0] != b"PMTiles" or header[1] != 3:
+            self._data.close()
+            raise ValueError(f"{self.path} is not a PMTiles version 3 archive")
+        (
+            self._root_offset,
+            self._root_length,
+            self._metadata_offset,
+            self._metadata_length,
+            self._leaf_offset,
+            _,
+            self._tile_data_offset,
+        ) = header[2:9]
+        internal_compression, tile_compression, tile_type = header[14:17]
+        self.min_zoom, self.max_zoom = header[17:19]
+        self._internal_compression = self._COMPRESSIONS.get(internal_compression)
+        if self._internal_compression not in (None, "gzip"):
+            self._data.close()
+            raise ValueError(
+                f"unsupported PMTiles directory compression: "
+                f"{self._internal_compression}"
+            )
+        self.content_encoding = self._COMPRESSIONS.get(tile_compression)
+        self.content_type = _CONTENT_TYPES.get(
+            self._TILE_TYPES.get(tile_type, ""), self.content_type
+        )
+        self._lock = threading.Lock()
+        self._max_cached_directories = max_cached_directories
+        self._directories: OrderedDict[int, list[tuple[int, int, int, int]]] = (
+            OrderedDict()
+        )
+        self._root = self._read_directory(self._root_offset, self._root_length)
+
+    @property
+    def metadata(self) -> bytes:
+        """The JSON metadata of the archive, as compressed in the archive."""
+        start = self._metadata_offset
+        return self._data[start : start + self._metadata_length]
+
+    def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        if not 0 <= x < 1 << z or not 0 <= y < 1 << z:
+            return None
+        tile_id = _tile_id(z, x, y)
+        directory = self._root
+        # the root directory, and at most three levels of leaf directories
+        for _ in range(4):
+            entry = _find_entry(directory, tile_id)
+            if entry is None:
+                return None
+            _, offset, length, run_length = entry
+            if run_length > 0:
+                start = self._tile_data_offset + offset
+                return self._data[start : start + length]
+            directory = self._leaf_directory(self._leaf_offset + offset, length)
+        return None
+
+    def close(self):
+        self._data.close()
+
+    def _leaf_directory(self, offset: int, length: int) -> list:
+        with self._lock:
+            directory = self._directories.get(offset)
+            if directory is not None:
+                self._directories.move_to_end(offset)
+                return directory
+        directory = self._read_directory(offset, length)
+        with self._lock:
+            self._directories[offset] = directory
+            if len(self._directories) > self._max_cached_directories:
+                self._directories.popitem(last=False)
+        return directory
+
+    def _read_directory(self, offset: int, length: int) -> list:
+        """
+        Returns the `(tile_id, offset, length, run_length)` entries of the
+        directory stored at `offset`.
+        """
+        data = self._data[offset : offset + length]
+        if self._internal_compression == "gzip":
+            data = gzip.decompress(data)
+        position = 0
+
+        def varint() -> int:
+            nonlocal position
+            value = shift = 0
+            while True:
+                byte = data[position]
+                position += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    return value
+                shift += 7
+
+        count = varint()
+        tile_ids = []
+        tile_id = 0
+        for _ in range(count):
+            tile_id += varint()
+            tile_ids.append(tile_id)
+        run_lengths = [varint() for _ in range(count)]
+        lengths = [varint() for _ in range(count)]
+        offsets = []
+        for i in range(count):
+            value = varint()
+            # 0: the entry directly follows the previous one
+            if value == 0 and i > 0:
+                offsets.append(offsets[i - 1] + lengths[i - 1])
+            else:
+                offsets.append(value - 1)
+        return list(zip(tile_ids, offsets, lengths, run_lengths))
+
+
+class LocalTileServer:
+    """
+    A local HTTP server serving the tiles of [`TileArchive`][(p).]s,
+    for instance to display maps without network access.
+
+    The server runs in background threads of the Python process, and serves
+    the tiles of each archive at `/<name>/{z}/{x}/{y}`. Its
+    [`url_template()`][..] is used as the [`TileLayer.url_template`][(p).].
+
+    Note:
+        The map client must be able to reach the server: this is the case of
+        desktop and mobile apps, where the Python program runs on the device,
+        but not of web apps, unless the server is made reachable by the
+        browsers.
+
+    Example:
+        ```python
+        server = ftm.LocalTileServer({"base": "region.pmtiles"})
+        server.start()
+        ftm.TileLayer(url_template=server.url_template("base"))
+        ```
+    """
+
+    def __init__(
+        self,
+        archives: Mapping[str, Union[TileArchive, str, os.PathLike]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            archives: The archives to serve, by name. Paths are opened as
+                [`MBTilesArchive`][(p).]s or [`PMTilesArchive`][(p).]s according
+                to their `.mbtiles` or `.pmtiles` extension.
+            host: The address to listen on.
+            port: The port to listen on, or `0` to use any free port.
+
+        Raises:
+            ValueError: If the extension of an archive path is not supported.
+        """
+        self.archives: dict[str, TileArchive] = {
+            name: _open_archive(archive) for name, archive in archives.items()
+        }
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        return f"http://{self.host}:{self.port}"
+
+    def url_template(self, name: str) -> str:
+        """
+        Returns the [`TileLayer.url_template`][(p).] of the archive `name`.
+
+        Raises:
+            KeyError: If there is no archive named `name`.
+        """
+        if name not in self.archives:
+            raise KeyError(name)
+        return f"{self.url}/{name}/{{z}}/{{x}}/{{y}}"
+
+    def start(self):
+        """
+        Starts serving tiles, in background threads.
+        If [`port`][..] is `0`, it is set to the actual port of the server.
+        """
+        if self._server is not None:
+            return
+        archives = self.archives
+
+        class Handler(_TileRequestHandler):
+            pass
+
+        Handler.archives = archives
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="LocalTileServer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops serving tiles."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+
+    def close(self):
+        """Stops serving tiles, and closes the archives."""
+        self.stop()
+        for archive in self.archives.values():
+            archive.close()
+
+    def __enter__(self) -> "LocalTileServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _TileRequestHandler(BaseHTTPRequestHandler):
+    archives: dict[str, TileArchive] = {}
+
+    def do_GET(self):
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        archive = self.archives.get(parts[0]) if len(parts) == 4 else None
+        try:
+            z, x = int(parts[1]), int(parts[2])
+            y = int(parts[3].split(".", 1)[0])
+        except (IndexError, ValueError):
+            archive = None
+        tile = archive.get_tile(z, x, y) if archive is not None else None
+        if tile is None:
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Length", "0")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", archive.content_type)
+        if archive.content_encoding:
+            self.send_header("Content-Encoding", archive.content_encoding)
+        self.send_header("Content-Length", str(len(tile)))
+        self.send_header("Cache-Control", "public, max-age=86400")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(tile)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _open_archive(archive: Union[TileArchive, str, os.PathLike]) -> TileArchive:
+    if isinstance(archive, TileArchive):
+        return archive
+    extension = os.path.splitext(os.fspath(archive))[1].lower()
+    if extension == ".mbtiles":
+        return MBTilesArchive(archive)
+    if extension == ".pmtiles":
+        return PMTilesArchive(archive)
+    raise ValueError(f"unsupported tile archive: {archive}")
+
+
+def _tile_id(z: int, x: int, y: int) -> int:
+    """
+    Returns the PMTiles id of a tile: its position along the Hilbert curve
+    of its zoom level, after all the tiles of the lower zoom levels.
+    """
+    tile_id = ((1 << (2 * z)) - 1) // 3
+    n = 1 << z
+    s = n >> 1
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        tile_id += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x, y = n - 1 - x, n - 1 - y
+            x, y = y, x
+        s >>= 1
+    return tile_id
+
+
+def _find_entry(
+    directory: list[tuple[int, int, int, int]], tile_id: int
+) -> Optional[tuple[int, int, int, int]]:
+    """
+    Returns the entry of `directory` holding `tile_id`: the tile run containing
+    it, or the leaf directory which may contain it.
+    """
+    low, high = 0, len(directory) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        entry_id = directory[middle][0]
+        if entry_id < tile_id:
+            low = middle + 1
+        elif entry_id > tile_id:
+            high = middle - 1
+        else:
+            return directory[middle]
+    # the last entry before tile_id
+    if high >= 0:
+        entry = directory[high]
+        run_length = entry[3]
+        if run_length == 0 or tile_id - entry[0] < run_length:
+            return entry
+    return None
@@ -0,0 +1,95 @@
+import math
+from collections.abc import Iterator
+
+from flet_map.feature_layer import _project_y
+from flet_map.types import MapLatitudeLongitudeBounds
+
+__all__ = ["count_tiles", "get_tile_range", "iter_tiles"]
+
+TileRange = tuple[int, int, int, int]
+"""A `(min_x, min_y, max_x, max_y)` range of tiles, inclusive."""
+
+
+def get_tile_range(bounds: MapLatitudeLongitudeBounds, zoom: int) -> TileRange:
+    """
+    Returns the range of the tiles covering `bounds` at `zoom`.
+
+    Tiles are numbered as in the XYZ (slippy map) scheme used by
+    [`TileLayer.url_template`][(p).]: at zoom level `z`, `x` and `y` go from
+    `0` to `2 ** z - 1`, from the antimeridian eastwards and from the north
+    southwards respectively. [`TileLayer.enable_tms`][(p).],
+    [`TileLayer.zoom_reverse`][(p).] and [`TileLayer.zoom_offset`][(p).]
+    only change how these coordinates are written in tile URLs.
+
+    Args:
+        bounds: The area to cover. It must not cross the antimeridian: the
+            area between longitudes `170` and `-170` is read as the one
+            spanning the prime meridian. Split areas crossing the antimeridian
+            in two, on each side of it.
+        zoom: The zoom level of the tiles.
+
+    Returns:
+        The `(min_x, min_y, max_x, max_y)` coordinates, inclusive,
+            of the covering tiles.
+
+    Raises:
+        AssertionError: If `zoom` is negative.
+    """
+    assert zoom >= 0, f"zoom must be greater than or equal to 0, got {zoom}"
+    corner_1, corner_2 = bounds.corner_1, bounds.corner_2
+    south, north = sorted((corner_1.latitude, corner_2.latitude))
+    west, east = sorted((corner_1.longitude, corner_2.longitude))
+    count = 2**zoom
+
+    def column(longitude: float) -> int:
+        return min(count - 1, max(0, math.floor((longitude + 180) / 360 * count)))
+
+    def row(latitude: float) -> int:
+        return min(count - 1, max(0, math.floor(_project_y(latitude) * count)))
+
+    return column(west), row(north), column(east), row(south)
+
+
+def iter_tiles(
+    bounds: MapLatitudeLongitudeBounds, min_zoom: int, max_zoom: int
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Yields the `(x, y, zoom)` coordinates of the tiles covering `bounds`,
+    from `min_zoom` to `max_zoom` inclusive, as described in
+    [`get_tile_range()`][(p).].
+
+    Raises:
+        AssertionError: If `min_zoom` is negative or greater than `max_zoom`.
+    """
+    assert 0 <= min_zoom <= max_zoom, (
+        f"min_zoom must be between 0 and max_zoom ({max_zoom}), got {min_zoom}"
+    )
+    for zoom in range(min_zoom, max_zoom + 1):
+        min_x, min_y, max_x, max_y = get_tile_range(bounds, zoom)
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                yield x, y, zoom
+
+
+def count_tiles(
+    bounds: MapLatitudeLongitudeBounds, min_zoom: int, max_zoom: int
+) -> int:
+    """
+    Returns the number of tiles covering `bounds`, from `min_zoom` to `max_zoom`
+    inclusive, e.g. to estimate the size of a download beforehand.
+
+    Raises:
+        AssertionError: If `min_zoom` is negative or greater than `max_zoom`.
+    """
+    assert 0 <= min_zoom <= max_zoom, (
+        f"min_zoom must be between 0 and max_zoom ({max_zoom}), got {min_zoom}"
+    )
+    return sum(
+        _range_size(get_tile_range(bounds, zoom))
+        for zoom in range(min_zoom, max_zoom + 1)
+    )
+
+
+def _range_size(tile_range: TileRange) -> int:
+    min_x, min_y, max_x, max_y = tile_range
+    return (max_x - min_x + 1) * (max_y - min_y + 1)
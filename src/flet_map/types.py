@@ -1,11 +1,19 @@
+import contextlib
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import Enum, IntFlag
-from typing import TYPE_CHECKING, Optional
+from numbers import Real
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 import flet as ft
 
 if TYPE_CHECKING:
     from flet_map.map import Map  # noqa
+    from flet_map.map_layer import MapLayer  # noqa
+    from flet_map.tile_layer import TileLayer  # noqa
 
 __all__ = [
     "AttributionAlignment",
@@ -15,25 +23,41 @@ __all__ = [
     "CursorRotationBehaviour",
     "DashedStrokePattern",
     "DottedStrokePattern",
+    "EventThrottleConfiguration",
     "FadeInTileDisplay",
+    "FeatureFilter",
+    "FeatureStyle",
     "InstantaneousTileDisplay",
     "InteractionConfiguration",
     "InteractionFlag",
     "KeyboardConfiguration",
+    "MapCameraChangeEvent",
     "MapEvent",
     "MapEventSource",
+    "MapFeatureEvent",
+    "MapFeatureHoverEvent",
+    "MapFeatureTapEvent",
     "MapHoverEvent",
     "MapLatitudeLongitude",
+    "MapLatitudeLongitudeArray",
     "MapLatitudeLongitudeBounds",
     "MapPointerEvent",
     "MapPositionChangeEvent",
     "MapTapEvent",
+    "MarkerCluster",
     "MultiFingerGesture",
+    "NumberArray",
     "PatternFit",
     "SolidStrokePattern",
     "StrokePattern",
+    "SymbolShape",
+    "TileCacheConfiguration",
+    "TileCacheStats",
     "TileDisplay",
     "TileLayerEvictErrorTileStrategy",
+    "TileMetricsEvent",
+    "TileSeedProgressEvent",
+    "TileSeedResult",
 ]
 
 
@@ -144,6 +168,33 @@ class Camera:
     The rotation (in degrees) of the camera.
     """
 
+    visible_bounds: Optional["MapLatitudeLongitudeBounds"] = None
+    """
+    The bounds of the area currently visible through this camera.
+    """
+
+
+class SymbolShape(Enum):
+    """The shape of the symbols of a [`SymbolLayer`][(p).]."""
+
+    CIRCLE = "circle"
+    """A circle."""
+
+    SQUARE = "square"
+    """A square."""
+
+    TRIANGLE = "triangle"
+    """An upward pointing triangle."""
+
+    DIAMOND = "diamond"
+    """A square rotated by 45 degrees."""
+
+    CROSS = "cross"
+    """A plus-shaped cross."""
+
+    STAR = "star"
+    """A five-pointed star."""
+
 
 @dataclass
 class StrokePattern:
@@ -236,6 +287,173 @@ class DottedStrokePattern(StrokePattern):
         self._type = "dotted"
 
 
+@dataclass
+class FeatureStyle:
+    """
+    A named style shared by the features of a vector layer, such as a
+    [`PolygonLayer`][(p).], through its `styles` table.
+
+    A feature referencing a style by its `style` id is drawn with the
+    properties of the style which are not `None`, instead of its own.
+    Shared styles are sent and parsed once per layer, rather than once per
+    feature, which makes large layers with few distinct styles much cheaper
+    to send and to display.
+
+    Properties which do not apply to the features of a layer are ignored,
+    e.g. [`stroke_pattern`][..] for circles.
+
+    Raises:
+        AssertionError: If [`stroke_width`][(c).] or
+            [`border_stroke_width`][(c).] is negative.
+    """
+
+    color: Optional[ft.ColorValue] = None
+    """
+    The fill color of polygons and circles, or the color of polylines.
+    """
+
+    border_color: Optional[ft.ColorValue] = None
+    """
+    The color of the border.
+    """
+
+    border_stroke_width: Optional[ft.Number] = None
+    """
+    The width of the border.
+    """
+
+    stroke_width: Optional[ft.Number] = None
+    """
+    The width of polylines.
+    """
+
+    use_stroke_width_in_meter: Optional[bool] = None
+    """
+    Whether the [`stroke_width`][..] of polylines is in meters.
+    """
+
+    stroke_pattern: Optional[StrokePattern] = None
+    """
+    The pattern of the stroke of polylines.
+    """
+
+    stroke_cap: Optional[ft.StrokeCap] = None
+    """
+    The cap of the ends of the strokes.
+    """
+
+    stroke_join: Optional[ft.StrokeJoin] = None
+    """
+    The join of the segments of the strokes.
+    """
+
+    gradient_colors: Optional[list[ft.ColorValue]] = None
+    """
+    The colors of the gradient along polylines.
+    """
+
+    colors_stop: Optional[list[ft.Number]] = None
+    """
+    The stops of the [`gradient_colors`][..].
+    """
+
+    label_text_style: Optional[ft.TextStyle] = None
+    """
+    The text style of the labels of polygons.
+    """
+
+    def __post_init__(self):
+        for name in ("stroke_width", "border_stroke_width"):
+            value = getattr(self, name)
+            assert value is None or value >= 0, (
+                f"{name} must be greater than or equal to 0, got {value}"
+            )
+
+
+@dataclass
+class FeatureFilter:
+    """
+    A filter of the features displayed by a layer, such as a
+    [`PolygonLayer`][(p).], through its `filter`.
+
+    The filter is applied on the client: hiding or showing features only sends
+    the filter, and the features hidden by it are kept, along with their
+    parsed geometry, to be displayed again as soon as they match it.
+
+    A feature is displayed if it matches all the conditions which are set:
+
+    - its [`key`][flet.Control.key] is one of the [`keys`][..], and not one of
+      the [`exclude_keys`][..]. Features without key never match [`keys`][..].
+    - its `attributes` hold the [`attribute`][..], whose value is one of the
+      [`values`][..], and is between [`min_value`][..] and [`max_value`][..].
+
+    Raises:
+        AssertionError: If [`values`][(c).], [`min_value`][(c).] or
+            [`max_value`][(c).] are set without an [`attribute`][(c).],
+            or if [`min_value`][(c).] is greater than [`max_value`][(c).].
+    """
+
+    keys: Optional[list[ft.KeyValue]] = None
+    """
+    The keys of the features to display.
+    """
+
+    exclude_keys: Optional[list[ft.KeyValue]] = None
+    """
+    The keys of the features to hide.
+    """
+
+    attribute: Optional[str] = None
+    """
+    The name of the attribute, in the `attributes` of the features, which
+    [`values`][..], [`min_value`][..] and [`max_value`][..] apply to.
+
+    Features without this attribute are hidden.
+    """
+
+    values: Optional[list[Union[str, ft.Number, bool]]] = None
+    """
+    The values of the [`attribute`][..] of the features to display.
+    """
+
+    min_value: Optional[ft.Number] = None
+    """
+    The minimum numeric value of the [`attribute`][..] of the features to
+    display.
+    """
+
+    max_value: Optional[ft.Number] = None
+    """
+    The maximum numeric value of the [`attribute`][..] of the features to
+    display.
+    """
+
+    def __post_init__(self):
+        # keys are matched by value on the client; sets and other iterables
+        # are accepted for convenience
+        for name in ("keys", "exclude_keys"):
+            keys = getattr(self, name)
+            if keys is not None:
+                setattr(
+                    self,
+                    name,
+                    [key.value if isinstance(key, ft.Key) else key for key in keys],
+                )
+        if self.values is not None:
+            self.values = list(self.values)
+        assert self.attribute is not None or (
+            self.values is None and self.min_value is None and self.max_value is None
+        ), "values, min_value and max_value require an attribute"
+        assert (
+            self.min_value is None
+            or self.max_value is None
+            or self.min_value <= self.max_value
+        ), (
+            f"min_value must be less than or equal to max_value, "
+            f"got {self.min_value} and {self.max_value}"
+        )
+
+
 @dataclass
 class MapLatitudeLongitude:
     """Map coordinates in degrees."""
@@ -261,6 +479,382 @@ class MapLatitudeLongitudeBounds:
     """The corner 2."""
 
 
+@dataclass
+class MapLatitudeLongitudeArray:
+    """
+    A compact, array-backed sequence of map coordinates.
+
+    Instead of one [`MapLatitudeLongitude`][(p).] object per point, all
+    coordinates are kept in a single packed buffer of interleaved
+    `latitude, longitude` pairs, which is sent to the client as one binary value.
+    This considerably reduces memory usage, serialization time and payload size
+    for large geometries, such as long GPS tracks or detailed polygons.
+
+    The constructor accepts any of the following:
+
+    - an object supporting the buffer protocol, such as a NumPy array of shape
+      `(n, 2)` or `(2 * n,)` or an `array.array("d")`, holding interleaved
+      `latitude, longitude` values;
+    - a flat iterable of numbers: `[lat_0, lng_0, lat_1, lng_1, ...]`;
+    - an iterable of [`MapLatitudeLongitude`][(p).]s or `(latitude, longitude)`
+      pairs;
+    - `bytes` already packed as described in [`data`][..].
+
+    Coordinates can also be sent to the client in a compact, quantized
+    encoding by setting [`precision`][..], which typically makes the payload
+    of dense geometries, such as routes, 4 to 10 times smaller.
+
+    Example:
+        ```python
+        track = ftm.MapLatitudeLongitudeArray(np.column_stack([lats, lngs]))
+        ftm.PolylineMarker(coordinates=track)
+
+        route = ftm.MapLatitudeLongitudeArray(route_points, precision=5)
+        ```
+
+    Raises:
+        AssertionError: If the given values do not form complete
+            `latitude, longitude` pairs, or if [`precision`][(c).] is not
+            between `0` and `7`.
+    """
+
+    data: bytes = b""
+    """
+    The coordinates sent to the client.
+
+    If [`precision`][..] is `None`, they are packed as interleaved
+    `latitude, longitude` pairs of little-endian 64-bit floats.
+    Otherwise, they are encoded as described in [`precision`][..].
+    """
+
+    precision: Optional[int] = None
+    """
+    The number of decimal places to which the coordinates are rounded
+    when sent to the client, or `None` to send them as 64-bit floats.
+
+    When set, each coordinate is stored as an integer number of
+    `10 ** -precision` degrees, and [`data`][..] holds the difference between
+    each value and the same value of the previous point, as a zigzag-encoded
+    variable-length integer (LEB128), like the [Encoded Polyline Algorithm](
+    https://developers.google.com/maps/documentation/utilities/polylinealgorithm)
+    but in binary form. Consecutive points of a geometry being close to each
+    other, most differences fit in one to three bytes instead of eight.
+
+    A precision of `5` is accurate to about one meter, `6` to about ten
+    centimeters and `7` to about one centimeter. The coordinates of this array,
+    on the Python side too, are the rounded ones.
+    """
+
+    def __post_init__(self):
+        assert self.precision is None or 0 <= self.precision <= 7, (
+            f"precision must be between 0 and 7, got {self.precision}"
+        )
+        self._set_values(_pack_coordinates(self.data))
+
+    @classmethod
+    def from_polyline(
+        cls, encoded: str, precision: int = 5
+    ) -> "MapLatitudeLongitudeArray":
+        """
+        Decodes a polyline in the [Encoded Polyline Algorithm Format](
+        https://developers.google.com/maps/documentation/utilities/polylinealgorithm),
+        as returned by many routing services.
+
+        Args:
+            encoded: The encoded polyline.
+            precision: The number of decimal places of the encoded coordinates:
+                usually `5`, or `6` for services such as OSRM or Valhalla.
+                It is also the [`precision`][..] of the returned array,
+                so that the coordinates are sent to the client without loss.
+
+        Raises:
+            ValueError: If `encoded` is not a valid encoded polyline.
+        """
+        # alternately, the latitude and longitude of each point
+        ints: list[int] = []
+        totals = [0, 0]
+        value = shift = 0
+        for char in encoded:
+            chunk = ord(char) - 63
+            if not 0 <= chunk < 64:
+                raise ValueError(f"invalid character in encoded polyline: {char!r}")
+            value |= (chunk & 0x1F) << shift
+            shift += 5
+            if chunk < 0x20:
+                totals[len(ints) % 2] += ~(value >> 1) if value & 1 else value >> 1
+                ints.append(totals[len(ints) % 2])
+                value = shift = 0
+        if shift or len(ints) % 2:
+            raise ValueError("incomplete encoded polyline")
+        scale = 10**precision
+        return cls(array("d", [i / scale for i in ints]), precision=precision)
+
+    def __len__(self) -> int:
+        return len(self._values) // 16
+
+    def __getitem__(self, index: int) -> MapLatitudeLongitude:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("coordinate index out of range")
+        return MapLatitudeLongitude(
+            *struct.unpack_from("<2d", self._values, index * 16)
+        )
+
+    def __iter__(self) -> Iterator[MapLatitudeLongitude]:
+        for latitude, longitude in struct.iter_unpack("<2d", self._values):
+            yield MapLatitudeLongitude(latitude, longitude)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self)} coordinates>)"
+
+    def _set_values(self, values: bytes) -> None:
+        """
+        Sets the coordinates to the interleaved float64 `latitude, longitude`
+        pairs `values`, and [`data`][..] to their encoding.
+        """
+        data = values
+        if self.precision is not None:
+            data, values = _encode_coordinates(values, self.precision)
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "data", data)
+
+    def _extend(self, other: "MapLatitudeLongitudeArray") -> None:
+        """
+        Appends `other` in place, without recording a property change.
+
+        Used to mirror point deltas which were already applied on the client.
+        """
+        data = self.data if isinstance(self.data, bytearray) else bytearray(self.data)
+        if self.precision is None:
+            data += other._values
+            values = data
+        else:
+            previous = (
+                struct.unpack_from("<2d", self._values, len(self._values) - 16)
+                if self._values
+                else (0.0, 0.0)
+            )
+            encoded, rounded = _encode_coordinates(
+                other._values, self.precision, previous
+            )
+            data += encoded
+            values = self._values
+            if not isinstance(values, bytearray):
+                values = bytearray(values)
+            values += rounded
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "data", data)
+
+    def _trim_head(self, count: int) -> None:
+        """
+        Removes the first `count` coordinates in place, without recording a
+        property change.
+
+        Used to mirror point deltas which were already applied on the client.
+        """
+        if self.precision is not None:
+            self._set_values(self._values[count * 16 :])
+            return
+        data = self.data if isinstance(self.data, bytearray) else bytearray(self.data)
+        del data[: count * 16]
+        object.__setattr__(self, "_values", data)
+        object.__setattr__(self, "data", data)
+
+    def values(self) -> array:
+        """
+        Returns:
+            A flat `array.array("d")` of interleaved `latitude, longitude` values.
+        """
+        values = array("d")
+        values.frombytes(self._values)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+
+def _encode_coordinates(
+    values: bytes, precision: int, previous: tuple[float, float] = (0.0, 0.0)
+) -> tuple[bytes, bytes]:
+    """
+    Encodes interleaved float64 `latitude, longitude` pairs as described in
+    `MapLatitudeLongitudeArray.precision`.
+
+    Args:
+        values: The coordinates to encode.
+        precision: The number of decimal places to round the coordinates to.
+        previous: The (rounded) point preceding `values`, if they are appended
+            to already encoded coordinates.
+
+    Returns:
+        The encoded coordinates, and the rounded coordinates as interleaved
+            float64 `latitude, longitude` pairs.
+    """
+    flat = array("d")
+    flat.frombytes(values)
+    if sys.byteorder == "big":
+        flat.byteswap()
+    scale = 10**precision
+    ints = [round(v * scale) for v in flat]
+    origin = [round(v * scale) for v in previous]
+    data = bytearray()
+    append = data.append
+    for value, before in zip(ints, origin + ints[:-2]):
+        delta = value - before
+        zigzag = delta << 1 if delta >= 0 else ~(delta << 1)
+        while zigzag >= 0x80:
+            append(zigzag & 0x7F | 0x80)
+            zigzag >>= 7
+        append(zigzag)
+    rounded = array("d", [i / scale for i in ints])
+    if sys.byteorder == "big":
+        rounded.byteswap()
+    return bytes(data), rounded.tobytes()
+
+
+def _pack_coordinates(values: Any) -> bytes:
+    """Packs `values` into interleaved little-endian float64 `lat, lng` pairs."""
+    if values is None:
+        return b""
+    if isinstance(values, MapLatitudeLongitudeArray):
+        return bytes(values._values)
+    if isinstance(values, (bytes, bytearray)):
+        assert len(values) % 16 == 0, (
+            f"packed coordinates length must be a multiple of 16, got {len(values)}"
+        )
+        return bytes(values)
+
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+    if view is not None:
+        if (
+            view.format in ("d", "@d", "=d", "<d")
+            and view.c_contiguous
+            and (view.format == "<d" or sys.byteorder == "little")
+        ):
+            data = view.tobytes()
+            assert len(data) % 16 == 0, (
+                f"coordinates must contain complete latitude/longitude pairs, "
+                f"got {len(data) // 8} values"
+            )
+            return data
+        with contextlib.suppress(NotImplementedError):
+            values = view.tolist()
+
+    flat = array("d")
+    for item in values:
+        if isinstance(item, MapLatitudeLongitude):
+            flat.append(item.latitude)
+            flat.append(item.longitude)
+        elif isinstance(item, Real):
+            flat.append(item)
+        else:
+            latitude, longitude = item
+            flat.append(latitude)
+            flat.append(longitude)
+    assert len(flat) % 2 == 0, (
+        f"coordinates must contain complete latitude/longitude pairs, "
+        f"got {len(flat)} values"
+    )
+    if sys.byteorder == "big":
+        flat.byteswap()
+    return flat.tobytes()
+
+
+@dataclass
+class NumberArray:
+    """
+    A compact, array-backed sequence of numbers, used for per-item values
+    of columnar layers, such as [`SymbolLayer.sizes`][(p).].
+
+    All values are kept in a single packed buffer of 32-bit floats, which is
+    sent to the client as one binary value. Integers up to `2 ** 24`, such as
+    palette indexes, are represented exactly.
+
+    The constructor accepts an object supporting the buffer protocol (such as
+    a NumPy array or an `array.array`), an iterable of numbers, or `bytes`
+    already packed as described in [`data`][..].
+
+    Raises:
+        AssertionError: If packed `bytes` are not a whole number of values.
+    """
+
+    data: bytes = b""
+    """The values, packed as little-endian 32-bit floats."""
+
+    def __post_init__(self):
+        self.data = _pack_numbers(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data) // 4
+
+    def __getitem__(self, index: int) -> float:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("number index out of range")
+        return struct.unpack_from("<f", self.data, index * 4)[0]
+
+    def __iter__(self) -> Iterator[float]:
+        for (value,) in struct.iter_unpack("<f", self.data):
+            yield value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self)} values>)"
+
+    def values(self) -> array:
+        """
+        Returns:
+            An `array.array("f")` of the values.
+        """
+        values = array("f")
+        values.frombytes(self.data)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+
+def _pack_numbers(values: Any) -> bytes:
+    """Packs `values` into little-endian float32 values."""
+    if values is None:
+        return b""
+    if isinstance(values, NumberArray):
+        return values.data
+    if isinstance(values, (bytes, bytearray)):
+        assert len(values) % 4 == 0, (
+            f"packed numbers length must be a multiple of 4, got {len(values)}"
+        )
+        return bytes(values)
+
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+    if view is not None:
+        if (
+            view.format in ("f", "@f", "=f", "<f")
+            and view.c_contiguous
+            and (view.format == "<f" or sys.byteorder == "little")
+        ):
+            return view.tobytes()
+        with contextlib.suppress(NotImplementedError):
+            values = view.tolist()
+
+    flat = array("f")
+    for item in values:
+        if isinstance(item, (list, tuple)):
+            flat.extend(item)
+        else:
+            flat.append(item)
+    if sys.byteorder == "big":
+        flat.byteswap()
+    return flat.tobytes()
+
+
 class InteractionFlag(IntFlag):
     """
     Flags to enable/disable certain interaction events on the map.
@@ -631,7 +1225,9 @@ class CameraFit:
         If this is not `None`, [`coordinates`][..] should be `None`, and vice versa.
     """
 
-    coordinates: Optional[list[MapLatitudeLongitude]] = None
+    coordinates: Optional[
+        Union[list[MapLatitudeLongitude], MapLatitudeLongitudeArray]
+    ] = None
     """
     The coordinates which the camera should contain once it is fitted.
 
@@ -668,6 +1264,63 @@ class CameraFit:
         ), "only one of bounds or coordinates must be provided, not both"
 
 
+@dataclass
+class EventThrottleConfiguration:
+    """
+    Limits the rate of camera-related events sent from the client, such as
+    [`Map.on_position_change`][(p).] and [`Map.on_event`][(p).], which
+    otherwise fire on every frame of a gesture or an animation.
+
+    Events are filtered on the client, before being sent. The last event of
+    a gesture is never dropped: it is sent once the [`interval`][..] or
+    [`debounce`][..] delay elapses. Events below the minimum deltas are held
+    back rather than dropped, and the last one is sent if no other event
+    follows within this delay, or within 250 milliseconds if neither is set.
+
+    Raises:
+        AssertionError: If [`min_distance`][(c).], [`min_zoom_delta`][(c).]
+            or [`min_rotation_delta`][(c).] is negative.
+    """
+
+    interval: Optional[ft.DurationValue] = None
+    """
+    The minimum delay between two events.
+    """
+
+    debounce: Optional[ft.DurationValue] = None
+    """
+    If set, an event is sent only once the camera has not changed for this
+    delay, e.g. when a gesture ends. Takes precedence over [`interval`][..].
+    """
+
+    min_distance: Optional[ft.Number] = None
+    """
+    The distance, in logical pixels, the center of the map must move from
+    the last sent event for a new one to be sent.
+    """
+
+    min_zoom_delta: Optional[ft.Number] = None
+    """
+    The change of zoom from the last sent event for a new one to be sent.
+    """
+
+    min_rotation_delta: Optional[ft.Number] = None
+    """
+    The change of rotation, in degrees, from the last sent event for a new
+    one to be sent.
+
+    When several of [`min_distance`][..], [`min_zoom_delta`][..] and
+    `min_rotation_delta` are set, an event is sent when any of them is reached.
+    """
+
+    def __post_init__(self):
+        for name in ("min_distance", "min_zoom_delta", "min_rotation_delta"):
+            value = getattr(self, name)
+            assert value is None or value >= 0, (
+                f"{name} must be greater than or equal to 0, got {value}"
+            )
+
+
 @dataclass
 class MapTapEvent(ft.TapEvent["Map"]):
     coordinates: MapLatitudeLongitude
@@ -701,6 +1354,86 @@ class MapEvent(ft.Event["Map"]):
     """The map camera after the event."""
 
 
+@dataclass
+class MapFeatureEvent(ft.Event["FeatureLayer"]):
+    """
+    Base class of the events about the features of a layer hit by the
+    pointer, which are hit-tested on the client.
+    """
+
+    ids: list[int]
+    """
+    The ids of the controls of the features hit by the pointer,
+    topmost first.
+    """
+
+    coordinates: Optional[MapLatitudeLongitude] = None
+    """
+    The coordinates of the pointer.
+    """
+
+    @property
+    def features(self) -> list[ft.Control]:
+        """
+        The features hit by the pointer, topmost first.
+
+        Features removed from the layer since the event was sent are omitted.
+        """
+        return self.control._get_features(self.ids)
+
+    @property
+    def keys(self) -> list[Optional[ft.KeyValue]]:
+        """
+        The [`key`][flet.Control.key] of each of the [`features`][..].
+        """
+        return [feature.key for feature in self.features]
+
+
+@dataclass
+class MapFeatureHoverEvent(MapFeatureEvent):
+    """
+    The features of a layer under the pointer changed.
+
+    When the pointer left the features of the layer, [`ids`][..] is empty
+    and [`coordinates`][..] is `None`.
+    """
+
+
+@dataclass
+class MapFeatureTapEvent(MapFeatureEvent):
+    """
+    Features of a layer were tapped.
+    """
+
+
+@dataclass
+class MarkerCluster:
+    """A cluster of markers, as displayed by a [`ClusteredMarkerLayer`][(p).]."""
+
+    coordinates: MapLatitudeLongitude
+    """The center of the clustered markers."""
+
+    count: int
+    """The number of clustered markers."""
+
+    zoom: int
+    """The zoom level at which the markers are clustered."""
+
+    key: tuple[int, int]
+    """
+    The grid cell of the cluster at [`zoom`][..], which identifies it
+    among the clusters of that zoom level.
+    """
+
+
+@dataclass
+class MapCameraChangeEvent(ft.Event["MapLayer"]):
+    """Fired by a [`MapLayer`][(p).] when the camera of its map changes."""
+
+    camera: Camera
+    """The map camera after the change."""
+
+
 @dataclass
 class TileDisplay:
     """
@@ -765,6 +1498,166 @@ class FadeInTileDisplay(TileDisplay):
         self._type = "fadein"
 
 
+@dataclass
+class TileCacheConfiguration:
+    """
+    Options of the persistent, on-device cache of the tiles of a
+    [`TileLayer`][(p).].
+
+    Tiles are stored on disk, in a store shared by all the tile layers with the
+    same [`store_name`][..], and are reused across sessions and while offline.
+    The least recently used tiles are evicted when the store exceeds
+    [`max_size`][..].
+
+    Note:
+        The cache is not supported on the web, where the browser's HTTP cache
+        is used instead.
+
+    Raises:
+        AssertionError: If [`max_size`][(c).] is not positive.
+    """
+
+    store_name: Optional[str] = None
+    """
+    The name of the store holding the tiles.
+
+    Tile layers sharing a store also share its [`max_size`][..].
+    If `None`, a store is derived from the
+    [`url_template`][(p).TileLayer.url_template] of the layer.
+    """
+
+    max_size: int = 200 * 1024 * 1024
+    """
+    The maximum size, in bytes, of the store.
+    """
+
+    max_age: Optional[ft.DurationValue] = field(
+        default_factory=lambda: ft.Duration(days=30)
+    )
+    """
+    How long a cached tile is used without being downloaded again,
+    or `None` to use cached tiles indefinitely.
+
+    Older tiles are still used if they cannot be downloaded, e.g. while offline.
+    """
+
+    def __post_init__(self):
+        assert self.max_size > 0, (
+            f"max_size must be greater than 0, got {self.max_size}"
+        )
+
+
+@dataclass
+class TileSeedResult:
+    """
+    The outcome of [`TileLayer.seed_cache()`][(p).].
+    """
+
+    tile_count: int
+    """The number of tiles covering the seeded area."""
+
+    downloaded_count: int = 0
+    """The number of tiles downloaded into the cache."""
+
+    skipped_count: int = 0
+    """The number of tiles which were already cached, and not downloaded again."""
+
+    failed_count: int = 0
+    """The number of tiles which could not be downloaded."""
+
+
+@dataclass
+class TileSeedProgressEvent(ft.Event["TileLayer"]):
+    """
+    Fired by a [`TileLayer`][(p).] as [`TileLayer.seed_cache()`][(p).] progresses.
+    """
+
+    completed_count: int
+    """The number of tiles processed so far, downloaded or not."""
+
+    tile_count: int
+    """The total number of tiles to process."""
+
+
+@dataclass
+class TileMetricsEvent(ft.Event["TileLayer"]):
+    """
+    Tile loading metrics of a [`TileLayer`][(p).], aggregated over
+    [`TileLayer.metrics_interval`][(p).].
+
+    Only the tiles loaded from the network or from the
+    [`TileLayer.cache`][(p).] are counted, not the ones already in memory.
+    """
+
+    requested_count: int
+    """The number of tiles requested."""
+
+    loaded_count: int
+    """The number of tiles successfully loaded."""
+
+    cache_hit_count: int
+    """The number of tiles loaded from the [`TileLayer.cache`][(p).]."""
+
+    cancelled_count: int
+    """
+    The number of tiles which were no longer needed before being downloaded,
+    e.g. after a fling. Only reported with
+    [`TileLayer.max_concurrent_requests`][(p).].
+    """
+
+    error_count: int
+    """The number of tiles which failed to load."""
+
+    errors: dict[str, int]
+    """
+    The number of errors by type: `"http_<status code>"`, `"network"`,
+    `"timeout"` or the name of the error class.
+
+    Downloads time out when no response is received within 30 seconds.
+    """
+
+    downloaded_bytes: int
+    """The number of bytes of the downloaded tiles."""
+
+    mean_load_time: Optional[float] = None
+    """
+    The mean time, in milliseconds, to load a tile (excluding decoding),
+    or `None` if no tile was loaded.
+    """
+
+    p95_load_time: Optional[float] = None
+    """
+    The 95th percentile of the time, in milliseconds, to load a tile,
+    or `None` if no tile was loaded.
+    """
+
+
+@dataclass
+class TileCacheStats:
+    """
+    Statistics of a tile cache store, as returned by
+    [`TileLayer.get_cache_stats()`][(p).].
+    """
+
+    store_name: str
+    """The name of the store."""
+
+    tile_count: int
+    """The number of tiles in the store."""
+
+    size: int
+    """The size, in bytes, of the tiles in the store."""
+
+    hit_count: int = 0
+    """The number of tiles loaded from the store since the app started."""
+
+    miss_count: int = 0
+    """
+    The number of tiles which had to be downloaded, as they were not in the
+    store or were too old, since the app started.
+    """
+
+
 @dataclass
 class KeyboardConfiguration:
     """
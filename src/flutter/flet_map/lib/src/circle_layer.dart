@@ -3,31 +3,84 @@ import 'package:flutter/material.dart';
 import 'package:flutter/widgets.dart';
 import 'package:flutter_map/flutter_map.dart';
 
+import 'utils/filter.dart';
+import 'utils/hit.dart';
 import 'utils/map.dart';
+import 'utils/styles.dart';
 
-class CircleLayerControl extends StatelessWidget with FletStoreMixin {
+class CircleLayerControl extends StatefulWidget {
   final Control control;
 
   const CircleLayerControl({super.key, required this.control});
 
+  @override
+  State<CircleLayerControl> createState() => _CircleLayerControlState();
+}
+
+class _CircleLayerControlState extends State<CircleLayerControl>
+    with FletStoreMixin {
+  final _filter = LayerFeatureFilter();
+
+  @override
+  void initState() {
+    super.initState();
+    widget.control.addInvokeMethodListener(_invokeMethod);
+  }
+
+  @override
+  void dispose() {
+    widget.control.removeInvokeMethodListener(_invokeMethod);
+    super.dispose();
+  }
+
+  Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    debugPrint("CircleLayer.$name($args)");
+    switch (name) {
+      case "update_feature_styles":
+        updateFeatureStyles(args, widget.control.children("circles"));
+        setState(() {});
+        break;
+      case "set_filter":
+        _filter.set(widget.control, args);
+        setState(() {});
+        break;
+      default:
+        throw Exception("Unknown CircleLayer method: $name");
+    }
+  }
+
   @override
   Widget build(BuildContext context) {
+    var control = widget.control;
     debugPrint("CircleLayerControl build: ${control.id}");
 
-    var circles = control
+    var theme = Theme.of(context);
+    var styles = parseFeatureStyles(control.get("styles"), theme);
+    var children = control
         .children("circles")
         .where((c) => c.type == "CircleMarker")
-        .map((circle) {
-      return CircleMarker(
+        .toList();
+
+    var circles = _filter.apply(control, children).map((circle) {
+      var style = styles[circle.get("style")];
+      return CircleMarker<int>(
+          hitValue: circle.id,
           point: parseLatLng(circle.get("coordinates"))!,
-          color: circle.getColor("color", context, const Color(0xFF00FF00))!,
-          borderColor: circle.getColor(
-              "border_color", context, const Color(0xFFFFFF00))!,
-          borderStrokeWidth: circle.getDouble("border_stroke_width", 0.0)!,
+          color: style?.color ??
+              parseColor(circle.get("color"), theme, const Color(0xFF00FF00))!,
+          borderColor: style?.borderColor ??
+              parseColor(circle.get("border_color"), theme,
+                  const Color(0xFFFFFF00))!,
+          borderStrokeWidth: style?.borderStrokeWidth ??
+              circle.getDouble("border_stroke_width", 0.0)!,
           useRadiusInMeter: circle.getBool("use_radius_in_meter", false)!,
           radius: circle.getDouble("radius", 10)!);
     }).toList();
 
-    return CircleLayer(circles: circles);
+    return FeatureHitDetector(
+      control: control,
+      builder: (hitNotifier) =>
+          CircleLayer<int>(circles: circles, hitNotifier: hitNotifier),
+    );
   }
 }
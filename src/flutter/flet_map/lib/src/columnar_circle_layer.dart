@@ -0,0 +1,140 @@
+import 'dart:typed_data';
+
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter_map/flutter_map.dart';
+import 'package:latlong2/latlong.dart';
+
+import 'utils/map.dart';
+
+class ColumnarCircleLayerControl extends StatefulWidget {
+  final Control control;
+
+  const ColumnarCircleLayerControl({super.key, required this.control});
+
+  @override
+  State<ColumnarCircleLayerControl> createState() =>
+      _ColumnarCircleLayerControlState();
+}
+
+class _ColumnarCircleLayerControlState
+    extends State<ColumnarCircleLayerControl> {
+  final Map<String, (Object?, Object?)> _columns = {};
+  List<LatLng> _points = const [];
+  Float32List? _radii;
+  Float32List? _meterFlags;
+  Float32List? _colorIndices;
+  Float32List? _borderColorIndices;
+  Float32List? _borderStrokeWidths;
+  List<Object?>? _circlesKey;
+  List<CircleMarker> _circles = const [];
+
+  /// Whether the packed value of [name] changed since it was last parsed.
+  bool _changed(String name) {
+    var value = widget.control.get(name);
+    var data = value is Map ? value["data"] : null;
+    var cached = _columns[name];
+    if (cached != null &&
+        identical(cached.$1, value) &&
+        identical(cached.$2, data)) {
+      return false;
+    }
+    _columns[name] = (value, data);
+    return true;
+  }
+
+  /// Parses the changed columns, and returns whether any of them changed.
+  bool _parse() {
+    var control = widget.control;
+    var changed = false;
+    if (_changed("coordinates")) {
+      _points = parseLatLngList(control.get("coordinates"), const [])!;
+      changed = true;
+    }
+    if (_changed("radii")) {
+      _radii = parseNumberArray(control.get("radii"));
+      changed = true;
+    }
+    if (_changed("use_radius_in_meter_flags")) {
+      _meterFlags = parseNumberArray(control.get("use_radius_in_meter_flags"));
+      changed = true;
+    }
+    if (_changed("color_indices")) {
+      _colorIndices = parseNumberArray(control.get("color_indices"));
+      changed = true;
+    }
+    if (_changed("border_color_indices")) {
+      _borderColorIndices =
+          parseNumberArray(control.get("border_color_indices"));
+      changed = true;
+    }
+    if (_changed("border_stroke_widths")) {
+      _borderStrokeWidths =
+          parseNumberArray(control.get("border_stroke_widths"));
+      changed = true;
+    }
+    return changed;
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    debugPrint("ColumnarCircleLayerControl build: ${widget.control.id}");
+    var columnsChanged = _parse();
+
+    var control = widget.control;
+    var theme = Theme.of(context);
+    var palette = control
+        .get("palette", [])!
+        .map((c) => parseColor(c, theme))
+        .nonNulls
+        .toList();
+    if (palette.isEmpty) palette = const [Colors.blue];
+    var radius = control.getDouble("radius", 10.0)!;
+    var useRadiusInMeter = control.getBool("use_radius_in_meter", false)!;
+    var borderColor =
+        control.getColor("border_color", context, const Color(0x00000000))!;
+    var borderStrokeWidth = control.getDouble("border_stroke_width", 0.0)!;
+
+    // rebuild the circles only when a column or a shared value changed
+    var key = [
+      ...palette,
+      radius,
+      useRadiusInMeter,
+      borderColor,
+      borderStrokeWidth
+    ];
+    if (columnsChanged || !listEquals(_circlesKey, key)) {
+      _circlesKey = key;
+      _circles = _buildCircles(
+          palette, radius, useRadiusInMeter, borderColor, borderStrokeWidth);
+    }
+
+    return CircleLayer(circles: _circles);
+  }
+
+  List<CircleMarker> _buildCircles(List<Color> palette, double radius,
+      bool useRadiusInMeter, Color borderColor, double borderStrokeWidth) {
+    Color paletteColor(Float32List? indices, int i, Color fallback) {
+      if (indices == null || i >= indices.length) return fallback;
+      var index = indices[i].toInt();
+      return index >= 0 && index < palette.length ? palette[index] : fallback;
+    }
+
+    double value(Float32List? values, int i, double fallback) =>
+        values != null && i < values.length ? values[i] : fallback;
+
+    return List.generate(_points.length, (i) {
+      return CircleMarker(
+          point: _points[i],
+          radius: value(_radii, i, radius),
+          useRadiusInMeter: _meterFlags != null && i < _meterFlags!.length
+              ? _meterFlags![i] != 0
+              : useRadiusInMeter,
+          color: paletteColor(_colorIndices, i, palette.first),
+          borderColor: paletteColor(_borderColorIndices, i, borderColor),
+          borderStrokeWidth:
+              value(_borderStrokeWidths, i, borderStrokeWidth));
+    }, growable: false);
+  }
+}
+
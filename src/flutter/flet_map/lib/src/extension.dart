@@ -2,12 +2,14 @@ import 'package:flet/flet.dart';
 import 'package:flutter/cupertino.dart';
 
 import 'circle_layer.dart';
+import 'columnar_circle_layer.dart';
 import 'map.dart';
 import 'marker_layer.dart';
 import 'polygon_layer.dart';
 import 'polyline_layer.dart';
 import 'rich_attribution.dart';
 import 'simple_attribution.dart';
+import 'symbol_layer.dart';
 import 'tile_layer.dart';
 
 class Extension extends FletExtension {
@@ -23,13 +25,18 @@ class Extension extends FletExtension {
       case "TileLayer":
         return TileLayerControl(key: key, control: control);
       case "MarkerLayer":
+      case "ClusteredMarkerLayer":
         return MarkerLayerControl(key: key, control: control);
       case "CircleLayer":
         return CircleLayerControl(key: key, control: control);
+      case "ColumnarCircleLayer":
+        return ColumnarCircleLayerControl(key: key, control: control);
       case "PolygonLayer":
         return PolygonLayerControl(key: key, control: control);
       case "PolylineLayer":
         return PolylineLayerControl(key: key, control: control);
+      case "SymbolLayer":
+        return SymbolLayerControl(key: key, control: control);
       default:
         return null;
     }
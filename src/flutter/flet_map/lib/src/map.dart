@@ -1,8 +1,13 @@
+import 'dart:async';
+
 import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 import 'package:flutter_map/flutter_map.dart';
 import 'package:flutter_map_animations/flutter_map_animations.dart';
 
+import 'utils/camera.dart';
+import 'utils/camera_link.dart';
+import 'utils/events.dart';
 import 'utils/map.dart';
 
 class MapControl extends StatefulWidget {
@@ -17,15 +22,38 @@ class MapControl extends StatefulWidget {
 class _MapControlState extends State<MapControl>
     with FletStoreMixin, TickerProviderStateMixin {
   late final _animatedMapController = AnimatedMapController(vsync: this);
+  final _positionChangeThrottle = MapEventThrottle();
+  final _eventThrottle = MapEventThrottle();
+  final _hoverThrottle = MapEventThrottle();
+  late final _cameraLink = CameraLink(_animatedMapController.mapController);
+  StreamSubscription<MapEvent>? _mapEventSubscription;
 
   @override
   void initState() {
     super.initState();
     widget.control.addInvokeMethodListener(_invokeMethod);
+    _mapEventSubscription = _animatedMapController.mapController.mapEventStream
+        .listen(_cameraLink.handleEvent);
   }
 
   Future<dynamic> _invokeMethod(String name, dynamic args) async {
     debugPrint("Map.$name($args)");
+    switch (name) {
+      case "get_camera":
+        return _animatedMapController.mapController.camera.toMap();
+      case "batch":
+        for (var operation in args["operations"]) {
+          await _runCameraOperation(
+              operation["name"], operation["arguments"] ?? {});
+        }
+        break;
+      default:
+        await _runCameraOperation(name, args);
+    }
+  }
+
+  /// Runs the camera operation [name], completing when its animation does.
+  Future<void> _runCameraOperation(String name, dynamic args) async {
     var defaultAnimationCurve =
         widget.control.getCurve("animation_curve", Curves.fastOutSlowIn);
     var defaultAnimationDuration = widget.control
@@ -101,6 +129,17 @@ class _MapControlState extends State<MapControl>
           );
         }
         break;
+      case "fit_camera":
+        var cameraFit = parseCameraFit(args["fit"]);
+        if (cameraFit != null) {
+          await _animatedMapController.animatedFitCamera(
+            cameraFit: cameraFit,
+            curve: animationCurve,
+            duration: animationDuration,
+            cancelPreviousAnimations: cancelPreviousAnimations,
+          );
+        }
+        break;
       default:
         throw Exception("Unknown Map method: $name");
     }
@@ -108,7 +147,12 @@ class _MapControlState extends State<MapControl>
 
   @override
   void dispose() {
+    _mapEventSubscription?.cancel();
+    _cameraLink.dispose();
     _animatedMapController.dispose();
+    _positionChangeThrottle.dispose();
+    _eventThrottle.dispose();
+    _hoverThrottle.dispose();
     widget.control.removeInvokeMethodListener(_invokeMethod);
     super.dispose();
   }
@@ -117,10 +161,34 @@ class _MapControlState extends State<MapControl>
   Widget build(BuildContext context) {
     debugPrint("Map build: ${widget.control.id} (${widget.control.hashCode})");
 
+    var positionChangeThrottle = widget.control.get("position_change_throttle");
+    var eventThrottle = widget.control.get("event_throttle");
+    _positionChangeThrottle.configure(positionChangeThrottle);
+    _eventThrottle.configure(eventThrottle);
+    var hoverInterval = widget.control.get("hover_interval");
+    _hoverThrottle.configure({"interval": hoverInterval});
+    var cameraLinkGroup = widget.control.getString("camera_link_group");
+    // joined once rendered, as the other maps of the group can then move it
+    WidgetsBinding.instance.addPostFrameCallback((_) {
+      if (mounted) _cameraLink.group = cameraLinkGroup;
+    });
+
     Widget map = FlutterMap(
       mapController: _animatedMapController.mapController,
-      options: parseConfiguration(widget.control, context, const MapOptions())!,
-      children: widget.control.buildWidgets("layers"),
+      options: parseConfiguration(
+          widget.control,
+          context,
+          const MapOptions(),
+          positionChangeThrottle != null ? _positionChangeThrottle : null,
+          eventThrottle != null ? _eventThrottle : null,
+          hoverInterval != null ? _hoverThrottle : null)!,
+      children: widget.control
+          .children("layers")
+          .map((layer) => LayerCameraListener(
+              key: ValueKey(layer.id),
+              control: layer,
+              child: ControlWidget(control: layer)))
+          .toList(),
     );
 
     return ConstrainedControl(control: widget.control, child: map);
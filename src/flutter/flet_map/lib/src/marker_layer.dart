@@ -2,37 +2,251 @@ import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 import 'package:flutter/widgets.dart';
 import 'package:flutter_map_animations/flutter_map_animations.dart';
+import 'package:latlong2/latlong.dart';
 
+import 'utils/filter.dart';
 import 'utils/map.dart';
 
-class MarkerLayerControl extends StatelessWidget with FletStoreMixin {
+class MarkerLayerControl extends StatefulWidget {
   final Control control;
 
   const MarkerLayerControl({super.key, required this.control});
 
+  @override
+  State<MarkerLayerControl> createState() => _MarkerLayerControlState();
+}
+
+class _MarkerLayerControlState extends State<MarkerLayerControl>
+    with FletStoreMixin, TickerProviderStateMixin {
+  /// The markers built by the previous builds, by marker key.
+  final Map<Object, _CachedMarker> _markers = {};
+
+  /// The markers moved by `move_markers`, by marker key.
+  final Map<Object, _MarkerMove> _moves = {};
+
+  final _filter = LayerFeatureFilter();
+
+  @override
+  void initState() {
+    super.initState();
+    widget.control.addInvokeMethodListener(_invokeMethod);
+  }
+
+  @override
+  void dispose() {
+    widget.control.removeInvokeMethodListener(_invokeMethod);
+    for (var movement in _moves.values.map((m) => m.movement).toSet()) {
+      movement?.controller.dispose();
+    }
+    super.dispose();
+  }
+
+  Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    debugPrint("MarkerLayer.$name($args)");
+    switch (name) {
+      case "move_markers":
+        _moveMarkers(
+            args["keys"],
+            parseLatLngList(args["coordinates"], [])!,
+            parseDuration(args["duration"], const Duration(milliseconds: 500))!,
+            parseCurve(args["curve"], Curves.linear)!);
+        break;
+      case "set_filter":
+        _filter.set(widget.control, args);
+        setState(() {});
+        break;
+      default:
+        throw Exception("Unknown MarkerLayer method: $name");
+    }
+  }
+
+  /// Starts moving the markers with the given [keys] to [points], from their
+  /// current position.
+  void _moveMarkers(
+      List keys, List<LatLng> points, Duration duration, Curve curve) {
+    var controls = {
+      for (var marker in widget.control.children("markers"))
+        _keyOf(marker): marker
+    };
+    // a single controller drives all the markers moved together
+    var movement = _Movement(
+        AnimationController(vsync: this, duration: duration), curve);
+    for (var i = 0; i < keys.length && i < points.length; i++) {
+      var key = keys[i];
+      var control = controls[key];
+      if (control == null) continue;
+      var from = _markers[key]?.marker.point ??
+          parseLatLng(control.get("coordinates"))!;
+      var previous = _moves[key];
+      // the control holds the coordinates as set on the Python side, where
+      // the move is not sent again, so that they are kept if the layer is
+      // built again from its properties
+      var coordinates = {
+        "latitude": points[i].latitude,
+        "longitude": points[i].longitude
+      };
+      control.updateProperties({"coordinates": coordinates}, python: false);
+      _moves[key] = _MarkerMove(from, points[i], coordinates, movement);
+      movement.markerCount++;
+      if (previous != null) _release(previous.movement);
+    }
+    var controller = movement.controller;
+    if (movement.markerCount == 0) {
+      controller.dispose();
+      return;
+    }
+    controller
+      ..addListener(() => setState(() {}))
+      ..addStatusListener((status) {
+        if (status == AnimationStatus.completed) {
+          _moves.updateAll((key, move) =>
+              identical(move.movement, movement) ? move.completed() : move);
+          controller.dispose();
+        }
+      })
+      ..forward();
+  }
+
+  /// Releases [movement] from one of its markers, stopping it once it no
+  /// longer moves any marker.
+  void _release(_Movement? movement) {
+    if (movement != null && --movement.markerCount == 0) {
+      movement.controller.dispose();
+    }
+  }
+
+  /// Returns the position of the marker [key] whose `coordinates` are
+  /// [coordinates]: the one it is moved to by `move_markers`, if any.
+  LatLng _pointOf(Object key, dynamic coordinates) {
+    var point = parseLatLng(coordinates)!;
+    var move = _moves[key];
+    if (move == null) return point;
+    // the marker was moved from Python since: its coordinates prevail
+    if (!identical(move.coordinates, coordinates) && point != move.to) {
+      _moves.remove(key);
+      _release(move.movement);
+      return point;
+    }
+    return move.point;
+  }
+
+  /// Returns the key of `marker`: its `key` if set, else its control id.
+  Object _keyOf(Control marker) {
+    var key = marker.get("key");
+    if (key is Map) key = key["value"];
+    return key ?? marker.id;
+  }
+
+  /// Returns the marker of `marker`, reusing the previous one (and its content
+  /// widget) if its properties did not change.
+  AnimatedMarker _markerOf(Control marker, Object key) {
+    var content = marker.get("content");
+    var properties = (
+      _pointOf(key, marker.get("coordinates")),
+      marker.getBool("rotate"),
+      marker.getDouble("height", 30.0)!,
+      marker.getDouble("width", 30.0)!,
+      marker.getAlignment("alignment"),
+    );
+    var cached = _markers[key];
+    if (cached != null &&
+        cached.properties == properties &&
+        identical(cached.content, content)) {
+      return cached.marker;
+    }
+
+    // the same content widget is returned on every build, so that it is
+    // only rebuilt when its own control changes
+    var contentWidget =
+        cached != null && identical(cached.content, content)
+            ? cached.contentWidget
+            : marker.buildWidget("content") ??
+                const ErrorControl("content must be provided and visible");
+    var (point, rotate, height, width, alignment) = properties;
+    var animatedMarker = AnimatedMarker(
+        point: point,
+        rotate: rotate,
+        height: height,
+        width: width,
+        alignment: alignment,
+        builder: (BuildContext context, Animation<double> animation) =>
+            contentWidget);
+    _markers[key] =
+        _CachedMarker(properties, content, contentWidget, animatedMarker);
+    return animatedMarker;
+  }
+
   @override
   Widget build(BuildContext context) {
-    debugPrint("MarkerLayerControl build: ${control.id}");
-    var markers = control
+    debugPrint("MarkerLayerControl build: ${widget.control.id}");
+    var children = widget.control
         .children("markers")
         .where((c) => c.type == "Marker")
-        .map((marker) {
-      return AnimatedMarker(
-          point: parseLatLng(marker.get("coordinates"))!,
-          rotate: marker.getBool("rotate"),
-          height: marker.getDouble("height", 30.0)!,
-          width: marker.getDouble("width", 30.0)!,
-          alignment: marker.getAlignment("alignment"),
-          builder: (BuildContext context, Animation<double> animation) {
-            return marker.buildWidget("content") ??
-                const ErrorControl("content must be provided and visible");
-          });
-    }).toList();
+        .toList();
+    // the markers hidden by the filter are kept in the cache, along with their
+    // content widget, until they are removed
+    var keys = children.map(_keyOf).toSet();
+    var markers = _filter
+        .apply(widget.control, children)
+        .map((marker) => _markerOf(marker, _keyOf(marker)))
+        .toList();
+    _markers.removeWhere((key, _) => !keys.contains(key));
+    _moves.removeWhere((key, move) {
+      if (keys.contains(key)) return false;
+      _release(move.movement);
+      return true;
+    });
 
     return AnimatedMarkerLayer(
       markers: markers,
-      rotate: control.getBool("rotate", false)!,
-      alignment: control.getAlignment("alignment", Alignment.center)!,
+      rotate: widget.control.getBool("rotate", false)!,
+      alignment: widget.control.getAlignment("alignment", Alignment.center)!,
     );
   }
 }
+
+/// A marker built from a `Marker` control, along with the properties
+/// it was built from.
+class _CachedMarker {
+  final Object properties;
+  final Object? content;
+  final Widget contentWidget;
+  final AnimatedMarker marker;
+
+  _CachedMarker(
+      this.properties, this.content, this.contentWidget, this.marker);
+}
+
+/// The markers moved together by a `move_markers` call.
+class _Movement {
+  final AnimationController controller;
+  final Animation<double> animation;
+
+  /// The number of markers still moved by this movement.
+  int markerCount = 0;
+
+  _Movement(this.controller, Curve curve)
+      : animation = CurvedAnimation(parent: controller, curve: curve);
+}
+
+/// The movement of a marker by `move_markers`.
+class _MarkerMove {
+  final LatLng from;
+  final LatLng to;
+
+  /// The `coordinates` the marker control was given by the movement.
+  final Object? coordinates;
+
+  /// The movement driving this one, or `null` once completed.
+  final _Movement? movement;
+
+  _MarkerMove(this.from, this.to, this.coordinates, this.movement);
+
+  LatLng get point {
+    var t = movement?.animation.value ?? 1.0;
+    return LatLng(from.latitude + (to.latitude - from.latitude) * t,
+        from.longitude + (to.longitude - from.longitude) * t);
+  }
+
+  _MarkerMove completed() => _MarkerMove(to, to, coordinates, null);
+}
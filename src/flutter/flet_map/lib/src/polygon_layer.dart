@@ -1,48 +1,178 @@
+import 'package:collection/collection.dart';
 import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 import 'package:flutter_map/flutter_map.dart';
+import 'package:latlong2/latlong.dart';
 
+import 'utils/filter.dart';
+import 'utils/hit.dart';
 import 'utils/map.dart';
+import 'utils/styles.dart';
 
-class PolygonLayerControl extends StatelessWidget with FletStoreMixin {
+class PolygonLayerControl extends StatefulWidget {
   final Control control;
 
   const PolygonLayerControl({super.key, required this.control});
 
+  @override
+  State<PolygonLayerControl> createState() => _PolygonLayerControlState();
+}
+
+class _PolygonLayerControlState extends State<PolygonLayerControl>
+    with FletStoreMixin {
+  final _filter = LayerFeatureFilter();
+
+  /// The parsed points of the polygons, along with the `coordinates` value
+  /// they were parsed from, by control id.
+  final Map<int, (Object?, List<LatLng>)> _points = {};
+
+  /// The polygons built by the previous builds, along with the properties
+  /// they were built from, by control id.
+  final Map<int, (Object, Polygon<int>)> _polygons = {};
+
+  /// The polygons passed to the `PolygonLayer` by the previous build.
+  List<Polygon<int>> _lastPolygons = const [];
+
+  /// The `styles` of the layer, and the styles parsed from them.
+  (Object?, ThemeData?, Map<String, FeatureStyle>) _styles = (null, null, {});
+
+  @override
+  void initState() {
+    super.initState();
+    widget.control.addInvokeMethodListener(_invokeMethod);
+  }
+
+  @override
+  void dispose() {
+    widget.control.removeInvokeMethodListener(_invokeMethod);
+    super.dispose();
+  }
+
+  Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    debugPrint("PolygonLayer.$name($args)");
+    switch (name) {
+      case "update_feature_styles":
+        updateFeatureStyles(args, widget.control.children("polygons"));
+        setState(() {});
+        break;
+      case "set_filter":
+        _filter.set(widget.control, args);
+        setState(() {});
+        break;
+      default:
+        throw Exception("Unknown PolygonLayer method: $name");
+    }
+  }
+
+  /// Returns the parsed points of [polygon], re-parsing its `coordinates`
+  /// only when they changed, so that restyled polygons keep the same points.
+  List<LatLng> _pointsOf(Control polygon) {
+    var coordinates = polygon.get("coordinates");
+    var cached = _points[polygon.id];
+    if (cached == null || !identical(cached.$1, coordinates)) {
+      cached = (coordinates, parseLatLngList(coordinates, [])!);
+      _points[polygon.id] = cached;
+    }
+    return cached.$2;
+  }
+
+  /// Returns the parsed `styles` of the layer, parsed again only when they
+  /// or [theme] changed, so that unchanged polygons keep the same style.
+  Map<String, FeatureStyle> _stylesOf(Control control, ThemeData theme) {
+    var value = control.get("styles");
+    var (cachedValue, cachedTheme, styles) = _styles;
+    if (!identical(value, cachedValue) || !identical(theme, cachedTheme)) {
+      styles = parseFeatureStyles(value, theme);
+      _styles = (value, theme, styles);
+    }
+    return styles;
+  }
+
+  /// Returns the polygon of [polygon], reusing the previous one if its
+  /// properties, style and points did not change.
+  Polygon<int> _polygonOf(
+      Control polygon, Map<String, FeatureStyle> styles, ThemeData theme) {
+    var style = styles[polygon.get("style")];
+    var points = _pointsOf(polygon);
+    var properties = (
+      theme,
+      style,
+      polygon.get("border_color"),
+      polygon.get("color"),
+      polygon.get("border_stroke_width"),
+      polygon.get("disable_holes_border"),
+      polygon.get("rotate_label"),
+      polygon.get("label"),
+      polygon.get("label_text_style"),
+      polygon.get("stroke_cap"),
+      polygon.get("stroke_join"),
+      points,
+    );
+    var cached = _polygons[polygon.id];
+    if (cached != null && cached.$1 == properties) return cached.$2;
+
+    var result = Polygon<int>(
+        hitValue: polygon.id,
+        borderStrokeWidth: style?.borderStrokeWidth ??
+            polygon.getDouble("border_stroke_width", 0)!,
+        borderColor: style?.borderColor ??
+            parseColor(polygon.get("border_color"), theme, Colors.green)!,
+        color: style?.color ??
+            parseColor(polygon.get("color"), theme, Colors.green)!,
+        disableHolesBorder: polygon.getBool("disable_holes_border", false)!,
+        rotateLabel: polygon.getBool("rotate_label", false)!,
+        label: polygon.getString("label"),
+        labelStyle: style?.labelTextStyle ??
+            polygon.getTextStyle("label_text_style", theme, const TextStyle())!,
+        strokeCap: style?.strokeCap ??
+            polygon.getStrokeCap("stroke_cap", StrokeCap.round)!,
+        strokeJoin: style?.strokeJoin ??
+            polygon.getStrokeJoin("stroke_join", StrokeJoin.round)!,
+        points: points);
+    _polygons[polygon.id] = (properties, result);
+    return result;
+  }
+
   @override
   Widget build(BuildContext context) {
+    var control = widget.control;
     debugPrint("PolygonLayerControl build: ${control.id}");
 
-    var polygons = control
+    var theme = Theme.of(context);
+    var styles = _stylesOf(control, theme);
+    var children = control
         .children("polygons")
         .where((c) => c.type == "PolygonMarker")
-        .map((polygon) {
-      return Polygon(
-          borderStrokeWidth: polygon.getDouble("border_stroke_width", 0)!,
-          borderColor: polygon.getColor("border_color", context, Colors.green)!,
-          color: polygon.getColor("color", context, Colors.green)!,
-          disableHolesBorder: polygon.getBool("disable_holes_border", false)!,
-          rotateLabel: polygon.getBool("rotate_label", false)!,
-          label: polygon.getString("label"),
-          labelStyle: polygon.getTextStyle(
-              "label_text_style", Theme.of(context), const TextStyle())!,
-          strokeCap: polygon.getStrokeCap("stroke_cap", StrokeCap.round)!,
-          strokeJoin: polygon.getStrokeJoin("stroke_join", StrokeJoin.round)!,
-          points: polygon
-              .get("coordinates", [])!
-              .map((c) => parseLatLng(c))
-              .nonNulls
-              .toList());
-    }).toList();
-
-    return PolygonLayer(
-      polygons: polygons,
-      polygonCulling: control.getBool("polygon_culling", true)!,
-      polygonLabels: control.getBool("polygon_labels", true)!,
-      drawLabelsLast: control.getBool("draw_labels_last", false)!,
-      simplificationTolerance:
-          control.getDouble("simplification_tolerance", 0.3)!,
-      useAltRendering: control.getBool("use_alternative_rendering", false)!,
+        .toList();
+    var ids = children.map((c) => c.id).toSet();
+    _points.removeWhere((id, _) => !ids.contains(id));
+    _polygons.removeWhere((id, _) => !ids.contains(id));
+
+    var polygons = _filter
+        .apply(control, children)
+        .map((polygon) => _polygonOf(polygon, styles, theme))
+        .toList();
+    // flutter_map re-projects all the polygons when given a new list: the
+    // previous one is passed again if none of its polygons changed
+    if (const ListEquality<Polygon<int>>(IdentityEquality())
+        .equals(polygons, _lastPolygons)) {
+      polygons = _lastPolygons;
+    } else {
+      _lastPolygons = polygons;
+    }
+
+    return FeatureHitDetector(
+      control: control,
+      builder: (hitNotifier) => PolygonLayer<int>(
+        polygons: polygons,
+        hitNotifier: hitNotifier,
+        polygonCulling: control.getBool("polygon_culling", true)!,
+        polygonLabels: control.getBool("polygon_labels", true)!,
+        drawLabelsLast: control.getBool("draw_labels_last", false)!,
+        simplificationTolerance:
+            control.getDouble("simplification_tolerance", 0.3)!,
+        useAltRendering: control.getBool("use_alternative_rendering", false)!,
+      ),
     );
   }
 }
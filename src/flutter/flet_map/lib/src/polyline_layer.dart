@@ -1,57 +1,227 @@
+import 'dart:math';
+import 'dart:typed_data';
+
 import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 import 'package:flutter_map/flutter_map.dart';
+import 'package:latlong2/latlong.dart';
 
+import 'utils/filter.dart';
+import 'utils/hit.dart';
 import 'utils/map.dart';
+import 'utils/styles.dart';
 
-class PolylineLayerControl extends StatelessWidget with FletStoreMixin {
+class PolylineLayerControl extends StatefulWidget {
   final Control control;
 
   const PolylineLayerControl({super.key, required this.control});
 
+  @override
+  State<PolylineLayerControl> createState() => _PolylineLayerControlState();
+}
+
+class _PolylineLayerControlState extends State<PolylineLayerControl>
+    with FletStoreMixin {
+  final Map<int, _PolylinePoints> _points = {};
+  final Map<int, (Control, Future<dynamic> Function(String, dynamic))>
+      _listeners = {};
+  final _filter = LayerFeatureFilter();
+
+  @override
+  void initState() {
+    super.initState();
+    widget.control.addInvokeMethodListener(_invokeLayerMethod);
+  }
+
+  @override
+  void dispose() {
+    widget.control.removeInvokeMethodListener(_invokeLayerMethod);
+    for (var (polyline, listener) in _listeners.values) {
+      polyline.removeInvokeMethodListener(listener);
+    }
+    _listeners.clear();
+    super.dispose();
+  }
+
+  /// Subscribes to `append_points`/`trim_head` calls of the current polylines.
+  void _syncListeners(List<Control> polylines) {
+    var ids = polylines.map((p) => p.id).toSet();
+    _listeners.removeWhere((id, entry) {
+      if (ids.contains(id)) return false;
+      entry.$1.removeInvokeMethodListener(entry.$2);
+      return true;
+    });
+    _points.removeWhere((id, _) => !ids.contains(id));
+    for (var polyline in polylines) {
+      _listeners.putIfAbsent(polyline.id, () {
+        Future<dynamic> listener(String name, dynamic args) =>
+            _invokeMethod(polyline, name, args);
+        polyline.addInvokeMethodListener(listener);
+        return (polyline, listener);
+      });
+    }
+  }
+
+  /// Returns the parsed points of `polyline`, re-parsing its `coordinates`
+  /// only when they were changed from Python.
+  List<LatLng> _pointsOf(Control polyline) {
+    var coordinates = polyline.get("coordinates");
+    var source = coordinates is Map ? coordinates["data"] : coordinates;
+    var sourceLength = source is List ? source.length : 0;
+    var cached = _points[polyline.id];
+    if (cached == null ||
+        !identical(cached.source, source) ||
+        cached.sourceLength != sourceLength) {
+      cached = _PolylinePoints(
+          source, sourceLength, parseLatLngList(coordinates, [])!);
+      _points[polyline.id] = cached;
+    }
+    return cached.points;
+  }
+
+  Future<dynamic> _invokeLayerMethod(String name, dynamic args) async {
+    debugPrint("PolylineLayer.$name($args)");
+    switch (name) {
+      case "update_feature_styles":
+        updateFeatureStyles(args, widget.control.children("polylines"));
+        setState(() {});
+        break;
+      case "set_filter":
+        _filter.set(widget.control, args);
+        setState(() {});
+        break;
+      default:
+        throw Exception("Unknown PolylineLayer method: $name");
+    }
+  }
+
+  Future<dynamic> _invokeMethod(
+      Control polyline, String name, dynamic args) async {
+    debugPrint("PolylineMarker.$name($args)");
+    var points = _pointsOf(polyline);
+    var coordinates = polyline.get("coordinates");
+    switch (name) {
+      case "append_points":
+        var added = parseLatLngList(args["points"], [])!;
+        var previous = points.lastOrNull;
+        // a new list is used, so that flutter_map re-projects the polyline
+        points = [...points, ...added];
+        if (coordinates is List) {
+          coordinates = [
+            ...coordinates,
+            for (var point in added)
+              {"latitude": point.latitude, "longitude": point.longitude}
+          ];
+        } else if (coordinates is Map) {
+          var data = coordinates["data"];
+          var precision = parseInt(coordinates["precision"]);
+          coordinates = {
+            ...coordinates,
+            "data": Uint8List.fromList([
+              ...(data is List<int> ? data : const <int>[]),
+              ...(precision != null
+                  ? encodeLatLngs(added, precision, previous)
+                  : packLatLngs(added))
+            ])
+          };
+        }
+        break;
+      case "trim_head":
+        var count = min(parseInt(args["count"], 0)!, points.length);
+        points = points.sublist(count);
+        if (coordinates is List) {
+          coordinates = coordinates.sublist(min(count, coordinates.length));
+        } else if (coordinates is Map) {
+          var precision = parseInt(coordinates["precision"]);
+          coordinates = {
+            ...coordinates,
+            "data": precision != null
+                ? encodeLatLngs(points, precision)
+                : packLatLngs(points)
+          };
+        }
+        break;
+      default:
+        throw Exception("Unknown PolylineMarker method: $name");
+    }
+    // the control holds the coordinates as updated on the Python side, where
+    // the deltas are not sent again, so that they are not lost if the layer
+    // is built again from its properties, and later patches still apply
+    polyline.updateProperties({"coordinates": coordinates}, python: false);
+    var source = coordinates is Map ? coordinates["data"] : coordinates;
+    _points[polyline.id] = _PolylinePoints(
+        source, source is List ? source.length : 0, points);
+    setState(() {});
+  }
+
   @override
   Widget build(BuildContext context) {
-    debugPrint("PolylineLayerControl build: ${control.id}");
-
-    var polylines = control
-        .children("polygons")
-        .where((c) => c.type == "PolygonMarker")
-        .map((polyline) {
-      return Polyline(
-          borderStrokeWidth: polyline.getDouble("border_stroke_width", 0)!,
-          borderColor:
-              polyline.getColor("border_color", context, Colors.yellow)!,
-          color: polyline.getColor("color", context, Colors.yellow)!,
-          pattern: parseStrokePattern(
-              polyline.get("stroke_pattern"), const StrokePattern.solid())!,
-          strokeCap: polyline.getStrokeCap("stroke_cap", StrokeCap.round)!,
-          strokeJoin: polyline.getStrokeJoin("stroke_join", StrokeJoin.round)!,
-          strokeWidth: polyline.getDouble("stroke_width", 1.0)!,
-          useStrokeWidthInMeter:
+    debugPrint("PolylineLayerControl build: ${widget.control.id}");
+
+    var children = widget.control
+        .children("polylines")
+        .where((c) => c.type == "PolylineMarker")
+        .toList();
+    _syncListeners(children);
+
+    var theme = Theme.of(context);
+    var styles = parseFeatureStyles(widget.control.get("styles"), theme);
+    var polylines = _filter.apply(widget.control, children).map((polyline) {
+      var style = styles[polyline.get("style")];
+      return Polyline<int>(
+          hitValue: polyline.id,
+          borderStrokeWidth: style?.borderStrokeWidth ??
+              polyline.getDouble("border_stroke_width", 0)!,
+          borderColor: style?.borderColor ??
+              parseColor(polyline.get("border_color"), theme, Colors.yellow)!,
+          color: style?.color ??
+              parseColor(polyline.get("color"), theme, Colors.yellow)!,
+          pattern: style?.strokePattern ??
+              parseStrokePattern(polyline.get("stroke_pattern"),
+                  const StrokePattern.solid())!,
+          strokeCap: style?.strokeCap ??
+              polyline.getStrokeCap("stroke_cap", StrokeCap.round)!,
+          strokeJoin: style?.strokeJoin ??
+              polyline.getStrokeJoin("stroke_join", StrokeJoin.round)!,
+          strokeWidth: style?.strokeWidth ??
+              polyline.getDouble("stroke_width", 1.0)!,
+          useStrokeWidthInMeter: style?.useStrokeWidthInMeter ??
               polyline.getBool("use_stroke_width_in_meter", false)!,
-          colorsStop: polyline
-              .get("colors_stop", [])!
-              .map((e) => parseDouble(e))
-              .nonNulls
-              .toList(),
-          gradientColors: polyline
-              .get("gradient_colors", [])!
-              .map((e) => parseColor(e, Theme.of(context)))
-              .nonNulls
-              .toList(),
-          points: polyline
-              .get("coordinates", [])!
-              .map((c) => parseLatLng(c))
-              .nonNulls
-              .toList());
+          colorsStop: style?.colorsStop ??
+              polyline
+                  .get("colors_stop", [])!
+                  .map((e) => parseDouble(e))
+                  .nonNulls
+                  .toList(),
+          gradientColors: style?.gradientColors ??
+              polyline
+                  .get("gradient_colors", [])!
+                  .map((e) => parseColor(e, theme))
+                  .nonNulls
+                  .toList(),
+          points: _pointsOf(polyline));
     }).toList();
 
-    return PolylineLayer(
-      polylines: polylines,
-      cullingMargin: control.getDouble("culling_margin", 10.0)!,
-      minimumHitbox: control.getDouble("min_hittable_radius", 10.0)!,
-      simplificationTolerance:
-          control.getDouble("simplification_tolerance", 0.3)!,
+    return FeatureHitDetector(
+      control: widget.control,
+      builder: (hitNotifier) => PolylineLayer<int>(
+        polylines: polylines,
+        hitNotifier: hitNotifier,
+        cullingMargin: widget.control.getDouble("culling_margin", 10.0)!,
+        minimumHitbox: widget.control.getDouble("min_hittable_radius", 10.0)!,
+        simplificationTolerance:
+            widget.control.getDouble("simplification_tolerance", 0.3)!,
+      ),
     );
   }
 }
+
+/// Parsed points of a polyline, along with the `coordinates` value
+/// they were parsed from.
+class _PolylinePoints {
+  final Object? source;
+  final int sourceLength;
+  final List<LatLng> points;
+
+  _PolylinePoints(this.source, this.sourceLength, this.points);
+}
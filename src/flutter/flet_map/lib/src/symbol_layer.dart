@@ -0,0 +1,231 @@
+import 'dart:math';
+import 'dart:typed_data';
+
+import 'package:collection/collection.dart';
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter_map/flutter_map.dart';
+import 'package:latlong2/latlong.dart';
+
+import 'utils/map.dart';
+
+class SymbolLayerControl extends StatefulWidget {
+  final Control control;
+
+  const SymbolLayerControl({super.key, required this.control});
+
+  @override
+  State<SymbolLayerControl> createState() => _SymbolLayerControlState();
+}
+
+class _SymbolLayerControlState extends State<SymbolLayerControl> {
+  final Map<String, (Object?, Object?)> _columns = {};
+  List<LatLng> _points = const [];
+  Float32List? _sizes;
+  Float32List? _colorIndices;
+  Float32List? _shapeIndices;
+  Float32List? _rotations;
+
+  /// Whether the packed value of [name] changed since it was last parsed.
+  bool _changed(String name) {
+    var value = widget.control.get(name);
+    var data = value is Map ? value["data"] : null;
+    var cached = _columns[name];
+    if (cached != null &&
+        identical(cached.$1, value) &&
+        identical(cached.$2, data)) {
+      return false;
+    }
+    _columns[name] = (value, data);
+    return true;
+  }
+
+  void _parse() {
+    var control = widget.control;
+    if (_changed("coordinates")) {
+      _points = parseLatLngList(control.get("coordinates"), const [])!;
+    }
+    if (_changed("sizes")) _sizes = parseNumberArray(control.get("sizes"));
+    if (_changed("color_indices")) {
+      _colorIndices = parseNumberArray(control.get("color_indices"));
+    }
+    if (_changed("shape_indices")) {
+      _shapeIndices = parseNumberArray(control.get("shape_indices"));
+    }
+    if (_changed("rotations")) {
+      _rotations = parseNumberArray(control.get("rotations"));
+    }
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    debugPrint("SymbolLayerControl build: ${widget.control.id}");
+    _parse();
+
+    var control = widget.control;
+    var theme = Theme.of(context);
+    var palette = control
+        .get("palette", [])!
+        .map((c) => parseColor(c, theme))
+        .nonNulls
+        .toList();
+    var shapes = control
+        .get("shapes", [])!
+        .map((s) => _SymbolShape.values.firstWhereOrNull((e) => e.name == s))
+        .nonNulls
+        .toList();
+
+    return MobileLayerTransformer(
+      child: CustomPaint(
+        size: Size.infinite,
+        willChange: true,
+        painter: _SymbolPainter(
+          camera: MapCamera.of(context),
+          points: _points,
+          size: control.getDouble("size", 8.0)!,
+          sizes: _sizes,
+          palette: palette.isEmpty ? const [Colors.blue] : palette,
+          colorIndices: _colorIndices,
+          shapes: shapes.isEmpty ? const [_SymbolShape.circle] : shapes,
+          shapeIndices: _shapeIndices,
+          rotations: _rotations,
+          borderColor: control.getColor("border_color", context),
+          borderWidth: control.getDouble("border_width", 0.0)!,
+        ),
+      ),
+    );
+  }
+}
+
+enum _SymbolShape { circle, square, triangle, diamond, cross, star }
+
+class _SymbolPainter extends CustomPainter {
+  final MapCamera camera;
+  final List<LatLng> points;
+  final double size;
+  final Float32List? sizes;
+  final List<Color> palette;
+  final Float32List? colorIndices;
+  final List<_SymbolShape> shapes;
+  final Float32List? shapeIndices;
+  final Float32List? rotations;
+  final Color? borderColor;
+  final double borderWidth;
+
+  _SymbolPainter({
+    required this.camera,
+    required this.points,
+    required this.size,
+    required this.sizes,
+    required this.palette,
+    required this.colorIndices,
+    required this.shapes,
+    required this.shapeIndices,
+    required this.rotations,
+    required this.borderColor,
+    required this.borderWidth,
+  });
+
+  @override
+  void paint(Canvas canvas, Size canvasSize) {
+    // all the symbols of a color are drawn with a single path
+    final paths = List<Path?>.filled(palette.length, null);
+    for (var i = 0; i < points.length; i++) {
+      final symbolSize = sizes?[i] ?? size;
+      final center = camera.getOffsetFromOrigin(points[i]);
+      if (center.dx < -symbolSize ||
+          center.dy < -symbolSize ||
+          center.dx > canvasSize.width + symbolSize ||
+          center.dy > canvasSize.height + symbolSize) {
+        continue;
+      }
+      final color = _index(colorIndices, i, palette.length);
+      final shape = shapes[_index(shapeIndices, i, shapes.length)];
+      final rotation = (rotations?[i] ?? 0) * pi / 180;
+      _addSymbol(paths[color] ??= Path(), shape, center, symbolSize / 2,
+          rotation);
+    }
+
+    final fill = Paint()..style = PaintingStyle.fill;
+    final border = borderColor != null && borderWidth > 0
+        ? (Paint()
+          ..style = PaintingStyle.stroke
+          ..strokeWidth = borderWidth
+          ..color = borderColor!)
+        : null;
+    for (var color = 0; color < paths.length; color++) {
+      final path = paths[color];
+      if (path == null) continue;
+      canvas.drawPath(path, fill..color = palette[color]);
+      if (border != null) canvas.drawPath(path, border);
+    }
+  }
+
+  static int _index(Float32List? indices, int i, int length) {
+    if (indices == null) return 0;
+    return indices[i].toInt().clamp(0, length - 1);
+  }
+
+  static void _addSymbol(Path path, _SymbolShape shape, Offset center,
+      double radius, double rotation) {
+    if (shape == _SymbolShape.circle) {
+      path.addOval(Rect.fromCircle(center: center, radius: radius));
+      return;
+    }
+    final vertices = _vertices[shape]!;
+    final c = cos(rotation), s = sin(rotation);
+    for (var i = 0; i < vertices.length; i++) {
+      final x = vertices[i].dx * radius, y = vertices[i].dy * radius;
+      final point = Offset(center.dx + x * c - y * s, center.dy + x * s + y * c);
+      if (i == 0) {
+        path.moveTo(point.dx, point.dy);
+      } else {
+        path.lineTo(point.dx, point.dy);
+      }
+    }
+    path.close();
+  }
+
+  /// The vertices of the polygonal shapes, in a unit circle.
+  static final Map<_SymbolShape, List<Offset>> _vertices = {
+    _SymbolShape.square: const [
+      Offset(-0.8, -0.8),
+      Offset(0.8, -0.8),
+      Offset(0.8, 0.8),
+      Offset(-0.8, 0.8),
+    ],
+    _SymbolShape.triangle: const [
+      Offset(0, -1),
+      Offset(0.866, 0.5),
+      Offset(-0.866, 0.5),
+    ],
+    _SymbolShape.diamond: const [
+      Offset(0, -1),
+      Offset(1, 0),
+      Offset(0, 1),
+      Offset(-1, 0),
+    ],
+    _SymbolShape.cross: const [
+      Offset(-0.3, -1),
+      Offset(0.3, -1),
+      Offset(0.3, -0.3),
+      Offset(1, -0.3),
+      Offset(1, 0.3),
+      Offset(0.3, 0.3),
+      Offset(0.3, 1),
+      Offset(-0.3, 1),
+      Offset(-0.3, 0.3),
+      Offset(-1, 0.3),
+      Offset(-1, -0.3),
+      Offset(-0.3, -0.3),
+    ],
+    _SymbolShape.star: List.generate(10, (i) {
+      final angle = -pi / 2 + i * pi / 5;
+      final r = i.isEven ? 1.0 : 0.4;
+      return Offset(r * cos(angle), r * sin(angle));
+    }),
+  };
+
+  @override
+  bool shouldRepaint(_SymbolPainter oldDelegate) => true;
+}
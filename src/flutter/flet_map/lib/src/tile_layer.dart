@@ -1,3 +1,5 @@
+import 'dart:async';
+
 import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 import 'package:flutter/widgets.dart';
@@ -5,14 +7,146 @@ import 'package:flutter_map/flutter_map.dart';
 import 'package:flutter_map_cancellable_tile_provider/flutter_map_cancellable_tile_provider.dart';
 
 import './utils/map.dart';
+import './utils/tile_cache.dart';
+import './utils/tile_requests.dart';
 
-class TileLayerControl extends StatelessWidget {
+class TileLayerControl extends StatefulWidget {
   final Control control;
 
   const TileLayerControl({super.key, required this.control});
 
+  @override
+  State<TileLayerControl> createState() => _TileLayerControlState();
+}
+
+class _TileLayerControlState extends State<TileLayerControl> {
+  TileProvider? _tileProvider;
+  TileLayer? _tileLayer;
+  (String, int, Duration?)? _cacheOptions;
+  (String, int)? _requestOptions;
+  final TileMetrics _metrics = TileMetrics();
+  Timer? _metricsTimer;
+  Duration? _metricsInterval;
+
+  @override
+  void initState() {
+    super.initState();
+    widget.control.addInvokeMethodListener(_invokeMethod);
+  }
+
+  @override
+  void didUpdateWidget(covariant TileLayerControl oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (oldWidget.control != widget.control) {
+      oldWidget.control.removeInvokeMethodListener(_invokeMethod);
+      widget.control.addInvokeMethodListener(_invokeMethod);
+    }
+  }
+
+  @override
+  void dispose() {
+    _metricsTimer?.cancel();
+    widget.control.removeInvokeMethodListener(_invokeMethod);
+    super.dispose();
+  }
+
+  /// Starts, restarts or stops sending `metrics` events, if needed.
+  void _updateMetricsTimer(bool enabled) {
+    var interval = enabled
+        ? widget.control
+            .getDuration("metrics_interval", const Duration(seconds: 5))!
+        : null;
+    if (interval == _metricsInterval) return;
+    _metricsInterval = interval;
+    _metricsTimer?.cancel();
+    _metricsTimer = null;
+    _metrics.take();
+    if (interval != null && interval > Duration.zero) {
+      _metricsTimer = Timer.periodic(interval, (_) {
+        if (!_metrics.isEmpty) {
+          widget.control.triggerEvent("metrics", _metrics.take());
+        }
+      });
+    }
+  }
+
+  Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    debugPrint("TileLayer.$name($args)");
+    var options = _cacheOptions;
+    switch (name) {
+      case "get_cache_stats":
+        return options != null ? await getTileCacheStats(options.$1) : null;
+      case "seed_cache":
+        var tileLayer = _tileLayer;
+        if (options == null || tileLayer == null) return null;
+        return await seedTileCache(
+            tileLayer.tileProvider,
+            tileLayer,
+            (args["ranges"] as List)
+                .map((r) => (r as List).map((v) => parseInt(v, 0)!).toList())
+                .toList(),
+            parseInt(args["max_concurrency"], 4)!,
+            (completed, total) => widget.control.triggerEvent("seed_progress",
+                {"completed_count": completed, "tile_count": total}));
+      case "clear_cache":
+        if (options != null) await clearTileCache(options.$1);
+        return null;
+      default:
+        throw Exception("Unknown TileLayer method: $name");
+    }
+  }
+
+  /// Returns the tile provider of the layer, which caches the tiles on disk
+  /// if `cache` is set and supported by the platform, limits concurrent
+  /// downloads if `max_concurrent_requests` is set, and measures tile loads
+  /// if `on_metrics` is set.
+  TileProvider _getTileProvider() {
+    var urlTemplate = widget.control.getString("url_template", "")!;
+    var cache = widget.control.get("cache");
+    (String, int, Duration?)? cacheOptions;
+    if (cache is Map) {
+      cacheOptions = (
+        cache["store_name"] ?? _defaultStoreName(urlTemplate),
+        parseInt(cache["max_size"], 200 * 1024 * 1024)!,
+        parseDuration(cache["max_age"]),
+      );
+    }
+    var maxConcurrentRequests = widget.control.getInt("max_concurrent_requests");
+    var requestOptions = maxConcurrentRequests != null
+        ? (urlTemplate, maxConcurrentRequests)
+        : null;
+    var metricsEnabled = widget.control.getBool("on_metrics", false)!;
+    _updateMetricsTimer(metricsEnabled);
+    if (_tileProvider == null ||
+        cacheOptions != _cacheOptions ||
+        requestOptions != _requestOptions ||
+        (metricsEnabled && _tileProvider is! ScheduledTileProvider)) {
+      _cacheOptions = cacheOptions;
+      _requestOptions = requestOptions;
+      var scheduler = requestOptions != null
+          ? TileRequestScheduler.of(requestOptions.$1, requestOptions.$2)
+          : null;
+      _tileProvider = (cacheOptions != null
+              ? createCachedTileProvider(
+                  storeName: cacheOptions.$1,
+                  maxSize: cacheOptions.$2,
+                  maxAge: cacheOptions.$3,
+                  scheduler: scheduler)
+              : null) ??
+          (scheduler != null || metricsEnabled
+              ? ScheduledNetworkTileProvider(scheduler: scheduler)
+              : CancellableNetworkTileProvider());
+    }
+    var tileProvider = _tileProvider!;
+    if (tileProvider is ScheduledTileProvider) {
+      tileProvider.metrics = metricsEnabled ? _metrics : null;
+    }
+    return tileProvider;
+  }
+
   @override
   Widget build(BuildContext context) {
+    var control = widget.control;
     debugPrint("TileLayerControl build: ${control.id}");
 
     var errorImageSrc = control.getString("errorImageSrc");
@@ -28,7 +162,7 @@ class TileLayerControl extends StatelessWidget {
         errorImage = NetworkImage(assetSrc.path);
       }
     }
-    Widget tileLayer = TileLayer(
+    var tileLayer = _tileLayer = TileLayer(
         urlTemplate: control.getString("url_template"),
         fallbackUrl: control.getString("fallback_url"),
         subdomains: control
@@ -36,7 +170,7 @@ class TileLayerControl extends StatelessWidget {
                 ?.map((e) => e.toString())
                 .toList() ??
             ['a', 'b', 'c'],
-        tileProvider: CancellableNetworkTileProvider(),
+        tileProvider: _getTileProvider(),
         tileDisplay: parseTileDisplay(
             control.get("display_mode"), const TileDisplay.fadeIn())!,
         tileDimension: control.getInt("tile_size", 256)!,
@@ -62,6 +196,22 @@ class TileLayerControl extends StatelessWidget {
         },
         additionalOptions: control.get("additional_options", {})!);
 
-    return ConstrainedControl(control: control, child: tileLayer);
+    var tileProvider = tileLayer.tileProvider;
+    return ConstrainedControl(
+        control: control,
+        child: tileProvider is ScheduledTileProvider &&
+                tileProvider.scheduler != null
+            ? TileCenterTracker(provider: tileProvider, child: tileLayer)
+            : tileLayer);
   }
 }
+
+/// Returns the name of the cache store of the tiles of [urlTemplate],
+/// e.g. `tile.openstreetmap.org_z_x_y.png`.
+String _defaultStoreName(String urlTemplate) {
+  var name = urlTemplate
+      .replaceFirst(RegExp(r"^[a-zA-Z]+://"), "")
+      .replaceAll(RegExp(r"[^a-zA-Z0-9.-]+"), "_")
+      .replaceAll(RegExp(r"^_+|_+$"), "");
+  return name.length > 100 ? name.substring(0, 100) : name;
+}
@@ -0,0 +1,84 @@
+import 'dart:async';
+
+import 'package:flet/flet.dart';
+import 'package:flutter/widgets.dart';
+import 'package:flutter_map/flutter_map.dart';
+
+import 'map.dart';
+
+/// The minimum interval between two `camera_change` events of a layer.
+const _cameraChangeInterval = Duration(milliseconds: 250);
+
+/// Sends the camera of the enclosing map to a layer `control`, as
+/// throttled `camera_change` events.
+///
+/// Events are sent when the layer has an `on_camera_change` handler, or when
+/// it relies on the camera to decide what to send to the client
+/// (`_internals.track_camera`). The last camera of a burst is always sent.
+class LayerCameraListener extends StatefulWidget {
+  final Control control;
+  final Widget child;
+
+  const LayerCameraListener(
+      {super.key, required this.control, required this.child});
+
+  @override
+  State<LayerCameraListener> createState() => _LayerCameraListenerState();
+}
+
+class _LayerCameraListenerState extends State<LayerCameraListener> {
+  MapCamera? _sentCamera;
+  MapCamera? _pendingCamera;
+  DateTime _lastSent = DateTime.fromMillisecondsSinceEpoch(0);
+  Timer? _timer;
+
+  bool get _enabled =>
+      widget.control.getBool("on_camera_change", false)! ||
+      parseBool(widget.control.get("_internals")?["track_camera"], false)!;
+
+  @override
+  void dispose() {
+    _timer?.cancel();
+    super.dispose();
+  }
+
+  void _cameraChanged(MapCamera camera) {
+    if (_sentCamera != null &&
+        _sentCamera!.center == camera.center &&
+        _sentCamera!.zoom == camera.zoom &&
+        _sentCamera!.rotation == camera.rotation &&
+        _sentCamera!.nonRotatedSize == camera.nonRotatedSize) {
+      _pendingCamera = null;
+      return;
+    }
+    _pendingCamera = camera;
+    var wait = _cameraChangeInterval - DateTime.now().difference(_lastSent);
+    if (wait <= Duration.zero) {
+      _send();
+    } else {
+      _timer ??= Timer(wait, _send);
+    }
+  }
+
+  void _send() {
+    _timer?.cancel();
+    _timer = null;
+    var camera = _pendingCamera;
+    if (camera == null || !mounted) return;
+    _pendingCamera = null;
+    _sentCamera = camera;
+    _lastSent = DateTime.now();
+    widget.control.triggerEvent("camera_change", {"camera": camera.toMap()});
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var camera = MapCamera.maybeOf(context);
+    if (camera != null && _enabled) {
+      _cameraChanged(camera);
+    } else {
+      _sentCamera = null;
+    }
+    return widget.child;
+  }
+}
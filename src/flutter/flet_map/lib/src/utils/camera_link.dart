@@ -0,0 +1,51 @@
+import 'package:flutter_map/flutter_map.dart';
+import 'package:latlong2/latlong.dart';
+
+/// Links the camera of a map to the other maps of the same `camera_link_group`:
+/// camera changes are mirrored directly on the client, without a round trip
+/// to Python.
+class CameraLink {
+  static final Map<String, Set<CameraLink>> _groups = {};
+
+  final MapController controller;
+  String? _group;
+
+  /// The last camera mirrored to this map, whose own events are not mirrored
+  /// back to the group.
+  (LatLng, double, double)? _mirrored;
+
+  CameraLink(this.controller);
+
+  /// Moves this map to the group [value], or out of any group if `null`.
+  ///
+  /// Must only be set once the map is rendered, as the map is moved by the
+  /// other maps of the group from then on.
+  set group(String? value) {
+    if (value == _group) return;
+    var previous = _group;
+    if (previous != null) {
+      var members = _groups[previous]!..remove(this);
+      if (members.isEmpty) _groups.remove(previous);
+    }
+    _group = value;
+    _mirrored = null;
+    if (value != null) _groups.putIfAbsent(value, () => {}).add(this);
+  }
+
+  void dispose() => group = null;
+
+  /// Mirrors the camera of [event] to the other maps of the group.
+  void handleEvent(MapEvent event) {
+    var group = _group;
+    if (group == null) return;
+    var camera = event.camera;
+    var state = (camera.center, camera.zoom, camera.rotation);
+    if (state == _mirrored) return;
+    for (var member in _groups[group]!) {
+      if (identical(member, this)) continue;
+      member._mirrored = state;
+      member.controller
+          .moveAndRotate(camera.center, camera.zoom, camera.rotation);
+    }
+  }
+}
@@ -0,0 +1,141 @@
+import 'dart:async';
+
+import 'package:flet/flet.dart';
+import 'package:flutter_map/flutter_map.dart';
+
+typedef EventPayload = Map<String, dynamic> Function();
+typedef EventSender = void Function(Map<String, dynamic> data);
+
+/// The delay after which an event below the minimum camera deltas is sent,
+/// if no other event followed, when neither an interval nor a debounce delay
+/// is configured.
+const _settleDelay = Duration(milliseconds: 250);
+
+/// Throttles, debounces and filters camera events before they are sent, as
+/// configured by an `EventThrottleConfiguration`.
+///
+/// Dropped events are never lost entirely: the last one is sent when the
+/// interval elapses, when an event which is not throttled is sent, or, for
+/// events below the minimum camera deltas, once the camera settles.
+class MapEventThrottle {
+  Duration? _interval;
+  Duration? _debounce;
+  double? _minDistance;
+  double? _minZoomDelta;
+  double? _minRotationDelta;
+
+  MapCamera? _lastCamera;
+  final Stopwatch _sinceLastSent = Stopwatch();
+  (MapCamera?, EventPayload, EventSender)? _pending;
+  Timer? _timer;
+  Timer? _settleTimer;
+
+  /// Applies the `EventThrottleConfiguration` [value], if any.
+  void configure(dynamic value) {
+    _interval = value is Map ? parseDuration(value["interval"]) : null;
+    _debounce = value is Map ? parseDuration(value["debounce"]) : null;
+    _minDistance = value is Map ? parseDouble(value["min_distance"]) : null;
+    _minZoomDelta = value is Map ? parseDouble(value["min_zoom_delta"]) : null;
+    _minRotationDelta =
+        value is Map ? parseDouble(value["min_rotation_delta"]) : null;
+  }
+
+  /// Sends the event of [camera] built by [payload] with [send], or
+  /// postpones it according to the configuration, replacing any postponed one.
+  ///
+  /// Events without a [camera] are only throttled or debounced.
+  ///
+  /// Events which are not [continuous], such as taps or the end of a
+  /// gesture, are sent immediately, after any postponed event.
+  void add(MapCamera? camera, EventPayload payload, EventSender send,
+      {bool continuous = true}) {
+    if (!continuous) {
+      flush();
+      send(payload());
+      return;
+    }
+    _pending = (camera, payload, send);
+    if (!_isSignificant(camera)) {
+      // kept, and sent if the camera does not change any more, so that the
+      // last event of a gesture is never dropped
+      _settleTimer?.cancel();
+      _settleTimer = Timer(_debounce ?? _interval ?? _settleDelay, flush);
+      return;
+    }
+    var debounce = _debounce;
+    if (debounce != null) {
+      _timer?.cancel();
+      _timer = Timer(debounce, flush);
+      return;
+    }
+    var interval = _interval;
+    if (interval == null ||
+        !_sinceLastSent.isRunning ||
+        _sinceLastSent.elapsed >= interval) {
+      flush();
+      return;
+    }
+    _timer ??= Timer(interval - _sinceLastSent.elapsed, flush);
+  }
+
+  /// Sends the postponed event, if any.
+  void flush() {
+    _timer?.cancel();
+    _timer = null;
+    _settleTimer?.cancel();
+    _settleTimer = null;
+    var pending = _pending;
+    if (pending == null) return;
+    _pending = null;
+    _lastCamera = pending.$1 ?? _lastCamera;
+    _sinceLastSent
+      ..reset()
+      ..start();
+    pending.$3(pending.$2());
+  }
+
+  void dispose() {
+    _timer?.cancel();
+    _timer = null;
+    _settleTimer?.cancel();
+    _settleTimer = null;
+    _pending = null;
+  }
+
+  /// Whether [camera] changed enough since the last sent event.
+  bool _isSignificant(MapCamera? camera) {
+    var last = _lastCamera;
+    if (camera == null) return true;
+    var minDistance = _minDistance;
+    var minZoomDelta = _minZoomDelta;
+    var minRotationDelta = _minRotationDelta;
+    if (last == null ||
+        (minDistance == null &&
+            minZoomDelta == null &&
+            minRotationDelta == null)) {
+      return true;
+    }
+    if (minZoomDelta != null && (camera.zoom - last.zoom).abs() >= minZoomDelta) {
+      return true;
+    }
+    if (minRotationDelta != null &&
+        (camera.rotation - last.rotation).abs() >= minRotationDelta) {
+      return true;
+    }
+    return minDistance != null &&
+        (camera.projectAtZoom(camera.center) -
+                    camera.projectAtZoom(last.center))
+                .distance >=
+            minDistance;
+  }
+}
+
+/// Whether [event] is one of the many events fired during a gesture or an
+/// animation, which may be throttled.
+bool isContinuousMapEvent(MapEvent event) =>
+    event is MapEventMove ||
+    event is MapEventRotate ||
+    event is MapEventFlingAnimation ||
+    event is MapEventDoubleTapZoom ||
+    event is MapEventScrollWheelZoom ||
+    event is MapEventNonRotatedSizeChange;
@@ -0,0 +1,105 @@
+import 'package:collection/collection.dart';
+import 'package:flet/flet.dart';
+
+/// A filter of the features displayed by a layer, parsed from a
+/// `FeatureFilter`.
+class FeatureFilter {
+  final Set<Object>? keys;
+  final Set<Object>? excludeKeys;
+  final String? attribute;
+  final Set<Object?>? values;
+  final double? minValue;
+  final double? maxValue;
+
+  const FeatureFilter(
+      {this.keys,
+      this.excludeKeys,
+      this.attribute,
+      this.values,
+      this.minValue,
+      this.maxValue});
+
+  static FeatureFilter? parse(dynamic value) {
+    if (value is! Map) return null;
+    Set<Object>? parseKeys(dynamic keys) =>
+        keys is List ? keys.whereType<Object>().toSet() : null;
+    var values = value["values"];
+    return FeatureFilter(
+        keys: parseKeys(value["keys"]),
+        excludeKeys: parseKeys(value["exclude_keys"]),
+        attribute: value["attribute"],
+        values: values is List ? values.toSet() : null,
+        minValue: parseDouble(value["min_value"]),
+        maxValue: parseDouble(value["max_value"]));
+  }
+
+  /// Whether [feature] is displayed.
+  bool accepts(Control feature) {
+    if (keys != null || excludeKeys != null) {
+      var key = feature.get("key");
+      if (key is Map) key = key["value"];
+      if (keys != null && !keys!.contains(key)) return false;
+      if (excludeKeys != null && excludeKeys!.contains(key)) return false;
+    }
+    if (attribute != null) {
+      var attributes = feature.get("attributes");
+      if (attributes is! Map || !attributes.containsKey(attribute)) {
+        return false;
+      }
+      var value = attributes[attribute];
+      if (values != null && !values!.contains(value)) return false;
+      if (minValue != null || maxValue != null) {
+        if (value is! num) return false;
+        if (minValue != null && value < minValue!) return false;
+        if (maxValue != null && value > maxValue!) return false;
+      }
+    }
+    return true;
+  }
+}
+
+/// The filter of the features of a layer: its `filter` property, or the one
+/// set by a `set_filter` call, until the property is changed from Python.
+class LayerFeatureFilter {
+  /// The `filter` property when `set_filter` was called, and the filter it set.
+  (dynamic, dynamic)? _override;
+
+  dynamic _parsedValue;
+  FeatureFilter? _parsed;
+
+  /// Applies the `set_filter` arguments [args] to [layer].
+  void set(Control layer, dynamic args) {
+    _override = (layer.get("filter"), args["filter"]);
+  }
+
+  /// Returns the filter of [layer], or `null` if all its features are
+  /// displayed.
+  FeatureFilter? get(Control layer) {
+    var value = layer.get("filter");
+    var override = _override;
+    if (override != null) {
+      var (original, overriddenValue) = override;
+      const equality = DeepCollectionEquality();
+      if (identical(value, original) ||
+          equality.equals(value, original) ||
+          equality.equals(value, overriddenValue)) {
+        value = overriddenValue;
+      } else {
+        // changed from Python since
+        _override = null;
+      }
+    }
+    // the filter is only parsed again when it changed
+    if (!identical(value, _parsedValue)) {
+      _parsedValue = value;
+      _parsed = FeatureFilter.parse(value);
+    }
+    return _parsed;
+  }
+
+  /// Returns the [features] of [layer] which are displayed.
+  Iterable<Control> apply(Control layer, Iterable<Control> features) {
+    var filter = get(layer);
+    return filter == null ? features : features.where(filter.accepts);
+  }
+}
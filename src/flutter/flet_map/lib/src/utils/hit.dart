@@ -0,0 +1,75 @@
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter_map/flutter_map.dart';
+
+import 'map.dart';
+
+/// Builds the hit notifier of a vector layer, whose elements have the id of
+/// their control as `hitValue`, and reports the features under the pointer
+/// as `feature_hover` and `feature_tap` events of the layer [control].
+///
+/// Hits are tested by flutter_map, so only the changes of the hovered
+/// features, and the taps on features, are sent.
+class FeatureHitDetector extends StatefulWidget {
+  final Control control;
+  final Widget Function(LayerHitNotifier<int>? hitNotifier) builder;
+
+  const FeatureHitDetector(
+      {super.key, required this.control, required this.builder});
+
+  @override
+  State<FeatureHitDetector> createState() => _FeatureHitDetectorState();
+}
+
+class _FeatureHitDetectorState extends State<FeatureHitDetector> {
+  final LayerHitNotifier<int> _hitNotifier = ValueNotifier(null);
+  List<int> _hovered = const [];
+
+  @override
+  void dispose() {
+    _hitNotifier.dispose();
+    super.dispose();
+  }
+
+  void _updateHovered(LayerHitResult<int>? hit) {
+    var ids = hit?.hitValues ?? const <int>[];
+    if (listEquals(ids, _hovered)) return;
+    _hovered = ids;
+    widget.control.triggerEvent("feature_hover", {
+      "ids": ids,
+      "coordinates": hit?.coordinate.toMap(),
+    });
+  }
+
+  void _tap() {
+    var hit = _hitNotifier.value;
+    if (hit == null) return;
+    widget.control.triggerEvent("feature_tap", {
+      "ids": hit.hitValues,
+      "coordinates": hit.coordinate.toMap(),
+    });
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var onHover = widget.control.getBool("on_feature_hover", false)!;
+    var onTap = widget.control.getBool("on_feature_tap", false)!;
+    if (!onHover) _hovered = const [];
+    if (!onHover && !onTap) return widget.builder(null);
+
+    Widget layer = widget.builder(_hitNotifier);
+    if (onTap) {
+      layer = GestureDetector(
+          behavior: HitTestBehavior.deferToChild, onTap: _tap, child: layer);
+    }
+    if (onHover) {
+      layer = MouseRegion(
+        hitTestBehavior: HitTestBehavior.deferToChild,
+        onHover: (_) => _updateHovered(_hitNotifier.value),
+        onExit: (_) => _updateHovered(null),
+        child: layer,
+      );
+    }
+    return layer;
+  }
+}
@@ -1,3 +1,6 @@
+import 'dart:math' show pow;
+import 'dart:typed_data';
+
 import 'package:collection/collection.dart';
 import 'package:flet/flet.dart';
 import 'package:flutter/gestures.dart';
@@ -6,6 +9,8 @@ import 'package:flutter/services.dart';
 import 'package:flutter_map/flutter_map.dart';
 import 'package:latlong2/latlong.dart';
 
+import 'events.dart';
+
 LatLng? parseLatLng(dynamic value, [LatLng? defaultValue]) {
   if (value == null) return defaultValue;
 
@@ -13,6 +18,121 @@ LatLng? parseLatLng(dynamic value, [LatLng? defaultValue]) {
       parseDouble(value['latitude'], 0)!, parseDouble(value['longitude'], 0)!);
 }
 
+/// Parses a list of coordinates, given either as a list of
+/// `{"latitude", "longitude"}` maps or as a packed `MapLatitudeLongitudeArray`.
+List<LatLng>? parseLatLngList(dynamic value, [List<LatLng>? defaultValue]) {
+  if (value == null) return defaultValue;
+  if (value is List) {
+    return value.map((c) => parseLatLng(c)).nonNulls.toList();
+  }
+  if (value is Map) {
+    var data = value["data"];
+    if (data == null) return [];
+    if (data is List<int>) {
+      var bytes = data is Uint8List ? data : Uint8List.fromList(data);
+      var precision = parseInt(value["precision"]);
+      return precision != null
+          ? decodeLatLngs(bytes, precision)
+          : unpackLatLngs(bytes);
+    }
+  }
+  return defaultValue;
+}
+
+/// Unpacks interleaved little-endian float64 `latitude, longitude` pairs.
+List<LatLng> unpackLatLngs(Uint8List bytes) {
+  final view = ByteData.sublistView(bytes);
+  return List<LatLng>.generate(
+      bytes.lengthInBytes ~/ 16,
+      (i) => LatLng(view.getFloat64(i * 16, Endian.little),
+          view.getFloat64(i * 16 + 8, Endian.little)));
+}
+
+/// Decodes coordinates encoded with a `MapLatitudeLongitudeArray.precision`:
+/// the differences between the consecutive latitudes and longitudes, in
+/// `10^-precision` degrees, as zigzag-encoded LEB128 variable-length integers.
+///
+/// Only arithmetic operations are used, as bitwise operations are limited to
+/// 32 bits on the web.
+List<LatLng> decodeLatLngs(Uint8List bytes, int precision) {
+  final scale = pow(10, precision).toDouble();
+  final points = <LatLng>[];
+  var totals = [0, 0];
+  var index = 0;
+  var value = 0;
+  var multiplier = 1;
+  for (final byte in bytes) {
+    value += (byte & 0x7f) * multiplier;
+    if (byte >= 0x80) {
+      multiplier *= 128;
+      continue;
+    }
+    totals[index] += value.isEven ? value ~/ 2 : -(value + 1) ~/ 2;
+    if (index == 1) {
+      points.add(LatLng(totals[0] / scale, totals[1] / scale));
+    }
+    index = 1 - index;
+    value = 0;
+    multiplier = 1;
+  }
+  return points;
+}
+
+/// Packs [points] as interleaved little-endian float64 `latitude, longitude`
+/// pairs, the inverse of [unpackLatLngs].
+Uint8List packLatLngs(List<LatLng> points) {
+  final view = ByteData(points.length * 16);
+  for (var i = 0; i < points.length; i++) {
+    view.setFloat64(i * 16, points[i].latitude, Endian.little);
+    view.setFloat64(i * 16 + 8, points[i].longitude, Endian.little);
+  }
+  return view.buffer.asUint8List();
+}
+
+/// Encodes [points] with a `MapLatitudeLongitudeArray.precision`, the inverse
+/// of [decodeLatLngs]: the first point is encoded as a difference from
+/// [previous], if the points are appended to already encoded ones.
+Uint8List encodeLatLngs(List<LatLng> points, int precision,
+    [LatLng? previous]) {
+  final scale = pow(10, precision).toDouble();
+  final bytes = <int>[];
+  var totals = previous == null
+      ? [0, 0]
+      : [
+          (previous.latitude * scale).round(),
+          (previous.longitude * scale).round()
+        ];
+  for (final point in points) {
+    for (final (index, coordinate)
+        in [point.latitude, point.longitude].indexed) {
+      final value = (coordinate * scale).round();
+      final delta = value - totals[index];
+      totals[index] = value;
+      var zigzag = delta >= 0 ? delta * 2 : -delta * 2 - 1;
+      while (zigzag >= 0x80) {
+        bytes.add(zigzag % 128 + 0x80);
+        zigzag ~/= 128;
+      }
+      bytes.add(zigzag);
+    }
+  }
+  return Uint8List.fromList(bytes);
+}
+
+/// Parses a packed `NumberArray` value, made of little-endian float32 values.
+Float32List? parseNumberArray(dynamic value, [Float32List? defaultValue]) {
+  if (value is! Map) return defaultValue;
+  var data = value["data"];
+  if (data is! List<int>) return defaultValue;
+  final bytes = data is Uint8List ? data : Uint8List.fromList(data);
+  final view = ByteData.sublistView(bytes);
+  final values = Float32List(bytes.lengthInBytes ~/ 4);
+  for (var i = 0; i < values.length; i++) {
+    values[i] = view.getFloat32(i * 4, Endian.little);
+  }
+  return values;
+}
+
 LatLngBounds? parseLatLngBounds(dynamic value, [LatLngBounds? defaultValue]) {
   if (value == null ||
       value['corner_1'] == null ||
@@ -102,10 +222,7 @@ CameraFit? parseCameraFit(dynamic value, [CameraFit? defaultValue]) {
   if (value == null) return defaultValue;
 
   final bounds = parseLatLngBounds(value["bounds"]);
-  final coordinates = (value["coordinates"] as List?)
-      ?.map((c) => parseLatLng(c))
-      .nonNulls
-      .toList();
+  final coordinates = parseLatLngList(value["coordinates"]);
   if (bounds == null && coordinates == null) return defaultValue;
 
   final forceIntegerZoomLevel =
@@ -226,10 +343,10 @@ extension LatLngExtension on LatLng {
 }
 
 extension LatLngBoundsExtension on LatLngBounds {
-  // TODO
-  // Map<String, dynamic> toMap() => {
-  //
-  //     };
+  Map<String, dynamic> toMap() => {
+        "corner_1": northWest.toMap(),
+        "corner_2": southEast.toMap(),
+      };
 }
 
 extension MapCameraExtension on MapCamera {
@@ -239,6 +356,7 @@ extension MapCameraExtension on MapCamera {
         "min_zoom": minZoom,
         "max_zoom": maxZoom,
         "rotation": rotation,
+        "visible_bounds": visibleBounds.toMap(),
       };
 }
 
@@ -250,7 +368,10 @@ extension MapEventExtension on MapEvent {
 }
 
 MapOptions? parseConfiguration(Control control, BuildContext context,
-    [MapOptions? defaultValue]) {
+    [MapOptions? defaultValue,
+    MapEventThrottle? positionChangeThrottle,
+    MapEventThrottle? eventThrottle,
+    MapEventThrottle? hoverThrottle]) {
   return MapOptions(
     initialCenter:
         parseLatLng(control.get("initial_center"), const LatLng(50.5, 30.51))!,
@@ -265,10 +386,15 @@ MapOptions? parseConfiguration(Control control, BuildContext context,
     initialCameraFit: parseCameraFit(control.get("initial_camera_fit")),
     onPointerHover: control.getBool("on_hover", false)!
         ? (PointerHoverEvent e, LatLng latlng) {
-            control.triggerEvent("hover", {
-              "coordinates": latlng.toMap(),
-              ...e.toMap(),
-            });
+            Map<String, dynamic> payload() => {
+                  "coordinates": latlng.toMap(),
+                  ...e.toMap(),
+                };
+            void send(Map<String, dynamic> data) =>
+                control.triggerEvent("hover", data);
+            hoverThrottle != null
+                ? hoverThrottle.add(null, payload, send)
+                : send(payload());
           }
         : null,
     onTap: control.getBool("on_tap", false)!
@@ -289,11 +415,16 @@ MapOptions? parseConfiguration(Control control, BuildContext context,
         : null,
     onPositionChanged: control.getBool("on_position_change", false)!
         ? (MapCamera camera, bool hasGesture) {
-            control.triggerEvent("position_change", {
-              "coordinates": camera.center.toMap(),
-              "has_gesture": hasGesture,
-              "camera": camera.toMap()
-            });
+            Map<String, dynamic> payload() => {
+                  "coordinates": camera.center.toMap(),
+                  "has_gesture": hasGesture,
+                  "camera": camera.toMap()
+                };
+            void send(Map<String, dynamic> data) =>
+                control.triggerEvent("position_change", data);
+            positionChangeThrottle != null
+                ? positionChangeThrottle.add(camera, payload, send)
+                : send(payload());
           }
         : null,
     onPointerDown: control.getBool("on_pointer_down", false)!
@@ -327,7 +458,14 @@ MapOptions? parseConfiguration(Control control, BuildContext context,
           }
         : null,
     onMapEvent: control.getBool("on_event", false)!
-        ? (MapEvent e) => control.triggerEvent("event", e.toMap())
+        ? (MapEvent e) {
+            void send(Map<String, dynamic> data) =>
+                control.triggerEvent("event", data);
+            eventThrottle != null
+                ? eventThrottle.add(e.camera, e.toMap, send,
+                    continuous: isContinuousMapEvent(e))
+                : send(e.toMap());
+          }
         : null,
     onMapReady: control.getBool("on_init", false)!
         ? () => control.triggerEvent("init")
@@ -0,0 +1,69 @@
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter_map/flutter_map.dart';
+
+import 'map.dart';
+
+/// A parsed `FeatureStyle`, shared by the features of a vector layer.
+class FeatureStyle {
+  final Color? color;
+  final Color? borderColor;
+  final double? borderStrokeWidth;
+  final double? strokeWidth;
+  final bool? useStrokeWidthInMeter;
+  final StrokePattern? strokePattern;
+  final StrokeCap? strokeCap;
+  final StrokeJoin? strokeJoin;
+  final List<Color>? gradientColors;
+  final List<double>? colorsStop;
+  final TextStyle? labelTextStyle;
+
+  FeatureStyle.parse(Map value, ThemeData theme)
+      : color = parseColor(value["color"], theme),
+        borderColor = parseColor(value["border_color"], theme),
+        borderStrokeWidth = parseDouble(value["border_stroke_width"]),
+        strokeWidth = parseDouble(value["stroke_width"]),
+        useStrokeWidthInMeter = parseBool(value["use_stroke_width_in_meter"]),
+        strokePattern = parseStrokePattern(value["stroke_pattern"]),
+        strokeCap = parseStrokeCap(value["stroke_cap"]),
+        strokeJoin = parseStrokeJoin(value["stroke_join"]),
+        gradientColors = (value["gradient_colors"] as List?)
+            ?.map((e) => parseColor(e, theme))
+            .nonNulls
+            .toList(),
+        colorsStop = (value["colors_stop"] as List?)
+            ?.map((e) => parseDouble(e))
+            .nonNulls
+            .toList(),
+        labelTextStyle = parseTextStyle(value["label_text_style"], theme);
+}
+
+/// Parses the `styles` table of a vector layer, by style id.
+///
+/// Styles are parsed once per build of the layer, instead of once per feature.
+Map<String, FeatureStyle> parseFeatureStyles(dynamic value, ThemeData theme) {
+  if (value is! Map) return const {};
+  return {
+    for (var entry in value.entries)
+      if (entry.value is Map)
+        entry.key.toString(): FeatureStyle.parse(entry.value, theme)
+  };
+}
+
+/// Applies the `update_feature_styles` arguments [args], holding new `style`,
+/// `color` and `border_color` values by property name and control id, to
+/// [controls].
+///
+/// The controls hold the new values as set on the Python side, where they are
+/// not sent again, so that they are kept when the layer is built again and
+/// later changes from Python still apply.
+void updateFeatureStyles(Map args, Iterable<Control> controls) {
+  var byId = {for (var control in controls) control.id: control};
+  for (var MapEntry(key: property, value: values) in args.entries) {
+    if (values is! Map) continue;
+    for (var MapEntry(key: id, value: value) in values.entries) {
+      byId[parseInt(id)]
+          ?.updateProperties({property as String: value}, python: false);
+    }
+  }
+}
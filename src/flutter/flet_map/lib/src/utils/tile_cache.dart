@@ -0,0 +1 @@
+export 'tile_cache_stub.dart' if (dart.library.io) 'tile_cache_io.dart';
@@ -0,0 +1,271 @@
+import 'dart:async';
+import 'dart:collection';
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:crypto/crypto.dart';
+import 'package:flutter/foundation.dart';
+import 'package:flutter_map/flutter_map.dart';
+import 'package:path_provider/path_provider.dart';
+
+import 'tile_requests.dart';
+
+/// Returns a tile provider caching the tiles in the [storeName] store,
+/// and downloading them through [scheduler], if any.
+ScheduledTileProvider? createCachedTileProvider(
+        {required String storeName,
+        required int maxSize,
+        Duration? maxAge,
+        TileRequestScheduler? scheduler}) =>
+    CachedTileProvider(
+        store: TileCacheStore.named(storeName, maxSize: maxSize),
+        maxAge: maxAge,
+        scheduler: scheduler);
+
+/// Returns the statistics of the [storeName] store.
+Future<Map<String, dynamic>?> getTileCacheStats(String storeName) =>
+    TileCacheStore.named(storeName).stats();
+
+/// Removes all the tiles of the [storeName] store.
+Future<void> clearTileCache(String storeName) =>
+    TileCacheStore.named(storeName).clear();
+
+/// Downloads the tiles of [ranges], given as `[zoom, minX, minY, maxX, maxY]`
+/// lists, into the store of [provider], with at most [maxConcurrency]
+/// simultaneous downloads.
+///
+/// Returns the numbers of tiles in the ranges, and of downloaded, skipped and
+/// failed tiles, or `null` if [provider] does not cache tiles.
+Future<Map<String, dynamic>?> seedTileCache(
+    TileProvider provider,
+    TileLayer options,
+    List<List<int>> ranges,
+    int maxConcurrency,
+    void Function(int completed, int total) onProgress) async {
+  if (provider is! CachedTileProvider) return null;
+  var total = 0;
+  for (var [_, minX, minY, maxX, maxY] in ranges) {
+    total += (maxX - minX + 1) * (maxY - minY + 1);
+  }
+  Iterable<TileCoordinates> tiles() sync* {
+    for (var [zoom, minX, minY, maxX, maxY] in ranges) {
+      for (var x = minX; x <= maxX; x++) {
+        for (var y = minY; y <= maxY; y++) {
+          yield TileCoordinates(x, y, zoom);
+        }
+      }
+    }
+  }
+
+  var iterator = tiles().iterator;
+  var downloaded = 0, skipped = 0, failed = 0;
+  var progress = Stopwatch()..start();
+  Future<void> worker() async {
+    while (iterator.moveNext()) {
+      var url = provider.getTileUrl(iterator.current, options);
+      switch (await provider._seed(url)) {
+        case true:
+          downloaded++;
+        case false:
+          skipped++;
+        case null:
+          failed++;
+      }
+      if (progress.elapsedMilliseconds >= 500) {
+        progress.reset();
+        onProgress(downloaded + skipped + failed, total);
+      }
+    }
+  }
+
+  await Future.wait(List.generate(maxConcurrency, (_) => worker()));
+  onProgress(total, total);
+  return {
+    "tile_count": total,
+    "downloaded_count": downloaded,
+    "skipped_count": skipped,
+    "failed_count": failed,
+  };
+}
+
+/// A persistent store of tiles, in a directory of the app cache.
+///
+/// The least recently used tiles are evicted when the store exceeds its
+/// [maxSize]. Tiles are ordered by download time when the store is opened,
+/// and by last use afterwards.
+class TileCacheStore {
+  static final Map<String, TileCacheStore> _stores = {};
+
+  final String name;
+  int maxSize;
+  int hitCount = 0;
+  int missCount = 0;
+
+  /// The size of each cached tile, by key, least recently used first.
+  final LinkedHashMap<String, int> _sizes = LinkedHashMap();
+  int _size = 0;
+  late final Future<Directory> _directory = _open();
+
+  TileCacheStore._(this.name, this.maxSize);
+
+  /// Returns the store named [name], creating it if needed.
+  static TileCacheStore named(String name, {int? maxSize}) {
+    var store = _stores.putIfAbsent(
+        name, () => TileCacheStore._(name, maxSize ?? 200 * 1024 * 1024));
+    if (maxSize != null) store.maxSize = maxSize;
+    return store;
+  }
+
+  Future<Directory> _open() async {
+    var root = await getApplicationCacheDirectory();
+    var directory = Directory("${root.path}/flet_map_tiles/$name");
+    await directory.create(recursive: true);
+    var files = <(String, int, DateTime)>[];
+    await for (var entity in directory.list()) {
+      if (entity is File) {
+        var stat = await entity.stat();
+        files.add((entity.uri.pathSegments.last, stat.size, stat.modified));
+      }
+    }
+    files.sort((a, b) => a.$3.compareTo(b.$3));
+    for (var (key, size, _) in files) {
+      _sizes[key] = size;
+      _size += size;
+    }
+    return directory;
+  }
+
+  String _key(String url) => sha1.convert(utf8.encode(url)).toString();
+
+  /// Returns the cached tile of [url], if any, and whether it is older than
+  /// [maxAge].
+  Future<(Uint8List, bool)?> read(String url, Duration? maxAge) async {
+    var directory = await _directory;
+    var key = _key(url);
+    var size = _sizes.remove(key);
+    if (size == null) return null;
+    _sizes[key] = size;
+    var file = File("${directory.path}/$key");
+    try {
+      var bytes = await file.readAsBytes();
+      var stale = maxAge != null &&
+          DateTime.now().difference(await file.lastModified()) > maxAge;
+      return (bytes, stale);
+    } on FileSystemException {
+      if (_sizes.remove(key) != null) _size -= size;
+      return null;
+    }
+  }
+
+  /// Whether the tile of [url] is cached, and not older than [maxAge].
+  Future<bool> isFresh(String url, Duration? maxAge) async {
+    var directory = await _directory;
+    var key = _key(url);
+    if (!_sizes.containsKey(key)) return false;
+    if (maxAge == null) return true;
+    try {
+      var modified = await File("${directory.path}/$key").lastModified();
+      return DateTime.now().difference(modified) <= maxAge;
+    } on FileSystemException {
+      return false;
+    }
+  }
+
+  /// Stores [bytes] as the tile of [url].
+  Future<void> write(String url, Uint8List bytes) async {
+    var directory = await _directory;
+    var key = _key(url);
+    try {
+      await File("${directory.path}/$key").writeAsBytes(bytes);
+    } on FileSystemException catch (e) {
+      debugPrint("Cannot cache tile $url: $e");
+      return;
+    }
+    _size += bytes.length - (_sizes.remove(key) ?? 0);
+    _sizes[key] = bytes.length;
+    if (_size > maxSize) await _evict(directory, (maxSize * 0.9).floor());
+  }
+
+  /// Removes the least recently used tiles, until the store fits in [size].
+  Future<void> _evict(Directory directory, int size) async {
+    var keys = <String>[];
+    while (_size > size && _sizes.isNotEmpty) {
+      var key = _sizes.keys.first;
+      _size -= _sizes.remove(key)!;
+      keys.add(key);
+    }
+    for (var key in keys) {
+      try {
+        await File("${directory.path}/$key").delete();
+      } on FileSystemException {
+        // already removed
+      }
+    }
+  }
+
+  /// Removes all the tiles of the store.
+  Future<void> clear() async => _evict(await _directory, 0);
+
+  Future<Map<String, dynamic>> stats() async {
+    await _directory;
+    return {
+      "store_name": name,
+      "tile_count": _sizes.length,
+      "size": _size,
+      "hit_count": hitCount,
+      "miss_count": missCount,
+    };
+  }
+}
+
+/// A tile provider downloading tiles through a persistent [TileCacheStore].
+///
+/// Cached tiles older than [maxAge] are downloaded again, but still used if
+/// the download fails, e.g. while offline.
+class CachedTileProvider extends ScheduledTileProvider {
+  final TileCacheStore store;
+  final Duration? maxAge;
+
+  CachedTileProvider({required this.store, this.maxAge, super.scheduler});
+
+  @override
+  Future<Uint8List> loadTile(String url, String? fallbackUrl,
+      TileCoordinates coordinates, Future<void> cancelLoading) async {
+    var cached = await store.read(url, maxAge);
+    if (cached != null && !cached.$2) {
+      store.hitCount++;
+      metrics?.cacheHitCount++;
+      return cached.$1;
+    }
+    store.missCount++;
+    try {
+      var bytes = await download(url, coordinates, cancelLoading);
+      unawaited(store.write(url, bytes));
+      return bytes;
+    } on TileRequestCancelledException {
+      return cached?.$1 ?? TileProvider.transparentImage;
+    } catch (_) {
+      if (cached != null) return cached.$1;
+      if (fallbackUrl != null) {
+        return loadTile(fallbackUrl, null, coordinates, cancelLoading);
+      }
+      rethrow;
+    }
+  }
+
+  /// Downloads the tile of [url] into the store, unless it is already cached.
+  ///
+  /// Returns whether the tile was downloaded, or `null` if the download failed.
+  Future<bool?> _seed(String url) async {
+    if (await store.isFresh(url, maxAge)) return false;
+    try {
+      // seeding does not go through the scheduler, so that it does not delay
+      // the tiles being displayed
+      await store.write(url, await downloadTile(url, headers));
+      return true;
+    } catch (e) {
+      debugPrint("Cannot download tile $url: $e");
+      return null;
+    }
+  }
+}
@@ -0,0 +1,30 @@
+import 'package:flutter_map/flutter_map.dart';
+
+import 'tile_requests.dart';
+
+/// Returns a tile provider caching the tiles in the [storeName] store,
+/// or `null` if the platform does not support a persistent tile cache.
+ScheduledTileProvider? createCachedTileProvider(
+        {required String storeName,
+        required int maxSize,
+        Duration? maxAge,
+        TileRequestScheduler? scheduler}) =>
+    null;
+
+/// Returns the statistics of the [storeName] store, or `null` if the platform
+/// does not support a persistent tile cache.
+Future<Map<String, dynamic>?> getTileCacheStats(String storeName) async =>
+    null;
+
+/// Removes all the tiles of the [storeName] store.
+Future<void> clearTileCache(String storeName) async {}
+
+/// Downloads the tiles of [ranges] into the store of [provider], or returns
+/// `null` if the platform does not support a persistent tile cache.
+Future<Map<String, dynamic>?> seedTileCache(
+        TileProvider provider,
+        TileLayer options,
+        List<List<int>> ranges,
+        int maxConcurrency,
+        void Function(int completed, int total) onProgress) async =>
+    null;
@@ -0,0 +1,328 @@
+import 'dart:async';
+import 'dart:math';
+import 'dart:ui' as ui;
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter/widgets.dart';
+import 'package:flutter_map/flutter_map.dart';
+import 'package:http/http.dart' as http;
+import 'package:latlong2/latlong.dart';
+
+final http.Client _client = http.Client();
+
+/// The time after which a tile download fails with a [TimeoutException].
+const tileDownloadTimeout = Duration(seconds: 30);
+
+/// Downloads the tile of [url].
+///
+/// Throws a [TimeoutException] if the response is not received within
+/// [timeout], so that a stalled server does not hold a download slot of a
+/// [TileRequestScheduler] forever.
+Future<Uint8List> downloadTile(String url, Map<String, String> headers,
+    {Duration timeout = tileDownloadTimeout}) async {
+  var response = await _client
+      .get(Uri.parse(url), headers: headers)
+      .timeout(timeout);
+  if (response.statusCode != 200) {
+    throw http.ClientException("HTTP ${response.statusCode}", Uri.parse(url));
+  }
+  return response.bodyBytes;
+}
+
+/// Thrown by [TileRequestScheduler.download] when a queued download is
+/// cancelled, as its tile is no longer needed.
+class TileRequestCancelledException implements Exception {
+  const TileRequestCancelledException();
+}
+
+/// Queues the tile downloads of the tile layers sharing a URL template, so
+/// that at most [maxConcurrency] of them run at once.
+///
+/// Queued downloads start nearest to the map center first, downloads of the
+/// same URL are shared, and downloads whose tiles are no longer needed are
+/// dropped before they start.
+class TileRequestScheduler {
+  static final Map<String, TileRequestScheduler> _schedulers = {};
+
+  int maxConcurrency;
+  int _active = 0;
+  final Map<String, _TileRequest> _requests = {};
+
+  TileRequestScheduler._(this.maxConcurrency);
+
+  /// Returns the scheduler of the tile layers using [urlTemplate].
+  static TileRequestScheduler of(String urlTemplate, int maxConcurrency) {
+    var scheduler = _schedulers.putIfAbsent(
+        urlTemplate, () => TileRequestScheduler._(maxConcurrency));
+    scheduler.maxConcurrency = maxConcurrency;
+    return scheduler;
+  }
+
+  /// Downloads [url], once [priority] is the lowest of the queued downloads
+  /// and a download slot is free.
+  ///
+  /// The download is dropped if it did not start when [cancelLoading]
+  /// completes, unless it is shared with requests which were not cancelled.
+  Future<Uint8List> download(String url, Map<String, String> headers,
+      double Function() priority, Future<void> cancelLoading) {
+    var request = _requests.putIfAbsent(
+        url, () => _TileRequest(url, headers, priority));
+    request.waiters++;
+    cancelLoading.then((_) => _cancel(request));
+    _pump();
+    return request.completer.future;
+  }
+
+  void _cancel(_TileRequest request) {
+    if (--request.waiters > 0 || request.started) return;
+    _requests.remove(request.url);
+    request.completer.completeError(const TileRequestCancelledException());
+  }
+
+  void _pump() {
+    while (_active < maxConcurrency) {
+      _TileRequest? next;
+      var best = double.infinity;
+      for (var request in _requests.values) {
+        if (request.started) continue;
+        var priority = request.priority();
+        if (next == null || priority < best) {
+          next = request;
+          best = priority;
+        }
+      }
+      if (next == null) return;
+      next.started = true;
+      _active++;
+      unawaited(_run(next));
+    }
+  }
+
+  /// Downloads [request], releasing its slot whether it succeeds, fails or
+  /// times out.
+  Future<void> _run(_TileRequest request) async {
+    try {
+      request.completer
+          .complete(await downloadTile(request.url, request.headers));
+    } catch (e, stackTrace) {
+      request.completer.completeError(e, stackTrace);
+    } finally {
+      _active--;
+      _requests.remove(request.url);
+      _pump();
+    }
+  }
+}
+
+class _TileRequest {
+  final String url;
+  final Map<String, String> headers;
+  final double Function() priority;
+  final Completer<Uint8List> completer = Completer();
+  int waiters = 0;
+  bool started = false;
+
+  _TileRequest(this.url, this.headers, this.priority);
+}
+
+/// Tile loading metrics of a tile layer, aggregated over an interval.
+class TileMetrics {
+  int requestedCount = 0;
+  int loadedCount = 0;
+  int cacheHitCount = 0;
+  int cancelledCount = 0;
+  int downloadedBytes = 0;
+  final Map<String, int> errors = {};
+  final List<double> _loadTimes = [];
+
+  bool get isEmpty => requestedCount == 0 && errors.isEmpty;
+
+  void _loaded(Duration loadTime) {
+    loadedCount++;
+    _loadTimes.add(loadTime.inMicroseconds / 1000);
+  }
+
+  void _failed(Object error) {
+    var type = switch (error) {
+      http.ClientException(message: var m) when m.startsWith("HTTP ") =>
+        "http_${m.substring(5)}",
+      http.ClientException() => "network",
+      // thrown by downloadTile
+      TimeoutException() => "timeout",
+      _ => error.runtimeType.toString(),
+    };
+    errors[type] = (errors[type] ?? 0) + 1;
+  }
+
+  /// Returns the metrics as an event payload, and resets them.
+  Map<String, dynamic> take() {
+    _loadTimes.sort();
+    var result = {
+      "requested_count": requestedCount,
+      "loaded_count": loadedCount,
+      "cache_hit_count": cacheHitCount,
+      "cancelled_count": cancelledCount,
+      "error_count": errors.values.fold(0, (a, b) => a + b),
+      "errors": Map.of(errors),
+      "downloaded_bytes": downloadedBytes,
+      "mean_load_time": _loadTimes.isEmpty
+          ? null
+          : _loadTimes.reduce((a, b) => a + b) / _loadTimes.length,
+      "p95_load_time": _loadTimes.isEmpty
+          ? null
+          : _loadTimes[((_loadTimes.length - 1) * 0.95).round()],
+    };
+    requestedCount = loadedCount = cacheHitCount = cancelledCount = 0;
+    downloadedBytes = 0;
+    errors.clear();
+    _loadTimes.clear();
+    return result;
+  }
+}
+
+/// A tile provider whose downloads may go through a [TileRequestScheduler],
+/// and whose loads may be measured in [metrics].
+abstract class ScheduledTileProvider extends TileProvider {
+  final TileRequestScheduler? scheduler;
+  TileMetrics? metrics;
+
+  /// The center and zoom of the map, used to download the nearest tiles first.
+  LatLng? center;
+  double zoom = 0;
+
+  ScheduledTileProvider({this.scheduler});
+
+  @override
+  bool get supportsCancelLoading => true;
+
+  @override
+  ImageProvider getImageWithCancelLoadingSupport(TileCoordinates coordinates,
+          TileLayer options, Future<void> cancelLoading) =>
+      TileBytesImage(
+          url: getTileUrl(coordinates, options),
+          fallbackUrl: getTileFallbackUrl(coordinates, options),
+          load: (url, fallbackUrl) =>
+              _measure(url, fallbackUrl, coordinates, cancelLoading));
+
+  Future<Uint8List> _measure(String url, String? fallbackUrl,
+      TileCoordinates coordinates, Future<void> cancelLoading) async {
+    var metrics = this.metrics;
+    if (metrics == null) {
+      return loadTile(url, fallbackUrl, coordinates, cancelLoading);
+    }
+    metrics.requestedCount++;
+    var stopwatch = Stopwatch()..start();
+    try {
+      var bytes = await loadTile(url, fallbackUrl, coordinates, cancelLoading);
+      if (identical(bytes, TileProvider.transparentImage)) {
+        metrics.cancelledCount++;
+      } else {
+        metrics._loaded(stopwatch.elapsed);
+      }
+      return bytes;
+    } catch (e) {
+      metrics._failed(e);
+      rethrow;
+    }
+  }
+
+  /// Returns the bytes of the tile of [url], or of [fallbackUrl] if it fails.
+  Future<Uint8List> loadTile(String url, String? fallbackUrl,
+      TileCoordinates coordinates, Future<void> cancelLoading);
+
+  /// Downloads [url], through the [scheduler] if any.
+  Future<Uint8List> download(String url, TileCoordinates coordinates,
+      Future<void> cancelLoading) async {
+    var scheduler = this.scheduler;
+    var bytes = scheduler == null
+        ? await downloadTile(url, headers)
+        : await scheduler.download(
+            url, headers, () => _distanceToCenter(coordinates), cancelLoading);
+    metrics?.downloadedBytes += bytes.length;
+    return bytes;
+  }
+
+  /// The distance, in tiles, between [coordinates] and the map center, with
+  /// tiles of other zoom levels last.
+  double _distanceToCenter(TileCoordinates coordinates) {
+    var center = this.center;
+    if (center == null) return 0;
+    var scale = pow(2, coordinates.z).toDouble();
+    var latitude = center.latitudeInRad.clamp(-1.4844, 1.4844);
+    var x = (center.longitude + 180) / 360 * scale;
+    var y = (1 - log(tan(latitude) + 1 / cos(latitude)) / pi) / 2 * scale;
+    var distance = sqrt(pow(coordinates.x + 0.5 - x, 2) +
+        pow(coordinates.y + 0.5 - y, 2));
+    return coordinates.z == zoom.round() ? distance : distance + scale;
+  }
+}
+
+/// A tile provider downloading tiles, possibly through a
+/// [TileRequestScheduler].
+class ScheduledNetworkTileProvider extends ScheduledTileProvider {
+  ScheduledNetworkTileProvider({super.scheduler});
+
+  @override
+  Future<Uint8List> loadTile(String url, String? fallbackUrl,
+      TileCoordinates coordinates, Future<void> cancelLoading) async {
+    try {
+      return await download(url, coordinates, cancelLoading);
+    } on TileRequestCancelledException {
+      return TileProvider.transparentImage;
+    } catch (_) {
+      if (fallbackUrl == null) rethrow;
+      return loadTile(fallbackUrl, null, coordinates, cancelLoading);
+    }
+  }
+}
+
+/// An image of a tile, whose bytes are returned by [load].
+class TileBytesImage extends ImageProvider<TileBytesImage> {
+  final String url;
+  final String? fallbackUrl;
+  final Future<Uint8List> Function(String url, String? fallbackUrl) load;
+
+  const TileBytesImage(
+      {required this.url, this.fallbackUrl, required this.load});
+
+  @override
+  Future<TileBytesImage> obtainKey(ImageConfiguration configuration) =>
+      SynchronousFuture(this);
+
+  @override
+  ImageStreamCompleter loadImage(
+          TileBytesImage key, ImageDecoderCallback decode) =>
+      MultiFrameImageStreamCompleter(
+          codec: _decode(decode), scale: 1, debugLabel: url);
+
+  Future<ui.Codec> _decode(ImageDecoderCallback decode) async {
+    var bytes = await load(url, fallbackUrl);
+    return decode(await ui.ImmutableBuffer.fromUint8List(bytes));
+  }
+
+  @override
+  bool operator ==(Object other) =>
+      other is TileBytesImage &&
+      other.url == url &&
+      other.fallbackUrl == fallbackUrl;
+
+  @override
+  int get hashCode => Object.hash(url, fallbackUrl);
+}
+
+/// Keeps the center of [provider] up to date with the camera of the map.
+class TileCenterTracker extends StatelessWidget {
+  final ScheduledTileProvider provider;
+  final Widget child;
+
+  const TileCenterTracker(
+      {super.key, required this.provider, required this.child});
+
+  @override
+  Widget build(BuildContext context) {
+    var camera = MapCamera.of(context);
+    provider.center = camera.center;
+    provider.zoom = camera.zoom;
+    return child;
+  }
+}
@@ -0,0 +1,131 @@
+import struct
+from array import array
+
+import pytest
+
+from flet_map import MapLatitudeLongitude, MapLatitudeLongitudeArray
+
+POINTS = [(48.8566, 2.3522), (-33.8688, 151.2093), (0.0, -180.0), (85.05, 180.0)]
+
+
+def _coordinates(values: MapLatitudeLongitudeArray) -> list[tuple[float, float]]:
+    return [(c.latitude, c.longitude) for c in values]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [MapLatitudeLongitude(*point) for point in POINTS],
+        POINTS,
+        [value for point in POINTS for value in point],
+        array("d", [value for point in POINTS for value in point]),
+        struct.pack(f"<{2 * len(POINTS)}d", *(v for p in POINTS for v in p)),
+    ],
+    ids=["coordinates", "pairs", "flat", "array", "bytes"],
+)
+def test_round_trip(values):
+    coordinates = MapLatitudeLongitudeArray(values)
+    assert len(coordinates) == len(POINTS)
+    assert _coordinates(coordinates) == POINTS
+    assert list(coordinates.values()) == [v for p in POINTS for v in p]
+    # sent as interleaved little-endian float64 pairs
+    assert list(struct.iter_unpack("<2d", coordinates.data)) == POINTS
+    assert _coordinates(MapLatitudeLongitudeArray(coordinates.data)) == POINTS
+
+
+def test_indexing():
+    coordinates = MapLatitudeLongitudeArray(POINTS)
+    assert coordinates[0] == MapLatitudeLongitude(*POINTS[0])
+    assert coordinates[-1] == MapLatitudeLongitude(*POINTS[-1])
+    with pytest.raises(IndexError):
+        coordinates[len(POINTS)]
+
+
+def test_empty():
+    coordinates = MapLatitudeLongitudeArray()
+    assert len(coordinates) == 0
+    assert coordinates.data == b""
+    assert list(coordinates) == []
+
+
+@pytest.mark.parametrize("values", [[1.0, 2.0, 3.0], b"\x00" * 24])
+def test_incomplete_pairs_are_rejected(values):
+    with pytest.raises(AssertionError):
+        MapLatitudeLongitudeArray(values)
+
+
+def _decode(data: bytes, precision: int) -> list[tuple[float, float]]:
+    """Decodes quantized coordinates, as the client does."""
+    totals = [0, 0]
+    ints = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            totals[len(ints) % 2] += ~(value >> 1) if value & 1 else value >> 1
+            ints.append(totals[len(ints) % 2])
+            value = shift = 0
+    scale = 10**precision
+    return [(ints[i] / scale, ints[i + 1] / scale) for i in range(0, len(ints), 2)]
+
+
+def _rounded(points, precision: int) -> list[tuple[float, float]]:
+    scale = 10**precision
+    return [
+        (round(lat * scale) / scale, round(lng * scale) / scale) for lat, lng in points
+    ]
+
+
+@pytest.mark.parametrize("precision", [0, 5, 6, 7])
+def test_precision_round_trip(precision):
+    coordinates = MapLatitudeLongitudeArray(POINTS, precision=precision)
+    expected = _rounded(POINTS, precision)
+    assert _decode(coordinates.data, precision) == expected
+    # the coordinates are the rounded ones on the Python side too
+    assert _coordinates(coordinates) == expected
+
+
+def test_precision_is_compact():
+    track = [(48.85 + i * 1e-4, 2.35 + i * 1e-4) for i in range(1000)]
+    raw = MapLatitudeLongitudeArray(track)
+    encoded = MapLatitudeLongitudeArray(track, precision=5)
+    assert len(encoded.data) * 4 < len(raw.data)
+
+
+@pytest.mark.parametrize("precision", [-1, 8])
+def test_precision_is_validated(precision):
+    with pytest.raises(AssertionError):
+        MapLatitudeLongitudeArray(POINTS, precision=precision)
+
+
+def test_from_polyline():
+    # the example of the Encoded Polyline Algorithm Format
+    coordinates = MapLatitudeLongitudeArray.from_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+    expected = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    assert coordinates.precision == 5
+    assert _coordinates(coordinates) == expected
+    assert _decode(coordinates.data, 5) == expected
+
+
+@pytest.mark.parametrize("encoded", ["_p~iF~ps|U_ulL", "_p~iF~ps|U_", "_p~iF~ps|U "])
+def test_from_polyline_rejects_invalid_polylines(encoded):
+    with pytest.raises(ValueError):
+        MapLatitudeLongitudeArray.from_polyline(encoded)
+
+
+@pytest.mark.parametrize("precision", [None, 5])
+def test_extend_and_trim_head(precision):
+    coordinates = MapLatitudeLongitudeArray(POINTS[:2], precision=precision)
+    coordinates._extend(MapLatitudeLongitudeArray(POINTS[2:]))
+    assert (
+        coordinates.data == MapLatitudeLongitudeArray(POINTS, precision=precision).data
+    )
+
+    coordinates._trim_head(3)
+    assert (
+        coordinates.data
+        == MapLatitudeLongitudeArray(POINTS[3:], precision=precision).data
+    )
+    expected = POINTS[3:] if precision is None else _rounded(POINTS[3:], precision)
+    assert _coordinates(coordinates) == expected
@@ -0,0 +1,137 @@
+import math
+import random
+
+import pytest
+
+from flet_map import (
+    CircleLayer,
+    CircleMarker,
+    MapLatitudeLongitude,
+    MapLatitudeLongitudeBounds,
+)
+from flet_map.spatial_index import SpatialIndex
+
+
+def _random_box(rng: random.Random, max_size: float) -> tuple:
+    south = rng.uniform(-80, 80)
+    west = rng.uniform(-180, 180)
+    return (
+        south,
+        west,
+        south + rng.uniform(0, max_size),
+        west + rng.uniform(0, max_size),
+    )
+
+
+def _intersects(a: tuple, b: tuple) -> bool:
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def _distance(bounds: tuple, latitude: float, longitude: float) -> float:
+    scale = math.cos(math.radians(max(-89.0, min(89.0, latitude))))
+    s, w, n, e = bounds
+    dy = max(s - latitude, 0.0, latitude - n)
+    dx = max(w - longitude, 0.0, longitude - e) * scale
+    return math.hypot(dx, dy)
+
+
+def _check(index: SpatialIndex, boxes: dict, rng: random.Random):
+    """Compares the queries of `index` with a scan of all the `boxes`."""
+    assert len(index) == len(boxes)
+    for _ in range(50):
+        query = _random_box(rng, 30)
+        expected = {item for item, box in boxes.items() if _intersects(box, query)}
+        assert set(index.query_bbox(query)) == expected
+
+        latitude, longitude = rng.uniform(-85, 85), rng.uniform(-180, 180)
+        point = (latitude, longitude, latitude, longitude)
+        expected = {item for item, box in boxes.items() if _intersects(box, point)}
+        assert set(index.query_point(latitude, longitude)) == expected
+
+        k = rng.randint(1, 10)
+        nearest = index.nearest(latitude, longitude, k)
+        distances = sorted(_distance(b, latitude, longitude) for b in boxes.values())
+        assert [
+            _distance(boxes[item], latitude, longitude) for item in nearest
+        ] == pytest.approx(distances[:k])
+
+
+@pytest.mark.parametrize("cell_size", [None, 0.5, 10.0])
+def test_queries_match_a_full_scan(cell_size):
+    rng = random.Random(42)
+    # mostly small items, and a few covering many cells
+    boxes = {i: _random_box(rng, 2 if i % 50 else 60) for i in range(1000)}
+    index = SpatialIndex(boxes.items(), cell_size=cell_size)
+    _check(index, boxes, rng)
+
+    # incremental changes, including enough insertions and removals for the
+    # grid to be resized
+    for i in range(1000, 6000):
+        boxes[i] = _random_box(rng, 2)
+        index.insert(i, boxes[i])
+    for i in rng.sample(sorted(boxes), 500):
+        boxes[i] = _random_box(rng, 2)
+        index.insert(i, boxes[i])
+    _check(index, boxes, rng)
+
+    for i in rng.sample(sorted(boxes), 5900):
+        del boxes[i]
+        index.remove(i)
+    _check(index, boxes, rng)
+
+
+def test_empty_index():
+    index = SpatialIndex()
+    assert index.query_bbox((-90, -180, 90, 180)) == []
+    assert index.nearest(0, 0, 3) == []
+    with pytest.raises(KeyError):
+        index.remove("missing")
+
+
+def test_layer_queries_match_a_full_scan():
+    rng = random.Random(7)
+
+    def circles(count: int) -> list[CircleMarker]:
+        return [
+            CircleMarker(
+                coordinates=MapLatitudeLongitude(
+                    rng.uniform(-60, 60), rng.uniform(-170, 170)
+                ),
+                radius=5,
+            )
+            for _ in range(count)
+        ]
+
+    layer = CircleLayer(circles=circles(500))
+
+    def check():
+        for _ in range(20):
+            south, west = rng.uniform(-60, 50), rng.uniform(-170, 150)
+            bounds = MapLatitudeLongitudeBounds(
+                MapLatitudeLongitude(south, west),
+                MapLatitudeLongitude(south + 10, west + 20),
+            )
+            expected = [
+                c
+                for c in layer.circles
+                if south <= c.coordinates.latitude <= south + 10
+                and west <= c.coordinates.longitude <= west + 20
+            ]
+            assert layer.query_bbox(bounds) == expected
+
+    check()
+    # added and removed features are picked up by the next query
+    layer.circles.extend(circles(100))
+    layer.circles[:] = layer.circles[50:]
+    check()
+    # replaced ones on the next update of the layer
+    for i, circle in zip(range(0, len(layer.circles), 3), circles(200)):
+        layer.circles[i] = circle
+    layer.before_update()
+    check()
+    # and features moved in place with reindex()
+    moved = layer.circles[:10]
+    for circle in moved:
+        circle.coordinates.latitude = -circle.coordinates.latitude
+    layer.reindex(*moved)
+    check()
@@ -0,0 +1,114 @@
+import gzip
+import struct
+
+import pytest
+
+from flet_map.tile_server import PMTilesArchive, _tile_id
+
+_HEADER = struct.Struct("<7sB11Q6B4iB2i")
+
+
+@pytest.mark.parametrize(
+    "z, x, y, expected",
+    [
+        (0, 0, 0, 0),
+        (1, 0, 0, 1),
+        (1, 0, 1, 2),
+        (1, 1, 1, 3),
+        (1, 1, 0, 4),
+        (2, 0, 0, 5),
+        (12, 3423, 1763, 19078479),
+    ],
+)
+def test_tile_id(z, x, y, expected):
+    assert _tile_id(z, x, y) == expected
+
+
+@pytest.mark.parametrize("z", range(6))
+def test_tile_ids_of_a_zoom_level_are_contiguous(z):
+    first = ((1 << (2 * z)) - 1) // 3
+    ids = {_tile_id(z, x, y) for x in range(1 << z) for y in range(1 << z)}
+    assert ids == set(range(first, first + (1 << (2 * z))))
+
+
+def _varint(value: int) -> bytes:
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _directory(entries: list[tuple[int, int, int, int]]) -> bytes:
+    """Serializes `(tile_id, offset, length, run_length)` entries."""
+    data = _varint(len(entries))
+    previous = 0
+    for tile_id, *_ in entries:
+        data += _varint(tile_id - previous)
+        previous = tile_id
+    data += b"".join(_varint(entry[3]) for entry in entries)
+    data += b"".join(_varint(entry[2]) for entry in entries)
+    for i, (_, offset, _, _) in enumerate(entries):
+        previous_entry = entries[i - 1] if i > 0 else None
+        # 0: the entry directly follows the previous one
+        if previous_entry and offset == previous_entry[1] + previous_entry[2]:
+            data += _varint(0)
+        else:
+            data += _varint(offset + 1)
+    return data
+
+
+def _archive(path, root, leaves=b"", tiles=b"", compression=1):
+    """Writes a PMTiles archive with the given serialized directories."""
+    compress = gzip.compress if compression == 2 else bytes
+    root, leaves = compress(root), compress(leaves)
+    root_offset = _HEADER.size
+    leaf_offset = root_offset + len(root)
+    data_offset = leaf_offset + len(leaves)
+    header = _HEADER.pack(
+        b"PMTiles", 3,
+        root_offset, len(root), data_offset, 0, leaf_offset, len(leaves),
+        data_offset, len(tiles), 0, 0, 0, 1,
+        compression, 1, 2, 0, 14,
+        0, 0, 0, 0, 0, 0, 0,
+    )  # fmt: skip
+    path.write_bytes(header + root + leaves + tiles)
+    return path
+
+
+@pytest.mark.parametrize("compression", [1, 2], ids=["none", "gzip"])
+def test_pmtiles_root_directory(tmp_path, compression):
+    tiles = b"zero" + b"run" + b"five"
+    entries = [(0, 0, 4, 1), (1, 4, 3, 4), (5, 7, 4, 1)]
+    path = _archive(tmp_path / "a.pmtiles", _directory(entries), tiles=tiles)
+    with PMTilesArchive(path) as archive:
+        assert archive._root == entries
+        assert archive.content_type == "image/png"
+        assert archive.get_tile(0, 0, 0) == b"zero"
+        # the run of tiles 1 to 4 shares the same data
+        for x, y in [(0, 0), (0, 1), (1, 1), (1, 0)]:
+            assert archive.get_tile(1, x, y) == b"run"
+        assert archive.get_tile(2, 0, 0) == b"five"
+        assert archive.get_tile(2, 1, 0) is None
+        assert archive.get_tile(1, 2, 0) is None
+
+
+def test_pmtiles_leaf_directory(tmp_path):
+    tiles = b"zero" + b"one"
+    leaf = _directory([(0, 0, 4, 1), (1, 4, 3, 1)])
+    root = _directory([(0, 0, len(leaf), 0)])
+    path = _archive(tmp_path / "a.pmtiles", root, leaves=leaf, tiles=tiles)
+    with PMTilesArchive(path) as archive:
+        assert archive.get_tile(0, 0, 0) == b"zero"
+        assert archive.get_tile(1, 0, 0) == b"one"
+        assert archive.get_tile(1, 0, 1) is None
+        assert archive.get_tile(1, 0, 0) == b"one"  # from the cached leaf
+        assert len(archive._directories) == 1
+
+
+def test_pmtiles_rejects_other_files(tmp_path):
+    path = tmp_path / "a.pmtiles"
+    path.write_bytes(b"\0" * _HEADER.size)
+    with pytest.raises(ValueError):
+        PMTilesArchive(path)
@@ -0,0 +1,97 @@
+import pytest
+
+from flet_map import MapLatitudeLongitude, MapLatitudeLongitudeBounds
+from flet_map.tiles import count_tiles, get_tile_range, iter_tiles
+
+WORLD = MapLatitudeLongitudeBounds(
+    MapLatitudeLongitude(90, -180), MapLatitudeLongitude(-90, 180)
+)
+PARIS = MapLatitudeLongitudeBounds(
+    MapLatitudeLongitude(48.8, 2.2), MapLatitudeLongitude(48.9, 2.5)
+)
+
+
+def _point(latitude: float, longitude: float) -> MapLatitudeLongitudeBounds:
+    point = MapLatitudeLongitude(latitude, longitude)
+    return MapLatitudeLongitudeBounds(point, point)
+
+
+@pytest.mark.parametrize(
+    "bounds, zoom, expected",
+    [
+        (_point(48.8566, 2.3522), 10, (518, 352, 518, 352)),
+        (_point(51.5074, -0.1278), 12, (2046, 1362, 2046, 1362)),
+        (_point(0, 0), 0, (0, 0, 0, 0)),
+        (_point(0, 0), 1, (1, 1, 1, 1)),
+        (PARIS, 12, (2073, 1408, 2076, 1410)),
+    ],
+)
+def test_get_tile_range(bounds, zoom, expected):
+    assert get_tile_range(bounds, zoom) == expected
+
+
+def test_get_tile_range_ignores_corner_order():
+    swapped = MapLatitudeLongitudeBounds(PARIS.corner_2, PARIS.corner_1)
+    assert get_tile_range(swapped, 12) == get_tile_range(PARIS, 12)
+
+
+@pytest.mark.parametrize("zoom", [0, 1, 5, 12])
+def test_get_tile_range_clamps_to_the_world(zoom):
+    last = 2**zoom - 1
+    assert get_tile_range(WORLD, zoom) == (0, 0, last, last)
+    # beyond the latitudes of Web Mercator, and the longitudes of the world
+    assert get_tile_range(_point(85.0511, 180), zoom) == (last, 0, last, 0)
+    assert get_tile_range(_point(89.9, 180), zoom) == (last, 0, last, 0)
+    assert get_tile_range(_point(-85.0511, -180), zoom) == (0, last, 0, last)
+    assert get_tile_range(_point(-89.9, -200), zoom) == (0, last, 0, last)
+
+
+def test_get_tile_range_across_the_antimeridian():
+    # read as the area spanning the prime meridian, as documented
+    bounds = MapLatitudeLongitudeBounds(
+        MapLatitudeLongitude(10, 170), MapLatitudeLongitude(-10, -170)
+    )
+    assert get_tile_range(bounds, 4) == (0, 7, 15, 8)
+
+    # split in two, on each side of the antimeridian
+    east = MapLatitudeLongitudeBounds(
+        MapLatitudeLongitude(10, 170), MapLatitudeLongitude(-10, 180)
+    )
+    west = MapLatitudeLongitudeBounds(
+        MapLatitudeLongitude(10, -180), MapLatitudeLongitude(-10, -170)
+    )
+    assert get_tile_range(east, 4) == (15, 7, 15, 8)
+    assert get_tile_range(west, 4) == (0, 7, 0, 8)
+
+
+def test_get_tile_range_rejects_negative_zoom():
+    with pytest.raises(AssertionError):
+        get_tile_range(PARIS, -1)
+
+
+def test_iter_tiles():
+    assert list(iter_tiles(WORLD, 0, 1)) == [
+        (0, 0, 0),
+        (0, 0, 1),
+        (0, 1, 1),
+        (1, 0, 1),
+        (1, 1, 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    "bounds, min_zoom, max_zoom",
+    [(WORLD, 0, 6), (PARIS, 0, 14), (PARIS, 10, 12), (_point(0, 0), 3, 3)],
+)
+def test_count_tiles_matches_iter_tiles(bounds, min_zoom, max_zoom):
+    tiles = list(iter_tiles(bounds, min_zoom, max_zoom))
+    assert count_tiles(bounds, min_zoom, max_zoom) == len(tiles)
+    assert len(set(tiles)) == len(tiles)
+
+
+@pytest.mark.parametrize("min_zoom, max_zoom", [(-1, 2), (3, 2)])
+def test_zoom_range_is_validated(min_zoom, max_zoom):
+    with pytest.raises(AssertionError):
+        count_tiles(PARIS, min_zoom, max_zoom)
+    with pytest.raises(AssertionError):
+        next(iter_tiles(PARIS, min_zoom, max_zoom))